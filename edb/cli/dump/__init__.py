@@ -26,6 +26,7 @@ from edb.cli import cli
 from edb.cli import utils
 
 from . import dump as dumpmod
+from . import load as loadmod
 from . import restore as restoremod
 
 
@@ -83,3 +84,36 @@ def restore(ctx, file: str, allow_nonempty: bool) -> None:
         restorer.restore(conn, file)
     finally:
         conn.close()
+
+
+@cli.command(help="Bulk load objects of a type from CSV files")
+@utils.connect_command
+@click.pass_context
+@click.option('--link', 'links', multiple=True, metavar='POINTER=FILE',
+              help='load the links of a multi link or property '
+                   'from a CSV file')
+@click.argument('type_name', metavar='TYPE')
+@click.argument('file', required=False,
+                type=click.Path(exists=True, dir_okay=False,
+                                resolve_path=True))
+def load(ctx, type_name: str, file: Optional[str],
+         links: Tuple[str, ...]) -> None:
+    link_files = []
+    for link in links:
+        pointer, sep, link_file = link.partition('=')
+        if not sep or not pointer or not link_file:
+            raise click.BadParameter(
+                f'expected POINTER=FILE, got {link!r}',
+                param_hint='--link')
+        link_files.append((pointer, link_file))
+
+    if file is None and not link_files:
+        raise click.UsageError('nothing to load')
+
+    cargs = ctx.obj['connargs']
+    conn = cargs.new_connection()
+    try:
+        loader = loadmod.LoadImpl()
+        loader.load(conn, type_name, file, link_files)
+    finally:
+        conn.close()
@@ -34,3 +34,12 @@ COPY_BUFFER_SIZE = 1024 * 1024 * 10
 
 DUMP_FORMAT_VER = 1
 MAX_SUPPORTED_DUMP_VER = 1
+
+# Bulk loads are sent as restores with an additional header naming
+# the type that is loaded.
+LOAD_PROTO_VER = (0, 8)
+LOAD_HEADER_TYPE = 105
+LOAD_BLOCK_HEADER_TYPE = 101
+LOAD_BLOCK_HEADER_ID = 110
+LOAD_BLOCK_HEADER_NUM = 111
+LOAD_BLOCK_HEADER_DATA = 112
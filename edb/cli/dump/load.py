@@ -0,0 +1,146 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2019-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import annotations
+from typing import *
+
+import csv
+import io
+import json
+import os
+import uuid
+
+import edgedb
+
+from edb.common import binwrapper
+
+from . import consts
+
+
+class LoadImpl:
+    """Bulk load objects of one type from CSV files.
+
+    The first row of every file names the columns.  The rows of the
+    object file are loaded as new objects of the type, the rows of
+    a link file as the links of a multi pointer of the type, with
+    "source" and "target" columns holding object ids.
+    """
+
+    def _read_columns(self, f: IO[bytes]) -> List[str]:
+        line = f.readline().decode('utf-8')
+        return next(csv.reader([line]), [])
+
+    def _read_chunks(self, f: IO[bytes]) -> Iterator[bytes]:
+        # Split the data into chunks at record boundaries: a newline
+        # ends a record only if it is not inside a quoted value.
+        chunk = []
+        chunk_len = 0
+        quotes = 0
+        for line in f:
+            chunk.append(line)
+            chunk_len += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0 and chunk_len >= consts.COPY_BUFFER_SIZE:
+                yield b''.join(chunk)
+                chunk = []
+                chunk_len = 0
+        if chunk_len:
+            yield b''.join(chunk)
+
+    def _make_header(
+        self,
+        type_name: str,
+        blocks: List[Tuple[uuid.UUID, Dict[str, Any]]],
+    ) -> bytes:
+        out = io.BytesIO()
+        buf = binwrapper.BinWrapper(out)
+
+        buf.write_i16(1)
+        buf.write_ui16(consts.LOAD_HEADER_TYPE)
+        buf.write_len32_prefixed_bytes(type_name.encode('utf-8'))
+
+        buf.write_i16(consts.LOAD_PROTO_VER[0])
+        buf.write_i16(consts.LOAD_PROTO_VER[1])
+        buf.write_len32_prefixed_bytes(b'')  # no schema DDL
+        buf.write_i32(0)  # no schema ids
+
+        buf.write_i32(len(blocks))
+        for block_id, description in blocks:
+            buf.write_bytes(block_id.bytes)
+            buf.write_len32_prefixed_bytes(
+                json.dumps(description).encode('utf-8'))
+            buf.write_i16(0)  # no dependencies
+
+        return out.getvalue()
+
+    def _make_block(
+        self,
+        block_id: uuid.UUID,
+        block_num: int,
+        data: bytes,
+    ) -> bytes:
+        out = io.BytesIO()
+        buf = binwrapper.BinWrapper(out)
+
+        buf.write_i16(4)
+        buf.write_ui16(consts.LOAD_BLOCK_HEADER_TYPE)
+        buf.write_len32_prefixed_bytes(b'D')
+        buf.write_ui16(consts.LOAD_BLOCK_HEADER_ID)
+        buf.write_len32_prefixed_bytes(block_id.bytes)
+        buf.write_ui16(consts.LOAD_BLOCK_HEADER_NUM)
+        buf.write_len32_prefixed_bytes(str(block_num).encode())
+        buf.write_ui16(consts.LOAD_BLOCK_HEADER_DATA)
+        buf.write_len32_prefixed_bytes(data)
+
+        return out.getvalue()
+
+    def load(
+        self,
+        conn: edgedb.BlockingIOConnection,
+        type_name: str,
+        objects_fn: Optional[os.PathLike],
+        links: Sequence[Tuple[str, os.PathLike]],
+    ) -> None:
+        files = []
+        if objects_fn is not None:
+            files.append((None, objects_fn))
+        files.extend(links)
+
+        blocks = []
+        for pointer, fn in files:
+            with open(fn, 'rb') as f:
+                description = {
+                    'pointer': pointer,
+                    'columns': self._read_columns(f),
+                }
+            blocks.append((uuid.uuid4(), description))
+
+        def data_gen() -> Iterator[bytes]:
+            block_num = 0
+            for (block_id, _), (_, fn) in zip(blocks, files):
+                with open(fn, 'rb') as f:
+                    # Skip the columns row.
+                    self._read_columns(f)
+                    for chunk in self._read_chunks(f):
+                        yield self._make_block(block_id, block_num, chunk)
+                        block_num += 1
+
+        conn._restore(
+            header=self._make_header(type_name, blocks),
+            data_gen=data_gen(),
+        )
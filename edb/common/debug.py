@@ -99,6 +99,9 @@ class flags(metaclass=FlagsMeta):
     delta_execute = Flag(
         doc="Output SQL commands as executed during migration.")
 
+    delta_table_effects = Flag(
+        doc="Print table scans and rewrites caused by migration SQL.")
+
     server = Flag(
         doc="Print server errors.")
 
@@ -0,0 +1,332 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""A sampling profiler cheap enough to be enabled in production.
+
+A background thread records the stack of the profiled thread at regular
+intervals.  The profiled code itself is not instrumented, so the cost of
+profiling does not depend on the number of function calls it makes.
+
+The recorded stacks are dumped as ``edgedb_sampling_*.prof`` files in
+the marshalled pstats format, which ``edb perfviz`` aggregates and
+renders as SVG flame graphs.  The time of a function is the number of
+samples it was seen in multiplied by the average sampling interval.
+
+The EdgeDB server calls toggle() on SIGUSR2 and forwards the new state
+to its compiler workers: they start() on SIGUSR2 and stop() on SIGUSR1.
+Workers spawned while the server is sampled start sampling for the rest
+of the duration, see inherit().  It is configured with the following
+environment variables:
+
+* ``EDGEDB_SAMPLING_PROFILER_DURATION``: the number of seconds after
+  which sampling stops if it is not stopped earlier (30 by default);
+
+* ``EDGEDB_SAMPLING_PROFILER_INTERVAL``: the number of milliseconds
+  between samples (5 by default);
+
+* ``EDGEDB_SAMPLING_PROFILER_DIR``: the directory to dump the profiles
+  into (the temporary directory by default).
+"""
+
+
+from __future__ import annotations
+from typing import *
+
+import collections
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+
+logger = logging.getLogger('edb.common.sampler')
+
+
+PREFIX = 'edgedb_sampling_'
+SUFFIX = '.prof'
+
+DEFAULT_DURATION = 30.0
+DEFAULT_INTERVAL = 0.005
+
+#: The number of seconds a spawned process samples for, set by its parent.
+START_ENV = 'EDGEDB_SAMPLING_PROFILER_START'
+
+
+# (filename, first line number, function name), as in pstats.
+FunctionID = Tuple[str, int, str]
+# (primitive calls, calls, own time, cumulative time), as in pstats.
+Stat = Tuple[int, int, float, float]
+Stats = Dict[
+    FunctionID,
+    Tuple[int, int, float, float, Dict[FunctionID, Stat]],
+]
+# Code objects of a stack, innermost first.
+Stack = Tuple[types.CodeType, ...]
+
+
+class Sampler:
+    """Record the stacks of a thread at regular intervals."""
+
+    def __init__(
+        self,
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        thread_id: Optional[int] = None,
+        dir: Optional[str] = None,
+    ) -> None:
+        """Create a sampler of *thread_id*, the main thread by default.
+
+        *interval* is in seconds.  When sampling stops, the profile is
+        dumped into *dir* if it is given.
+        """
+        if thread_id is None:
+            thread_id = threading.main_thread().ident
+
+        self._interval = interval
+        self._thread_id = thread_id
+        self._dir = dir
+        self._samples: Counter[Stack] = collections.Counter()
+        self._elapsed = 0.0
+        self._deadline: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def is_running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and not self._stopping.is_set()
+        )
+
+    def get_remaining(self) -> Optional[float]:
+        """Return the number of seconds left to sample, if limited."""
+        if not self.is_running() or self._deadline is None:
+            return None
+        return max(self._deadline - time.monotonic(), 0.0)
+
+    def start(self, duration: Optional[float] = None) -> None:
+        """Start sampling for *duration* seconds or until stop()."""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError('the sampler is already running')
+
+        self._samples.clear()
+        self._elapsed = 0.0
+        self._deadline = (
+            None if duration is None else time.monotonic() + duration)
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._deadline,),
+            name='edgedb-sampler',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait until the profile is dumped."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        thread.join()
+
+    def _run(self, deadline: Optional[float]) -> None:
+        current_frames = sys._current_frames
+        samples = self._samples
+        thread_id = self._thread_id
+
+        started_at = time.monotonic()
+
+        while not self._stopping.wait(self._interval):
+            frame = current_frames().get(thread_id)
+            if frame is None:
+                # The profiled thread is gone.
+                break
+
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            samples[tuple(stack)] += 1
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        self._elapsed = time.monotonic() - started_at
+
+        if self._dir is not None:
+            try:
+                self.dump(self._dir)
+            except Exception:
+                logger.exception('could not dump the sampling profile')
+
+    def get_stats(self) -> Stats:
+        """Return the recorded profile in the pstats format."""
+        nsamples = sum(self._samples.values())
+        if not nsamples:
+            return {}
+        return stacks_to_stats(self._samples, self._elapsed / nsamples)
+
+    def dump(self, dir: str) -> str:
+        """Dump the recorded profile into a new file in *dir*."""
+        fd, path = tempfile.mkstemp(
+            prefix=f'{PREFIX}{os.getpid()}_', suffix=SUFFIX, dir=dir)
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump(self.get_stats(), f)
+
+        logger.info(
+            'dumped %d samples of pid %d into %s',
+            sum(self._samples.values()), os.getpid(), path)
+        return path
+
+
+def stacks_to_stats(samples: Mapping[Stack, int], weight: float) -> Stats:
+    """Convert sampled stacks into the pstats format.
+
+    Every sample of a stack adds *weight* seconds to the cumulative time
+    of every function on the stack and to the own time of its innermost
+    function.  The call counts are the numbers of samples.
+    """
+    stats: Dict[FunctionID, List[Any]] = {}
+
+    for stack, count in samples.items():
+        elapsed = count * weight
+        funcs = [_function_id(code) for code in reversed(stack)]
+
+        seen: Set[FunctionID] = set()
+        seen_calls: Set[Tuple[FunctionID, FunctionID]] = set()
+        caller = None
+        for func in funcs:
+            entry = stats.get(func)
+            if entry is None:
+                entry = stats[func] = [0, 0, 0.0, 0.0, {}]
+
+            # Recursive calls are only counted once per sample.
+            if func not in seen:
+                seen.add(func)
+                entry[0] += count
+                entry[1] += count
+                entry[3] += elapsed
+
+            if caller is not None and (caller, func) not in seen_calls:
+                seen_calls.add((caller, func))
+                cc, nc, tt, ct = entry[4].get(caller, (0, 0, 0.0, 0.0))
+                entry[4][caller] = (cc + count, nc + count, tt, ct + elapsed)
+
+            caller = func
+
+        innermost = stats[funcs[-1]]
+        innermost[2] += elapsed
+        if len(funcs) > 1:
+            cc, nc, tt, ct = innermost[4][funcs[-2]]
+            innermost[4][funcs[-2]] = (cc, nc, tt + elapsed, ct)
+
+    return {func: tuple(entry) for func, entry in stats.items()}
+
+
+def _function_id(code: types.CodeType) -> FunctionID:
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning('invalid value of %s: %r', name, value)
+        return default
+
+
+_sampler: Optional[Sampler] = None
+
+
+def is_running() -> bool:
+    """Return whether the main thread is being sampled."""
+    return _sampler is not None and _sampler.is_running()
+
+
+def get_remaining() -> Optional[float]:
+    """Return the number of seconds left to sample the main thread.
+
+    None is returned when the main thread is not being sampled.
+    """
+    if _sampler is None:
+        return None
+    return _sampler.get_remaining()
+
+
+def start(duration: Optional[float] = None) -> None:
+    """Start sampling the main thread, unless it is already sampled.
+
+    *duration* is ``EDGEDB_SAMPLING_PROFILER_DURATION`` by default.
+    """
+    global _sampler
+
+    if is_running():
+        return
+
+    if duration is None:
+        duration = _env_float(
+            'EDGEDB_SAMPLING_PROFILER_DURATION', DEFAULT_DURATION)
+    interval = _env_float(
+        'EDGEDB_SAMPLING_PROFILER_INTERVAL', DEFAULT_INTERVAL * 1000)
+    dir = os.environ.get('EDGEDB_SAMPLING_PROFILER_DIR')
+    if not dir:
+        dir = tempfile.gettempdir()
+
+    _sampler = Sampler(interval=interval / 1000, dir=dir)
+    _sampler.start(duration=duration)
+    logger.info(
+        'sampling pid %d every %gms for up to %gs',
+        os.getpid(), interval, duration)
+
+
+def stop() -> None:
+    """Stop sampling the main thread, if it is sampled."""
+    if _sampler is not None:
+        _sampler.stop()
+
+
+def toggle() -> None:
+    """Start sampling the main thread or stop sampling it."""
+    if is_running():
+        stop()
+    else:
+        start()
+
+
+def inherit() -> None:
+    """Start sampling if the parent process set ``START_ENV``."""
+    duration = _env_float(START_ENV, 0.0)
+    if duration > 0:
+        start(duration)
+
+
+def get_inherited_env() -> Dict[str, str]:
+    """Return the environment for a child process to inherit()."""
+    remaining = get_remaining()
+    if not remaining:
+        return {}
+    return {START_ENV: str(remaining)}
@@ -778,6 +778,7 @@ pub fn is_keyword(s: &str) -> bool {
         | "__type__"
         | "__std__"
         | "alter"
+        | "analyze"
         | "and"
         | "anytuple"
         | "anytype"
@@ -793,6 +794,7 @@ pub fn is_keyword(s: &str) -> bool {
         | "else"
         | "empty"
         | "exists"
+        | "explain"
         | "extending"
         | "false"
         | "filter"
@@ -827,7 +829,6 @@ pub fn is_keyword(s: &str) -> bool {
           // Keep in sync with keywords::CURRENT_RESERVED_KEYWORDS
         // # Future reserved keywords #
           // Keep in sync with keywords::FUTURE_RESERVED_KEYWORDS
-        | "analyze"
         | "anyarray"
         | "begin"
         | "case"
@@ -837,7 +838,6 @@ pub fn is_keyword(s: &str) -> bool {
         | "do"
         | "end"
         | "execute"
-        | "explain"
         | "fetch"
         | "get"
         | "global"
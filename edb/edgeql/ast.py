@@ -1021,6 +1021,16 @@ class DescribeStmt(Statement):
     options: Options
 
 
+#
+# Explain
+#
+
+class ExplainStmt(Statement):
+
+    analyze: bool = False
+    query: Statement
+
+
 #
 # SDL
 #
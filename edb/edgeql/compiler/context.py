@@ -226,6 +226,9 @@ class Environment:
     created_schema_objects: Set[s_obj.Object]
     """A set of all schema objects derived by this compilation."""
 
+    inlined_functions: Set[s_func.Function]
+    """A set of functions whose bodies are being inlined."""
+
     # Caches for costly operations in edb.ir.typeutils
     ptr_ref_cache: PointerRefCache
     type_ref_cache: Dict[uuid.UUID, irast.TypeRef]
@@ -256,6 +259,7 @@ class Environment:
             irast.ViewShapeMetadata)
         self.schema_refs = set()
         self.created_schema_objects = set()
+        self.inlined_functions = set()
         self.ptr_ref_cache = PointerRefCache()
         self.type_ref_cache = {}
 
@@ -23,8 +23,12 @@
 from __future__ import annotations
 from typing import *
 
+import copy
+
 from edb import errors
 
+from edb.common import ast
+
 from edb.ir import ast as irast
 from edb.ir import utils as irutils
 
@@ -35,6 +39,7 @@ from edb.schema import name as sn
 from edb.schema import operators as s_oper
 from edb.schema import scalars as s_scalars
 from edb.schema import types as s_types
+from edb.schema import utils as s_utils
 
 from edb.edgeql import ast as qlast
 from edb.edgeql import qltypes as ft
@@ -55,6 +60,8 @@ from . import typegen
 if TYPE_CHECKING:
     import uuid
 
+    from edb.schema import schema as s_schema
+
 
 @dispatch.compile.register(qlast.FunctionCall)
 def compile_FunctionCall(
@@ -119,6 +126,10 @@ def compile_FunctionCall(
             f'{func_name}() cannot be called in a non-session context',
             context=expr.context)
 
+    inlined = _try_inline_function_call(expr, matched_call, ctx=ctx)
+    if inlined is not None:
+        return inlined
+
     matched_func_params = func.get_params(env.schema)
     variadic_param = matched_func_params.find_variadic(env.schema)
     variadic_param_type = None
@@ -214,6 +225,195 @@ def compile_FunctionCall(
     return setgen.ensure_set(fcall, typehint=rtype, path_id=path_id, ctx=ctx)
 
 
+def _is_inlinable(
+    func: s_func.Function,
+    expr: qlast.FunctionCall,
+    *,
+    ctx: context.ContextLevel,
+) -> bool:
+    env = ctx.env
+    schema = env.schema
+
+    if (
+        func.get_language(schema) is not qlast.Language.EdgeQL
+        or func.get_nativecode(schema) is None
+        or not func.get_inlinable(schema)
+        or func.get_session_only(schema)
+        or func.get_volatility(schema) is ft.Volatility.VOLATILE
+        or func in env.inlined_functions
+    ):
+        return False
+
+    # Only the simple case of singleton positional parameters of
+    # scalar or object types is handled, as the call then maps to
+    # a FOR loop over the arguments.
+    return_type = func.get_return_type(schema)
+    if (not _is_inlinable_type(return_type, schema)
+            or func.get_return_typemod(schema) is ft.TypeModifier.SET_OF):
+        return False
+
+    params = func.get_params(schema).objects(schema)
+    if len(params) != len(expr.args):
+        return False
+
+    for param in params:
+        if (
+            param.get_kind(schema) is not ft.ParameterKind.POSITIONAL
+            or param.get_typemod(schema) is not ft.TypeModifier.SINGLETON
+            or param.get_default(schema) is not None
+            or not _is_inlinable_type(param.get_type(schema), schema)
+        ):
+            return False
+
+    body = func.get_nativecode(schema).qlast
+    if not isinstance(body, qlast.Statement):
+        return False
+
+    nodes = ast.find_children(body, lambda n: True)
+    if len(nodes) > env.options.inline_function_max_size:
+        return False
+
+    # Shapes are ignored in function results, and names used by the
+    # body must not be shadowed by the aliases at the call site.
+    body_modules = {
+        alias.alias for alias in body.aliases
+        if isinstance(alias, qlast.ModuleAliasDecl)
+    }
+    param_names = {p.get_parameter_name(schema) for p in params}
+    for node in nodes:
+        if isinstance(node, qlast.Shape):
+            return False
+        elif isinstance(node, qlast.FunctionCall) and node.kwargs:
+            # Named arguments are not traversed by find_children().
+            return False
+        elif isinstance(node, qlast.ObjectRef):
+            if node.module is None:
+                if node.name in param_names:
+                    continue
+                if (node.name in ctx.aliased_views
+                        or node.name in ctx.anchors):
+                    return False
+            elif (node.module not in body_modules
+                    and node.module in ctx.modaliases):
+                return False
+
+    return True
+
+
+def _is_inlinable_type(stype: s_types.Type, schema: s_schema.Schema) -> bool:
+    return (
+        not stype.is_polymorphic(schema)
+        and (isinstance(stype, s_scalars.ScalarType)
+             or stype.is_object_type())
+    )
+
+
+def _try_inline_function_call(
+    expr: qlast.FunctionCall,
+    matched_call: polyres.BoundCall,
+    *,
+    ctx: context.ContextLevel,
+) -> Optional[irast.Set]:
+    """Compile a call of an EdgeQL function by inlining its body.
+
+    Inlining exposes the function body to the backend planner, so
+    that filters through helper functions can use indexes.  Calls
+    in schema expressions and function bodies are never inlined, as
+    these are stored in the backend and must follow changes of the
+    called functions.
+    """
+    env = ctx.env
+    options = env.options
+
+    if (
+        options.inline_function_max_size <= 0
+        or options.func_params is not None
+        or options.schema_object_context is not None
+        or expr.kwargs
+    ):
+        return None
+
+    func = matched_call.func
+    assert isinstance(func, s_func.Function)
+    if (not _is_inlinable(func, expr, ctx=ctx)
+            or any(barg.param is None for barg in matched_call.args)):
+        return None
+
+    schema = env.schema
+    body = copy.deepcopy(func.get_nativecode(schema).qlast)
+
+    with ctx.new() as subctx:
+        # The arguments are already compiled, the inlined body
+        # refers to them as anchors.
+        subctx.anchors = subctx.anchors.copy()
+
+        iterators = []
+        param_aliases: List[qlast.BaseAlias] = []
+        for barg in matched_call.args:
+            param = barg.param
+            assert param is not None
+
+            arg_alias = subctx.aliases.get('__edb_inline_arg')
+            subctx.anchors[arg_alias] = barg.val
+            iterator_alias = subctx.aliases.get('__edb_inline_arg')
+            iterators.append((iterator_alias, arg_alias))
+
+            arg_ref: qlast.Expr = qlast.Path(
+                steps=[qlast.ObjectRef(name=iterator_alias)])
+            param_type = param.get_type(schema)
+            if isinstance(param_type, s_scalars.ScalarType):
+                # Apply the implicit cast of the argument, if any.
+                arg_ref = _inlined_cast(arg_ref, param_type, ctx=subctx)
+
+            param_aliases.append(qlast.AliasedExpr(
+                alias=param.get_parameter_name(schema),
+                expr=arg_ref,
+            ))
+
+        body.aliases = param_aliases + list(body.aliases)
+
+        # Functions are called for every combination of the elements
+        # of their singleton arguments, which is what a FOR loop does.
+        inlined: qlast.Expr = body
+        for iterator_alias, arg_alias in reversed(iterators):
+            inlined = qlast.ForQuery(
+                iterator=qlast.Path(steps=[qlast.ObjectRef(name=arg_alias)]),
+                iterator_alias=iterator_alias,
+                result=inlined,
+            )
+
+        return_type = func.get_return_type(schema)
+        if isinstance(return_type, s_scalars.ScalarType):
+            inlined = _inlined_cast(inlined, return_type, ctx=subctx)
+
+        # Schema references are tracked as if the function was called.
+        env.schema_refs.add(func)
+
+        env.inlined_functions.add(func)
+        try:
+            return setgen.ensure_set(
+                dispatch.compile(inlined, ctx=subctx),
+                ctx=subctx,
+            )
+        finally:
+            env.inlined_functions.discard(func)
+
+
+def _inlined_cast(
+    expr: qlast.Expr,
+    stype: s_types.Type,
+    *,
+    ctx: context.ContextLevel,
+) -> qlast.TypeCast:
+    # The std module is always disambiguated, as the cast may end up
+    # in the scope of the module aliases of the inlined body.
+    return qlast.TypeCast(
+        expr=expr,
+        type=s_utils.typeref_to_ast(
+            ctx.env.schema, stype, disambiguate_std=True),
+    )
+
+
 #: A dictionary of conditional callables and the indices
 #: of the arguments that are evaluated conditionally.
 CONDITIONAL_OPS = {
@@ -66,6 +66,10 @@ class GlobalCompilerOptions:
     #: definitions.
     func_params: Optional[s_func.ParameterLikeList] = None
 
+    #: Inline calls of EdgeQL functions with bodies of at most this
+    #: many AST nodes into the query (0 disables inlining).
+    inline_function_max_size: int = 64
+
 
 @dataclass
 class CompilerOptions(GlobalCompilerOptions):
@@ -30,14 +30,17 @@ EdgeQL AST visitor.
 
 from __future__ import annotations
 
+import collections
 import copy
 import functools
+import hashlib
 import re
 from typing import *
 from collections import defaultdict
 
 from edb import errors
 
+from edb.common import ast
 from edb.common import topological
 
 from edb.edgeql import ast as qlast
@@ -50,6 +53,15 @@ from edb.schema import schema as s_schema
 
 STD_PREFIX_RE = re.compile(rf'^({"|".join(s_schema.STD_MODULES)})::')
 
+# Traced dependencies of the DDL items of a module, keyed by the module
+# name and the digest of the module and all modules it refers to.
+_DepCacheKey = Tuple[str, bytes]
+_ModuleDeps = Dict[str, FrozenSet[str]]
+
+_DEP_CACHE_SIZE = 512
+_dep_cache: collections.OrderedDict[_DepCacheKey, _ModuleDeps] = (
+    collections.OrderedDict())
+
 
 class TraceContextBase:
     def __init__(self, schema):
@@ -166,12 +178,132 @@ class DepTraceContext(TraceContextBase):
         self.ancestors = ancestors
         self.defdeps = defdeps
         self.constraints = constraints
+        # Dependencies of the items of the current module traced by
+        # a previous compilation, if any.
+        self.cached_deps: Optional[_ModuleDeps] = None
+
+
+class _ModuleRefCollector(ast.NodeVisitor):
+    """Collect the names of modules referred to by an AST."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.modules: Set[str] = set()
+
+    def visit_ObjectRef(self, node: qlast.ObjectRef) -> None:
+        if node.module:
+            self.modules.add(node.module)
+
+    def visit_ModuleAliasDecl(self, node: qlast.ModuleAliasDecl) -> None:
+        self.modules.add(node.module)
+
+    def visit_FunctionCall(self, node: qlast.FunctionCall) -> None:
+        if isinstance(node.func, tuple):
+            self.modules.add(node.func[0])
+        self.visit(list(node.kwargs.values()))
+        self.generic_visit(node)
+
+
+def _get_dep_cache_keys(
+    documents: Sequence[Tuple[str, Sequence[qlast.DDL]]],
+) -> Dict[str, _DepCacheKey]:
+    """Compute the dependency cache keys of the modules in *documents*.
+
+    The traced dependencies of a module depend on its declarations and on
+    the layout of the modules it refers to, directly or through them, so
+    the key digest covers the source of all of those modules.  Modules
+    outside of *documents* are standard modules or unresolvable, they are
+    keyed by name only.
+    """
+    digests = {}
+    refs = {}
+
+    for module_name, declarations in documents:
+        collector = _ModuleRefCollector()
+        digest = hashlib.sha1(module_name.encode())
+        for decl in declarations:
+            digest.update(qlcodegen.generate_source(decl).encode())
+            digest.update(b'\0')
+            collector.visit(decl)
+
+        digests[module_name] = digest.digest()
+        refs[module_name] = collector.modules - s_schema.STD_MODULES
+
+    keys = {}
+    for module_name in digests:
+        closure = {module_name}
+        pending = [module_name]
+        while pending:
+            for ref in refs.get(pending.pop(), ()):
+                if ref not in closure:
+                    closure.add(ref)
+                    pending.append(ref)
+
+        digest = hashlib.sha1()
+        for ref in sorted(closure):
+            digest.update(ref.encode())
+            digest.update(digests.get(ref, b'\0'))
+
+        keys[module_name] = (module_name, digest.digest())
+
+    return keys
 
 
 def sdl_to_ddl(schema, documents):
+    documents = list(documents)
+    cache_keys = _get_dep_cache_keys(documents)
+    cached_deps = {
+        module_name: _dep_cache.get(key)
+        for module_name, key in cache_keys.items()
+    }
+
+    if any(deps is None for deps in cached_deps.values()):
+        ctx = _trace_layout(schema, documents)
+    else:
+        # The dependencies of every module are known, and the layout
+        # is only needed to trace them.
+        ctx = LayoutTraceContext(schema, local_modules=frozenset())
+
     ddlgraph = {}
     mods = []
+    traced_deps = {}
+
+    dctx = DepTraceContext(
+        schema, None, ctx.objects, ctx.parents, ctx.ancestors,
+        ctx.defdeps, ctx.constraints
+    )
+    for module_name, declarations in documents:
+        dctx.set_module(module_name)
+        dctx.cached_deps = cached_deps[module_name]
+        dctx.ddlgraph = module_graph = {}
+        # module needs to be created regardless of whether its
+        # contents are empty or not
+        mods.append(qlast.CreateModule(
+            name=qlast.ObjectRef(name=module_name)))
+        for decl_ast in declarations:
+            trace_dependencies(decl_ast, ctx=dctx)
+
+        if dctx.cached_deps is None:
+            traced_deps[module_name] = {
+                fq_name: frozenset(node['deps'])
+                for fq_name, node in module_graph.items()
+            }
+
+        ddlgraph.update(module_graph)
+
+    result = mods + list(topological.sort(ddlgraph, allow_unresolved=False))
+
+    for module_name, deps in traced_deps.items():
+        _dep_cache[cache_keys[module_name]] = deps
+    for key in cache_keys.values():
+        _dep_cache.move_to_end(key)
+    while len(_dep_cache) > _DEP_CACHE_SIZE:
+        _dep_cache.popitem(last=False)
+
+    return result
+
 
+def _trace_layout(schema, documents):
     ctx = LayoutTraceContext(
         schema,
         local_modules=frozenset(mod for mod, schema_decl in documents),
@@ -215,20 +347,7 @@ def sdl_to_ddl(schema, documents):
 
     topological.normalize(ctx.inh_graph, _merge_items)
 
-    ctx = DepTraceContext(
-        schema, ddlgraph, ctx.objects, ctx.parents, ctx.ancestors,
-        ctx.defdeps, ctx.constraints
-    )
-    for module_name, declarations in documents:
-        ctx.set_module(module_name)
-        # module needs to be created regardless of whether its
-        # contents are empty or not
-        mods.append(qlast.CreateModule(
-            name=qlast.ObjectRef(name=module_name)))
-        for decl_ast in declarations:
-            trace_dependencies(decl_ast, ctx=ctx)
-
-    return mods + list(topological.sort(ddlgraph, allow_unresolved=False))
+    return ctx
 
 
 def _merge_items(item, parent):
@@ -372,16 +491,17 @@ def trace_dependencies(node: qlast.Base, *, ctx: DepTraceContext):
 def trace_SetField(node: qlast.SetField, *, ctx: DepTraceContext):
     deps = set()
 
-    for dep in qltracer.trace_refs(
-        node.value,
-        schema=ctx.schema,
-        module=ctx.module,
-        objects=ctx.objects,
-        params={},
-    ):
-        # ignore std module dependencies
-        if not STD_PREFIX_RE.match(dep):
-            deps.add(dep)
+    if ctx.cached_deps is None:
+        for dep in qltracer.trace_refs(
+            node.value,
+            schema=ctx.schema,
+            module=ctx.module,
+            objects=ctx.objects,
+            params={},
+        ):
+            # ignore std module dependencies
+            if not STD_PREFIX_RE.match(dep):
+                deps.add(dep)
 
     _register_item(node, deps=deps, ctx=ctx)
 
@@ -527,14 +647,16 @@ def _register_item(
         "deps": {n for _, n in ctx.depstack if n != loop_control},
     }
     ctx.ddlgraph[fq_name] = node
+    # Dependencies are only traced if they are not cached.
+    tracing = ctx.cached_deps is None
 
-    if hasattr(decl, "bases"):
+    if tracing and hasattr(decl, "bases"):
         # add parents to dependencies
         parents = ctx.parents.get(fq_name)
         if parents is not None:
             deps.update(parents)
 
-    if ctx.depstack:
+    if tracing and ctx.depstack:
         # all ancestors should be seen as dependencies
         ancestor_bases = ctx.ancestors.get(ctx.depstack[-1][1])
         if ancestor_bases:
@@ -550,12 +672,12 @@ def _register_item(
         subcmds = []
         for cmd in ast_subcommands:
             # include dependency on constraints or annotations if present
-            if isinstance(cmd, qlast.CreateConcreteConstraint):
+            if tracing and isinstance(cmd, qlast.CreateConcreteConstraint):
                 cmd_name = ctx.get_local_name(
                     cmd.name, type=qltracer.Constraint)
                 if cmd_name.module not in s_schema.STD_MODULES:
                     deps.add(cmd_name)
-            elif isinstance(cmd, qlast.CreateAnnotationValue):
+            elif tracing and isinstance(cmd, qlast.CreateAnnotationValue):
                 cmd_name = ctx.get_local_name(
                     cmd.name, type=qltracer.Annotation)
                 if cmd_name.module not in s_schema.STD_MODULES:
@@ -604,7 +726,7 @@ def _register_item(
 
             ctx.depstack.pop()
 
-    if hard_dep_exprs:
+    if tracing and hard_dep_exprs:
         for expr in hard_dep_exprs:
             if isinstance(expr, qlast.TypeExpr):
                 deps |= _get_hard_deps(expr, ctx=ctx)
@@ -662,7 +784,10 @@ def _register_item(
         else:
             parent_node['loop-control'].add(fq_name)
 
-    node["deps"].update(deps)
+    if tracing:
+        node["deps"].update(deps)
+    else:
+        node["deps"] = set(ctx.cached_deps[fq_name])
 
 
 def _get_hard_deps(
@@ -72,6 +72,7 @@ __all__ = base.__all__ + (
     'TransactionError',
     'TransactionSerializationError',
     'TransactionDeadlockError',
+    'IdleTransactionTimeoutError',
     'ConfigurationError',
     'AccessError',
     'AuthenticationError',
@@ -324,6 +325,10 @@ class TransactionDeadlockError(TransactionError):
     _code = 0x_05_03_00_02
 
 
+class IdleTransactionTimeoutError(TransactionError):
+    _code = 0x_05_03_00_03
+
+
 class ConfigurationError(EdgeDBError):
     _code = 0x_06_00_00_00
 
@@ -46,3 +46,9 @@ class GraphQLValidationError(GraphQLTranslationError):
 
 class GraphQLCoreError(GraphQLError):
     pass
+
+
+class GraphQLPersistedQueryNotFound(GraphQLError):
+
+    def __init__(self, msg='PersistedQueryNotFound', **kwargs):
+        super().__init__(msg, **kwargs)
@@ -39,6 +39,7 @@ from graphql import (
     GraphQLEnumType,
 )
 from graphql.type import GraphQLEnumValue, GraphQLScalarType
+from graphql.utilities import build_client_schema, introspection_from_schema
 from graphql.language import ast as gql_ast
 import itertools
 
@@ -175,10 +176,20 @@ GQL_TO_OPS_MAP = {
 HIDDEN_MODULES = s_schema.STD_MODULES - {'std'}
 TOP_LEVEL_TYPES = {'Query', 'Mutation'}
 
+# Custom scalars which a schema built from an introspection result
+# needs to be patched with, as introspection carries no coercion logic.
+CUSTOM_SCALARS = (GraphQLInt64, GraphQLBigint, GraphQLDecimal)
+
 
 class GQLCoreSchema:
-    def __init__(self, edb_schema):
-        '''Create a graphql schema based on edgedb schema.'''
+    def __init__(self, edb_schema, *, introspection=None):
+        '''Create a graphql schema based on edgedb schema.
+
+        The GraphQL types are built lazily, when the GraphQL schema is
+        first needed.  If *introspection* (as returned by
+        get_introspection() for the same edgedb schema) is given, the
+        GraphQL schema is rebuilt from it rather than from edgedb types.
+        '''
 
         self.edb_schema = edb_schema
         # extract and sort modules to have a consistent type ordering
@@ -195,6 +206,13 @@ class GQLCoreSchema:
         self._gql_ordertypes = {}
         self._gql_enums = {}
 
+        self._gql_schema = None
+        self._introspection = introspection
+
+        # this map is used for GQL -> EQL translator needs
+        self._type_map = {}
+
+    def _build_schema(self):
         self._define_types()
 
         query = self._gql_objtypes['Query'] = GraphQLObjectType(
@@ -225,11 +243,17 @@ class GQLCoreSchema:
             if name not in TOP_LEVEL_TYPES
         ]
         types = sorted(types, key=lambda x: x.name)
-        self._gql_schema = GraphQLSchema(
-            query=query, mutation=mutation, types=types)
-
-        # this map is used for GQL -> EQL translator needs
-        self._type_map = {}
+        return GraphQLSchema(query=query, mutation=mutation, types=types)
+
+    def _build_schema_from_introspection(self):
+        schema = build_client_schema(self._introspection, assume_valid=True)
+        for scalar in CUSTOM_SCALARS:
+            gqltype = schema.type_map.get(scalar.name)
+            if gqltype is not None:
+                gqltype.serialize = scalar.serialize
+                gqltype.parse_value = scalar.parse_value
+                gqltype.parse_literal = scalar.parse_literal
+        return schema
 
     @property
     def edgedb_schema(self):
@@ -237,8 +261,24 @@ class GQLCoreSchema:
 
     @property
     def graphql_schema(self):
+        if self._gql_schema is None:
+            if self._introspection is not None:
+                self._gql_schema = self._build_schema_from_introspection()
+            else:
+                self._gql_schema = self._build_schema()
         return self._gql_schema
 
+    def get_introspection(self):
+        '''Return the result of the full ``__schema`` introspection query.
+
+        The result is plain data which can be shared with other processes
+        and passed to the constructor to skip building the GraphQL types.
+        '''
+        if self._introspection is None:
+            self._introspection = introspection_from_schema(
+                self.graphql_schema)
+        return self._introspection
+
     def get_gql_name(self, name):
         module, shortname = name.split('::', 1)
         if module in {'default', 'std'}:
@@ -18,6 +18,7 @@
 
 
 from __future__ import annotations
+from typing import *
 
 import binascii
 import functools
@@ -41,6 +42,18 @@ from edb.schema import types as s_types
 from . import keywords as pg_keywords
 
 
+# Names other than those of the support functions, which make
+# a function body parallel unsafe.  The labels of the support
+# functions are derived from their own bodies.
+PARALLEL_UNSAFE_REFS: FrozenSet[str] = frozenset()
+
+# Session state is kept in temporary tables, which parallel workers
+# cannot access, so functions that read it are parallel restricted.
+PARALLEL_RESTRICTED_REFS = frozenset({
+    '_edgecon_state',
+})
+
+
 def quote_e_literal(string):
     def escape_sq(s):
         split = re.split(r"(\n|\\\\|\\')", s)
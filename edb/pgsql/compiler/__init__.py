@@ -48,7 +48,8 @@ def compile_ir_to_sql_tree(
         explicit_top_cast: Optional[irast.TypeRef]=None,
         singleton_mode: bool=False,
         use_named_params: bool=False,
-        expected_cardinality_one: bool=False) -> pgast.Base:
+        expected_cardinality_one: bool=False,
+        source_map: Optional[Dict[str, Dict[str, Any]]]=None) -> pgast.Base:
     try:
         # Transform to sql tree
         query_params = []
@@ -69,7 +70,8 @@ def compile_ir_to_sql_tree(
             query_params=query_params,
             ignore_object_shapes=ignore_shapes,
             explicit_top_cast=explicit_top_cast,
-            singleton_mode=singleton_mode)
+            singleton_mode=singleton_mode,
+            source_map=source_map)
 
         ctx = context.CompilerContextLevel(
             None,
@@ -99,8 +101,15 @@ def compile_ir_to_sql(
     explicit_top_cast: Optional[irast.TypeRef]=None,
     use_named_params: bool=False,
     expected_cardinality_one: bool=False,
-    pretty: bool=True
+    pretty: bool=True,
+    source_map: Optional[Dict[str, Dict[str, Any]]]=None,
 ) -> Tuple[str, Dict[str, pgast.Param]]:
+    """Compile IR into SQL text.
+
+    If *source_map* is given, it is filled with a mapping of the range
+    aliases and CTE names used in the generated SQL to the EdgeQL source
+    they were compiled from.
+    """
 
     qtree = compile_ir_to_sql_tree(
         ir_expr,
@@ -108,7 +117,17 @@ def compile_ir_to_sql(
         ignore_shapes=ignore_shapes,
         explicit_top_cast=explicit_top_cast,
         use_named_params=use_named_params,
-        expected_cardinality_one=expected_cardinality_one)
+        expected_cardinality_one=expected_cardinality_one,
+        source_map=source_map)
+
+    return generate_sql(qtree, pretty=pretty)
+
+
+def generate_sql(
+    qtree: pgast.Base, *,
+    pretty: bool=True,
+) -> Tuple[str, Dict[str, pgast.Param]]:
+    """Generate SQL text for a tree produced by compile_ir_to_sql_tree()."""
 
     if debug.flags.edgeql_compile:  # pragma: no cover
         debug.header('SQL Tree')
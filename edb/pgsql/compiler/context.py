@@ -281,6 +281,7 @@ class Environment:
     explicit_top_cast: Optional[irast.TypeRef]
     singleton_mode: bool
     query_params: List[irast.Param]
+    source_map: Optional[Dict[str, Dict[str, Any]]]
 
     def __init__(
         self,
@@ -292,6 +293,7 @@ class Environment:
         singleton_mode: bool,
         explicit_top_cast: Optional[irast.TypeRef],
         query_params: List[irast.Param],
+        source_map: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> None:
         self.aliases = aliases.AliasGenerator()
         self.output_format = output_format
@@ -302,3 +304,4 @@ class Environment:
         self.singleton_mode = singleton_mode
         self.explicit_top_cast = explicit_top_cast
         self.query_params = query_params
+        self.source_map = source_map
@@ -27,6 +27,8 @@ from typing import *
 
 from edb import errors
 
+from edb.common import ast
+
 from edb.edgeql import qltypes
 
 from edb.schema import objects as s_obj
@@ -187,6 +189,9 @@ def get_set_rvar(
             null_query = rvars.main.rvar.query
             null_query.where_clause = pgast.BooleanConstant(val='FALSE')
 
+        if ctx.env.source_map is not None:
+            _record_source_map(ir_set, rvars, ctx=ctx)
+
         for set_rvar in rvars.new:
             # overwrite_path_rvar is needed because we want
             # the outermost Set with the given path_id to
@@ -217,9 +222,56 @@ def _process_toplevel_query(
 
     relctx.init_toplevel_query(ir_set, ctx=ctx)
     rvars = _get_set_rvar(ir_set, ctx=ctx)
+    if ctx.env.source_map is not None:
+        _record_source_map(ir_set, rvars, ctx=ctx)
     return rvars.main.rvar
 
 
+def _record_source_map(
+        ir_set: irast.Set, rvars: SetRVars, *,
+        ctx: context.CompilerContextLevel) -> None:
+    """Map the range aliases produced for *ir_set* to its EdgeQL source.
+
+    Nested sets are compiled first, so the aliases already claimed by
+    them are left alone and every alias maps to the innermost set it
+    was produced for.
+    """
+    source_map = ctx.env.source_map
+    assert source_map is not None
+
+    entry: Optional[Dict[str, Any]] = None
+
+    for set_rvar in rvars.new:
+        nodes = [set_rvar.rvar]
+        nodes.extend(ast.find_children(
+            set_rvar.rvar,
+            lambda n: isinstance(n, (pgast.BaseRangeVar,
+                                     pgast.CommonTableExpr)),
+        ))
+
+        for node in nodes:
+            if isinstance(node, pgast.CommonTableExpr):
+                name = node.name
+            elif node.alias is not None:
+                name = node.alias.aliasname
+            else:
+                continue
+
+            if not name or name in source_map:
+                continue
+
+            if entry is None:
+                entry = {'path': str(ir_set.path_id)}
+                srcctx = ir_set.context
+                if srcctx is not None:
+                    entry['line'] = srcctx.start.line
+                    entry['column'] = srcctx.start.column
+                    entry['text'] = srcctx.buffer[
+                        srcctx.start.pointer:srcctx.end.pointer]
+
+            source_map[name] = entry
+
+
 def _get_set_rvar(
         ir_set: irast.Set, *,
         ctx: context.CompilerContextLevel) -> SetRVars:
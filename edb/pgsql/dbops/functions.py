@@ -19,8 +19,11 @@
 
 from __future__ import annotations
 
+import re
 import textwrap
 
+from ..common import PARALLEL_RESTRICTED_REFS
+from ..common import PARALLEL_UNSAFE_REFS
 from ..common import qname as qn
 from ..common import quote_ident as qi
 from ..common import quote_literal as ql
@@ -30,11 +33,109 @@ from . import base
 from . import ddl
 
 
+PARALLEL_SAFE = 'safe'
+PARALLEL_RESTRICTED = 'restricted'
+PARALLEL_UNSAFE = 'unsafe'
+
+_parallel_safety_order = (PARALLEL_UNSAFE, PARALLEL_RESTRICTED, PARALLEL_SAFE)
+
+# Function bodies that write to the database, use sequences, change
+# the settings or start subtransactions (PL/pgSQL EXCEPTION blocks)
+# cannot be run by a parallel worker.
+_parallel_unsafe_re = re.compile(
+    r'''\b(?:
+        INSERT | UPDATE | DELETE | TRUNCATE | COPY | LOCK
+        | nextval | setval | lastval | set_config
+        | pg_advisory_\w+
+        | EXCEPTION \s+ WHEN
+    )\b''',
+    re.X | re.I,
+)
+
+# Temporary tables and backend-local state can only be accessed by
+# the leader process.
+_parallel_restricted_re = re.compile(r'\b(?:pg_temp|setseed)\b', re.I)
+
+_sql_literal_re = re.compile(r"'(?:[^']|'')*'|--[^\n]*")
+
+
+def least_parallel_safe(*levels):
+    """Return the most restrictive of the given parallel safety levels."""
+    return min(levels, key=_parallel_safety_order.index,
+               default=PARALLEL_SAFE)
+
+
+def classify_parallel_safety(volatility, text, *,
+                             unsafe_refs=PARALLEL_UNSAFE_REFS,
+                             restricted_refs=PARALLEL_RESTRICTED_REFS):
+    """Guess the parallel safety of a function from its volatility and body.
+
+    *unsafe_refs* and *restricted_refs* are collections of names of
+    tables and functions which make the function parallel unsafe or
+    restricted when referenced in its body.
+    """
+    if str(volatility).lower() == 'volatile':
+        return PARALLEL_UNSAFE
+
+    if not text:
+        return PARALLEL_SAFE
+
+    # Keywords in string literals and comments do not count.
+    text = _sql_literal_re.sub('', text)
+
+    if (_parallel_unsafe_re.search(text) or
+            any(ref in text for ref in unsafe_refs)):
+        return PARALLEL_UNSAFE
+
+    if (_parallel_restricted_re.search(text) or
+            any(ref in text for ref in restricted_refs)):
+        return PARALLEL_RESTRICTED
+
+    return PARALLEL_SAFE
+
+
+def propagate_parallel_safety(functions):
+    """Lower the parallel safety of *functions* to that of their callees.
+
+    A function is only as parallel safe as the functions among
+    *functions* that its body calls, directly or indirectly.
+    """
+    functions = list(functions)
+
+    callees = {}
+    for func in functions:
+        text = _sql_literal_re.sub('', func.text or '')
+        callees[func] = [
+            callee for callee in functions
+            if callee is not func and _calls(text, callee)
+        ]
+
+    changed = True
+    while changed:
+        changed = False
+        for func in functions:
+            safety = least_parallel_safe(
+                func.parallel_safety,
+                *(callee.parallel_safety for callee in callees[func]))
+            if safety != func.parallel_safety:
+                func.parallel_safety = safety
+                changed = True
+
+
+def _calls(text, func):
+    schema, name = func.name
+    return re.search(
+        rf'(?:\b{re.escape(f"{schema}.{name}")}'
+        rf'|{re.escape(qn(schema, name))})\s*\(',
+        text,
+    ) is not None
+
+
 class Function(base.DBObject):
     def __init__(self, name, *, args=None, returns, text,
                  volatility='volatile', language='sql',
                  has_variadic=None, strict=False,
-                 set_returning=False):
+                 set_returning=False, parallel_safety=None):
         self.name = name
         self.args = args
         self.returns = returns
@@ -44,6 +145,9 @@ class Function(base.DBObject):
         self.has_variadic = has_variadic
         self.strict = strict
         self.set_returning = set_returning
+        if parallel_safety is None:
+            parallel_safety = classify_parallel_safety(volatility, text)
+        self.parallel_safety = parallel_safety
 
     def __repr__(self):
         return '<{} {} at 0x{}>'.format(
@@ -118,7 +222,8 @@ class CreateFunction(ddl.DDLOperation, FunctionOperation):
             AS $____funcbody____$
             {text}
             $____funcbody____$
-            LANGUAGE {lang} {volatility} {strict};
+            LANGUAGE {lang} {volatility} {strict}
+            PARALLEL {parallel};
         ''').format_map({
             'replace': 'OR REPLACE' if self.or_replace else '',
             'name': qn(*self.function.name),
@@ -129,6 +234,7 @@ class CreateFunction(ddl.DDLOperation, FunctionOperation):
             'text': textwrap.dedent(self.function.text).strip(),
             'strict': 'STRICT' if self.function.strict else '',
             'setof': 'SETOF' if self.function.set_returning else '',
+            'parallel': self.function.parallel_safety.upper(),
         })
         return code.strip()
 
@@ -152,7 +258,8 @@ class CreateOrReplaceFunction(ddl.DDLOperation, FunctionOperation):
             AS $____funcbody____$
             {text}
             $____funcbody____$
-            LANGUAGE {lang} {volatility} {strict};
+            LANGUAGE {lang} {volatility} {strict}
+            PARALLEL {parallel};
         ''').format_map({
             'name': qn(*self.function.name),
             'args': args,
@@ -162,6 +269,7 @@ class CreateOrReplaceFunction(ddl.DDLOperation, FunctionOperation):
             'text': textwrap.dedent(self.function.text).strip(),
             'strict': 'STRICT' if self.function.strict else '',
             'setof': 'SETOF' if self.function.set_returning else '',
+            'parallel': self.function.parallel_safety.upper(),
         })
         return code.strip()
 
@@ -151,17 +151,25 @@ class Index(tables.InheritableTableObject):
                 ;
         ''')
 
-    def creation_code(self, block: base.PLBlock) -> str:
+    def creation_code(
+        self,
+        block: base.PLBlock,
+        *,
+        concurrently: bool = False,
+        if_not_exists: bool = False,
+    ) -> str:
         if self.expr:
             expr = self.expr
         else:
             expr = ', '.join(qi(c) for c in self.columns)
 
         code = '''
-            CREATE {unique} INDEX {name}
+            CREATE {unique} INDEX {concurrently} {if_not_exists} {name}
                 ON {table} ({expr}) {predicate}'''.format(
 
             unique='UNIQUE' if self.unique else '',
+            concurrently='CONCURRENTLY' if concurrently else '',
+            if_not_exists='IF NOT EXISTS' if if_not_exists else '',
             name=qn(self.name_in_catalog),
             table=qn(*self.table_name),
             expr=expr,
@@ -292,6 +300,59 @@ class CreateIndex(tables.CreateInheritableTableObject):
         return Index.creation_pl_code(index_desc_var, block)
 
 
+class CreateIndexConcurrently(ddl.NonTransactionalDDLOperation, CreateIndex):
+    """Create an index without blocking writes to its table.
+
+    CREATE INDEX CONCURRENTLY cannot be executed in a transaction block
+    or a PL/pgSQL function, so the index is not propagated to the
+    descendant tables automatically, use a separate command for each
+    of them instead.
+
+    An existing valid index is kept, so that a failed command can be
+    retried.  An invalid index, left by a failed build, is rebuilt.
+    """
+
+    def generate_self_block(
+        self,
+        block: base.PLBlock,
+    ) -> Optional[base.PLBlock]:
+        block.add_command(self.drop_invalid_code(block))
+        return super().generate_self_block(block)
+
+    def drop_invalid_code(self, block: base.PLBlock) -> str:
+        index = self.index
+        schema = index.table_name[0]
+        name = index.name_in_catalog
+
+        return textwrap.dedent(f'''\
+            DO LANGUAGE plpgsql $__$
+            BEGIN
+                IF EXISTS (
+                    SELECT
+                    FROM pg_catalog.pg_index AS i
+                        INNER JOIN pg_catalog.pg_class AS c
+                            ON c.oid = i.indexrelid
+                        INNER JOIN pg_catalog.pg_namespace AS ns
+                            ON ns.oid = c.relnamespace
+                    WHERE
+                        ns.nspname = {ql(schema)}
+                        AND c.relname = {ql(name)}
+                        AND NOT i.indisvalid
+                ) THEN
+                    DROP INDEX {qn(schema, name)};
+                END IF;
+            END;
+            $__$;
+        ''')
+
+    def code(self, block: base.PLBlock) -> str:
+        return self.index.creation_code(
+            block, concurrently=True, if_not_exists=True)
+
+    def generate_extra(self, block: base.PLBlock) -> None:
+        ddl.CreateObject.generate_extra(self, block)
+
+
 class RenameIndex(tables.RenameInheritableTableObject):
     def __init__(self, index, *, new_name, conditional=False, **kwargs):
         super().__init__(index, new_name=new_name, **kwargs)
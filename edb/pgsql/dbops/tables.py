@@ -19,11 +19,16 @@
 
 from __future__ import annotations
 
+from typing import *
+
 import collections
+import enum
 import textwrap
 
 from edb.common import ordered
+from edb.server import defines
 
+from .. import common
 from ..common import qname as qn
 from ..common import quote_ident as qi
 from ..common import quote_literal as ql
@@ -388,6 +393,17 @@ class AlterTableBase(AlterTableBaseMixin, ddl.DDLOperation):
         return 'COLUMN'
 
 
+class TableEffect(enum.IntEnum):
+    """The effect of an ALTER TABLE action on existing table data."""
+
+    #: Only the system catalogs are changed.
+    NONE = 0
+    #: Existing rows are scanned to validate the change.
+    SCAN = 1
+    #: The table and its indexes are rewritten.
+    REWRITE = 2
+
+
 class AlterTableFragment(ddl.DDLOperation):
     def get_attribute_term(self):
         return 'COLUMN'
@@ -395,6 +411,17 @@ class AlterTableFragment(ddl.DDLOperation):
     def generate_extra(self, block, parent_op) -> None:
         pass
 
+    def get_table_effect(self) -> TableEffect:
+        return TableEffect.NONE
+
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        """Return the table element this action modifies.
+
+        Actions that return None are never merged into an ALTER TABLE
+        produced by :func:`coalesce_alter_tables`.
+        """
+        return None
+
 
 class AlterTable(
         AlterTableBaseMixin, ddl.DDLOperation, base.CompositeCommandGroup):
@@ -409,6 +436,15 @@ class AlterTable(
 
     add_operation = base.CompositeCommandGroup.add_command
 
+    def get_table_effect(self) -> TableEffect:
+        effect = TableEffect.NONE
+        for op in self.commands:
+            if isinstance(op, tuple):
+                op = op[0]
+            if isinstance(op, AlterTableFragment):
+                effect = max(effect, op.get_table_effect())
+        return effect
+
 
 class AlterTableDDLTriggerMixin:
     """Utility mixin to provide functions to propagate inherited objects."""
@@ -476,6 +512,9 @@ class AlterTableAddParent(AlterTableFragment):
     def code(self, block: base.PLBlock) -> str:
         return f'INHERIT {qn(*self.parent_name)}'
 
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('parent', qn(*self.parent_name))
+
     def __repr__(self):
         return '<%s.%s %s>' % (
             self.__class__.__module__, self.__class__.__name__,
@@ -489,6 +528,9 @@ class AlterTableDropParent(AlterTableFragment):
     def code(self, block: base.PLBlock) -> str:
         return f'NO INHERIT {qn(*self.parent_name)}'
 
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('parent', qn(*self.parent_name))
+
     def __repr__(self):
         return '<%s.%s %s>' % (
             self.__class__.__module__, self.__class__.__name__,
@@ -497,17 +539,34 @@ class AlterTableDropParent(AlterTableFragment):
 
 class AlterTableAddColumn(
         composites.AlterCompositeAddAttribute, AlterTableFragment):
-    pass
+
+    def get_table_effect(self) -> TableEffect:
+        # Adding a column with a volatile default rewrites the table,
+        # and we cannot tell whether the default is volatile here.
+        if self.attribute.default is not None:
+            return TableEffect.REWRITE
+        else:
+            return TableEffect.NONE
+
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('column', self.attribute.name)
 
 
 class AlterTableDropColumn(
         composites.AlterCompositeDropAttribute, AlterTableFragment):
-    pass
+
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('column', self.attribute.name)
 
 
 class AlterTableAlterColumnType(
         composites.AlterCompositeAlterAttributeType, AlterTableFragment):
-    pass
+
+    def get_table_effect(self) -> TableEffect:
+        return TableEffect.REWRITE
+
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('column', str(self.attribute_name))
 
 
 class AlterTableAlterColumnNull(AlterTableFragment):
@@ -519,6 +578,12 @@ class AlterTableAlterColumnNull(AlterTableFragment):
         action = 'DROP' if self.null else 'SET'
         return f'ALTER COLUMN {qi(self.column_name)} {action} NOT NULL'
 
+    def get_table_effect(self) -> TableEffect:
+        return TableEffect.NONE if self.null else TableEffect.SCAN
+
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('column', self.column_name)
+
     def __repr__(self):
         return '<{}.{} "{}" {} NOT NULL>'.format(
             self.__class__.__module__, self.__class__.__name__,
@@ -537,6 +602,9 @@ class AlterTableAlterColumnDefault(AlterTableFragment):
             return (f'ALTER COLUMN {qi(self.column_name)} '
                     f'SET DEFAULT {self.default}')
 
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('column', self.column_name)
+
     def __repr__(self):
         return '<{}.{} "{}" {} DEFAULT{}>'.format(
             self.__class__.__module__, self.__class__.__name__,
@@ -590,6 +658,9 @@ class AlterTableAddConstraint(AlterTableFragment, TableConstraintCommand):
             # Dynamic declaration
             return base.PLExpression(f'{ql(code)} || {constr_code}')
 
+    def get_table_effect(self) -> TableEffect:
+        return TableEffect.SCAN
+
     def generate_extra(self, block, alter_table):
         return self.constraint.generate_extra(block)
 
@@ -625,6 +696,9 @@ class AlterTableDropConstraint(AlterTableFragment, TableConstraintCommand):
     def code(self, block: base.PLBlock) -> str:
         return f'DROP CONSTRAINT {self.constraint.constraint_name()}'
 
+    def get_coalesce_key(self) -> Optional[Tuple[str, str]]:
+        return ('constraint', self.constraint.constraint_name())
+
     def __repr__(self):
         return '<%s.%s %r>' % (
             self.__class__.__module__, self.__class__.__name__,
@@ -658,6 +732,215 @@ class AlterTableRenameColumn(
     pass
 
 
+def _get_coalesce_keys(op: AlterTable) -> Optional[Set[Tuple[str, str]]]:
+    if op.conditions or op.neg_conditions:
+        return None
+
+    keys = set()
+    for cmd in op.commands:
+        if not isinstance(cmd, AlterTableFragment):
+            # Conditional actions are emitted as separate statements.
+            return None
+        key = cmd.get_coalesce_key()
+        if key is None or key in keys:
+            return None
+        keys.add(key)
+
+    return keys
+
+
+def coalesce_alter_tables(
+    ops: Iterable[base.Command],
+) -> List[base.Command]:
+    """Merge adjacent ALTER TABLE commands on the same table.
+
+    Each ALTER TABLE statement takes an ACCESS EXCLUSIVE lock on its
+    table, and each column type change rewrites it, so a migration
+    touching many properties of one type is much cheaper when all of
+    its actions run as a single statement.
+
+    Only commands that are next to each other in *ops* are merged, so
+    the order of statements on different tables is preserved.  Commands
+    with conditions, or with actions that are not known to be safe to
+    combine (e.g. constraints with generated code), are left as is.
+    Two commands are also never merged if they modify the same column,
+    constraint or parent, as PostgreSQL does not allow that within a
+    single ALTER TABLE.
+    """
+    result: List[base.Command] = []
+    merged: Optional[AlterTable] = None
+    run_keys: Optional[Set[Tuple[str, str]]] = None
+
+    for op in ops:
+        if type(op) is not AlterTable:
+            result.append(op)
+            run_keys = None
+            continue
+
+        keys = _get_coalesce_keys(op)
+        prev = result[-1] if result else None
+
+        if (keys is not None
+                and run_keys is not None
+                and isinstance(prev, AlterTable)
+                and prev.name == op.name
+                and prev.contained == op.contained
+                and prev.priority == op.priority
+                and not (keys & run_keys)):
+            if prev is not merged:
+                # Do not modify the commands owned by the delta.
+                merged = AlterTable(
+                    prev.name, contained=prev.contained,
+                    priority=prev.priority)
+                merged.add_commands(prev.commands)
+                result[-1] = merged
+            merged.add_commands(op.commands)
+            run_keys |= keys
+        else:
+            result.append(op)
+            run_keys = keys
+
+    return result
+
+
+def explain_table_effects(ops: Iterable[base.Command]) -> List[str]:
+    """Describe the effect of ALTER TABLE commands in *ops* on table data.
+
+    Returns a list of SQL comment lines, one per ALTER TABLE command and
+    one per its action, annotated with the :class:`TableEffect` of the
+    action.
+    """
+    lines = []
+    block = base.PLTopBlock()
+
+    for op in ops:
+        if not isinstance(op, AlterTable):
+            continue
+
+        effect = op.get_table_effect()
+        lines.append(f'-- {op.prefix_code()}: {effect.name.lower()}')
+        for cmd in op.commands:
+            if isinstance(cmd, tuple):
+                cmd, prefix = cmd[0], 'conditional '
+            else:
+                prefix = ''
+            if isinstance(cmd, AlterTableFragment):
+                effect = cmd.get_table_effect()
+            else:
+                effect = TableEffect.NONE
+            lines.append(
+                f'--     {prefix}{cmd.code(block)}: {effect.name.lower()}')
+
+    return lines
+
+
+class BackfillColumn(ddl.NonTransactionalDDLOperation):
+    """Set a column to its default value in existing rows in batches.
+
+    Each batch is committed separately, so concurrent writes to the
+    table are only blocked by the rows of the batch being updated.
+    The table is walked in the order of its ``id`` primary key, so
+    every row is visited once, even if its default is NULL.
+    Progress is reported with NOTICE messages carrying the
+    EDGEDB_DDL_PROGRESS_HINT hint.
+    """
+
+    def __init__(self, table_name, column_name, *, batch_size, **kwargs):
+        super().__init__(**kwargs)
+        self.table_name = table_name
+        self.column_name = column_name
+        self.batch_size = batch_size
+
+    def code(self, block: base.PLBlock) -> str:
+        table = qn(*self.table_name)
+        column = qi(self.column_name)
+        message = ql(f'backfilled % rows of {table}.{column}')
+        hint = ql(defines.EDGEDB_DDL_PROGRESS_HINT)
+
+        return textwrap.dedent(f'''\
+            DO LANGUAGE plpgsql $__$
+            DECLARE
+                -- The nil UUID is never an object id.
+                lower_id uuid := '00000000-0000-0000-0000-000000000000';
+                upper_id uuid;
+                batch bigint;
+                total bigint := 0;
+            BEGIN
+                LOOP
+                    SELECT max(id) INTO upper_id FROM (
+                        SELECT id FROM ONLY {table}
+                        WHERE id > lower_id
+                        ORDER BY id
+                        LIMIT {self.batch_size}
+                    ) AS q;
+                    EXIT WHEN upper_id IS NULL;
+
+                    UPDATE ONLY {table}
+                    SET {column} = DEFAULT
+                    WHERE id > lower_id
+                        AND id <= upper_id
+                        AND {column} IS NULL;
+                    GET DIAGNOSTICS batch = ROW_COUNT;
+                    total := total + batch;
+                    lower_id := upper_id;
+                    COMMIT;
+                    RAISE NOTICE {message}, total USING HINT = {hint};
+                END LOOP;
+            END;
+            $__$;
+        ''')
+
+    def __repr__(self):
+        return '<{}.{} {}.{}>'.format(
+            self.__class__.__module__, self.__class__.__name__,
+            qn(*self.table_name), self.column_name)
+
+
+class AlterTableSetColumnNotNullOnline(ddl.DDLOperation):
+    """Add a NOT NULL constraint without blocking writes during the scan.
+
+    The existing rows are validated with a NOT VALID check constraint
+    and a separate VALIDATE CONSTRAINT, which does not block writes.
+    SET NOT NULL then uses the validated check constraint instead of
+    scanning the table.  Every statement is a separate transaction.
+    """
+
+    def __init__(self, table_name, column_name, **kwargs):
+        super().__init__(**kwargs)
+        self.table_name = table_name
+        self.column_name = column_name
+
+    def generate_self_block(
+        self,
+        block: base.SQLBlock,
+    ) -> Optional[base.PLBlock]:
+        table = qn(*self.table_name)
+        column = qi(self.column_name)
+        constraint = qi(common.edgedb_name_to_pg_name(
+            f'{self.column_name}__not_null'))
+
+        # The constraint may be left behind by a failed earlier attempt.
+        block.add_command(
+            f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}')
+        block.add_command(
+            f'ALTER TABLE {table} ADD CONSTRAINT {constraint} '
+            f'CHECK ({column} IS NOT NULL) NOT VALID')
+        block.add_command(
+            f'ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}')
+        block.add_command(
+            f'ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL')
+        block.add_command(
+            f'ALTER TABLE {table} DROP CONSTRAINT {constraint}')
+        block.set_non_transactional()
+
+        return None
+
+    def __repr__(self):
+        return '<{}.{} {}.{}>'.format(
+            self.__class__.__module__, self.__class__.__name__,
+            qn(*self.table_name), self.column_name)
+
+
 class DropTable(ddl.SchemaObjectOperation):
     def code(self, block: base.PLBlock) -> str:
         return f'DROP TABLE {qn(*self.name)}'
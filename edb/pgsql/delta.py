@@ -20,6 +20,7 @@
 from __future__ import annotations
 
 import collections.abc
+import functools
 import itertools
 import textwrap
 from typing import *
@@ -69,6 +70,7 @@ from .common import quote_ident as qi
 from .common import quote_type as qt
 from . import compiler
 from . import codegen
+from . import metaschema
 from . import schemamech
 from . import types
 
@@ -363,6 +365,96 @@ class DeleteParameter(ParameterCommand, DeleteObject,
     pass
 
 
+def _get_function_ir(func: s_funcs.Function, schema):
+    nativecode = func.get_nativecode(schema)
+    if nativecode.irast is None:
+        params = func.get_params(schema)
+        nativecode = s_expr.Expression.compiled(
+            nativecode,
+            schema,
+            options=qlcompiler.CompilerOptions(
+                anchors=s_funcs.get_params_symtable(
+                    params,
+                    schema,
+                    inlined_defaults=bool(params.find_named_only(schema)),
+                ),
+                func_params=params,
+                session_mode=func.get_session_only(schema),
+            ),
+        )
+
+    return nativecode.irast
+
+
+@functools.lru_cache()
+def _get_parallel_safety_refs():
+    """Return the names that make a body parallel unsafe or restricted.
+
+    The support functions of the metaschema are added to the names in
+    common.PARALLEL_UNSAFE_REFS and common.PARALLEL_RESTRICTED_REFS
+    according to their labels.
+    """
+    unsafe_refs = set(common.PARALLEL_UNSAFE_REFS)
+    restricted_refs = set(common.PARALLEL_RESTRICTED_REFS)
+
+    for cmd in metaschema.get_bootstrap_commands().commands:
+        if not isinstance(cmd, dbops.CreateFunction):
+            continue
+        func = cmd.function
+        if func.parallel_safety == dbops.PARALLEL_UNSAFE:
+            unsafe_refs.add('.'.join(func.name))
+        elif func.parallel_safety == dbops.PARALLEL_RESTRICTED:
+            restricted_refs.add('.'.join(func.name))
+
+    return frozenset(unsafe_refs), frozenset(restricted_refs)
+
+
+def _classify_parallel_safety(volatility, text):
+    unsafe_refs, restricted_refs = _get_parallel_safety_refs()
+    return dbops.classify_parallel_safety(
+        volatility, text,
+        unsafe_refs=unsafe_refs, restricted_refs=restricted_refs)
+
+
+def _get_callable_parallel_safety(obj, schema, memo):
+    try:
+        return memo[obj]
+    except KeyError:
+        pass
+
+    # Recursive calls do not make the function any less safe,
+    # so assume the best until the body is classified.
+    memo[obj] = dbops.PARALLEL_SAFE
+
+    # Functions defined as aliases of SQL functions are classified
+    # by the name of the aliased function.
+    safety = _classify_parallel_safety(
+        obj.get_volatility(schema),
+        obj.get_code(schema) or obj.get_from_function(schema),
+    )
+
+    if (safety != dbops.PARALLEL_UNSAFE
+            and isinstance(obj, s_funcs.Function)
+            and obj.get_nativecode(schema) is not None):
+        safety = dbops.least_parallel_safe(
+            safety,
+            _get_refs_parallel_safety(
+                _get_function_ir(obj, schema), schema, memo),
+        )
+
+    memo[obj] = safety
+    return safety
+
+
+def _get_refs_parallel_safety(ir, schema, memo):
+    """Return the parallel safety of functions and operators used in *ir*."""
+    return dbops.least_parallel_safe(*(
+        _get_callable_parallel_safety(ref, schema, memo)
+        for ref in ir.schema_refs
+        if isinstance(ref, s_funcs.VolatilitySubject)
+    ))
+
+
 class FunctionCommand:
 
     def get_pgname(self, func: s_funcs.Function, schema):
@@ -430,9 +522,13 @@ class FunctionCommand:
 
         return args
 
-    def make_function(self, func: s_funcs.Function, code, schema):
+    def make_function(self, func: s_funcs.Function, code, schema, *,
+                      parallel_safety=None):
         func_return_typemod = func.get_return_typemod(schema)
         func_params = func.get_params(schema)
+        if parallel_safety is None:
+            parallel_safety = _classify_parallel_safety(
+                func.get_volatility(schema), code)
         return dbops.Function(
             name=self.get_pgname(func, schema),
             args=self.compile_args(func, schema),
@@ -441,7 +537,8 @@ class FunctionCommand:
             volatility=func.get_volatility(schema),
             returns=self.get_pgtype(
                 func, func.get_return_type(schema), schema),
-            text=code)
+            text=code,
+            parallel_safety=parallel_safety)
 
     def compile_sql_function(self, func: s_funcs.Function, schema):
         return self.make_function(func, func.get_code(schema), schema)
@@ -459,7 +556,16 @@ class FunctionCommand:
             output_format=compiler.OutputFormat.NATIVE,
             use_named_params=True)
 
-        return self.make_function(func, sql_text, schema)
+        # The function body is compiled into calls of other functions,
+        # which must be parallel safe too for the function to be.
+        parallel_safety = dbops.least_parallel_safe(
+            _classify_parallel_safety(func.get_volatility(schema), sql_text),
+            _get_refs_parallel_safety(
+                nativecode.irast, schema, {func: dbops.PARALLEL_SAFE}),
+        )
+
+        return self.make_function(
+            func, sql_text, schema, parallel_safety=parallel_safety)
 
     def make_op(
         self,
@@ -610,14 +716,17 @@ class OperatorCommand(FunctionCommand):
         return args
 
     def make_operator_function(self, oper: s_opers.Operator, schema):
+        volatility = oper.get_volatility(schema)
+        code = oper.get_code(schema)
         return dbops.Function(
             name=common.get_backend_name(
                 schema, oper, catenate=False, aspect='function'),
             args=self.compile_args(oper, schema),
-            volatility=oper.get_volatility(schema),
+            volatility=volatility,
             returns=self.get_pgtype(
                 oper, oper.get_return_type(schema), schema),
-            text=oper.get_code(schema))
+            text=code,
+            parallel_safety=_classify_parallel_safety(volatility, code))
 
 
 class CreateOperator(OperatorCommand, CreateObject,
@@ -786,11 +895,16 @@ class CastCommand:
 
         returns = types.pg_type_from_object(schema, cast.get_to_type(schema))
 
+        volatility = cast.get_volatility(schema)
+        code = cast.get_code(schema)
+
         return dbops.Function(
             name=name,
             args=args,
             returns=returns,
-            text=cast.get_code(schema),
+            text=code,
+            volatility=volatility,
+            parallel_safety=_classify_parallel_safety(volatility, code),
         )
 
 
@@ -1589,6 +1703,33 @@ class CompositeObjectMetaCommand(ObjectMetaCommand):
         return schema
 
 
+def _create_index_concurrently(schema, subject, pg_index, *, priority=0):
+    """Create an index on the table of *subject* without blocking writes.
+
+    The index is created on the tables of the descendants of *subject*
+    explicitly, as concurrent index creation cannot be propagated from
+    a PL/pgSQL block.
+    """
+    ops = [dbops.CreateIndexConcurrently(pg_index, priority=priority)]
+
+    if isinstance(subject, s_objtypes.ObjectType):
+        for desc in subject.descendants(schema):
+            if not ObjectTypeMetaCommand.has_table(desc, schema):
+                continue
+
+            desc_index = dbops.Index(
+                name=pg_index.name,
+                table_name=common.get_backend_name(
+                    schema, desc, catenate=False),
+                expr=pg_index.expr, unique=pg_index.unique,
+                columns=pg_index.columns, predicate=pg_index.predicate,
+                metadata={**pg_index.metadata, 'ddl:inherited': True})
+            ops.append(
+                dbops.CreateIndexConcurrently(desc_index, priority=priority))
+
+    return ops
+
+
 class IndexCommand(sd.ObjectCommand, metaclass=ReferencedObjectCommandMeta):
     pass
 
@@ -1652,7 +1793,14 @@ class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
             name=index_name[1], table_name=table_name, expr=sql_expr,
             unique=False, inherit=True,
             metadata={'schemaname': index.get_name(schema)})
-        self.pgops.add(dbops.CreateIndex(pg_index, priority=3))
+
+        if (context.online_ddl_batch_size is not None
+                and not isinstance(parent_ctx.op, sd.CreateObject)):
+            # The table exists and may be large.
+            self.pgops.update(_create_index_concurrently(
+                schema, subject, pg_index, priority=3))
+        else:
+            self.pgops.add(dbops.CreateIndex(pg_index, priority=3))
 
         return schema
 
@@ -2055,6 +2203,60 @@ class PointerMetaCommand(MetaCommand, sd.ObjectCommand,
                     column_name=ptr_stor_info.column_name,
                     default=default_value))
 
+    def is_online_column_add(self, ptr, schema, context, source_op):
+        """Return True if the column of *ptr* should be added online.
+
+        This is the case in online DDL mode for new pointers on existing
+        object types, which do not inherit the column from a parent.
+        """
+        return (
+            context.online_ddl_batch_size is not None
+            and not isinstance(source_op, sd.CreateObject)
+            and not self.has_inherited_column(ptr, schema)
+        )
+
+    def has_inherited_column(self, ptr, schema):
+        """Return True if the column of *ptr* is inherited from a parent.
+
+        The column of a pointer that has a non-generic base is added
+        to the parent table, so it already exists in the table of the
+        source of *ptr*.
+        """
+        return not all(b.generic(schema)
+                       for b in ptr.get_bases(schema).objects(schema))
+
+    def add_column_online(self, schema, context, source, alter_table, col):
+        """Add a column with a default to an existing table online.
+
+        The column is added as nullable, set to its default in the
+        existing rows in batches, and only then made NOT NULL, so that
+        writes to the table are not blocked for the whole backfill.
+        """
+        # Every step is committed separately, so the column may
+        # already exist if an earlier attempt failed part-way.
+        cond = dbops.ColumnExists(
+            table_name=alter_table.name, column_name=col.name)
+        cmd = dbops.AlterTableAddColumn(
+            dbops.Column(name=col.name, type=col.type, comment=col.comment))
+        alter_table.add_operation((cmd, None, (cond, )))
+        alter_table.add_operation(dbops.AlterTableAlterColumnDefault(
+            column_name=col.name, default=col.default))
+
+        tables = [alter_table.name]
+        for desc in source.descendants(schema):
+            if ObjectTypeMetaCommand.has_table(desc, schema):
+                tables.append(
+                    common.get_backend_name(schema, desc, catenate=False))
+
+        for table_name in tables:
+            self.pgops.add(dbops.BackfillColumn(
+                table_name, col.name,
+                batch_size=context.online_ddl_batch_size, priority=4))
+
+        if col.required:
+            self.pgops.add(dbops.AlterTableSetColumnNotNullOnline(
+                alter_table.name, col.name, priority=5))
+
     @classmethod
     def get_columns(cls, pointer, schema, default=None):
         ptr_stor_info = types.get_pointer_storage_info(pointer, schema=schema)
@@ -2458,17 +2660,26 @@ class CreateLink(LinkMetaCommand, adapts=s_links.CreateLink):
                     schema, objtype.scls, catenate=False)
                 objtype_alter_table = objtype.op.get_alter_table(
                     schema, context)
+                online = self.is_online_column_add(
+                    link, schema, context, objtype.op)
 
-                for col in cols:
-                    # The column may already exist as inherited from parent
-                    # table.
-                    cond = dbops.ColumnExists(
-                        table_name=table_name, column_name=col.name)
-                    cmd = dbops.AlterTableAddColumn(col)
-                    objtype_alter_table.add_operation((cmd, None, (cond, )))
+                if online and default_value is not None:
+                    for col in cols:
+                        self.add_column_online(
+                            schema, context, objtype.scls,
+                            objtype_alter_table, col)
+                else:
+                    for col in cols:
+                        # The column may already exist as inherited from
+                        # parent table.
+                        cond = dbops.ColumnExists(
+                            table_name=table_name, column_name=col.name)
+                        cmd = dbops.AlterTableAddColumn(col)
+                        objtype_alter_table.add_operation(
+                            (cmd, None, (cond, )))
 
-                if default_value is not None:
-                    self.alter_pointer_default(link, schema, context)
+                    if default_value is not None:
+                        self.alter_pointer_default(link, schema, context)
 
                 index_name = common.get_backend_name(
                     schema, link, catenate=False, aspect='index'
@@ -2479,8 +2690,12 @@ class CreateLink(LinkMetaCommand, adapts=s_links.CreateLink):
                     unique=False, columns=[c.name for c in cols],
                     inherit=True)
 
-                ci = dbops.CreateIndex(pg_index, priority=3)
-                extra_ops.append(ci)
+                if online:
+                    extra_ops.extend(_create_index_concurrently(
+                        schema, objtype.scls, pg_index, priority=3))
+                else:
+                    ci = dbops.CreateIndex(pg_index, priority=3)
+                    extra_ops.append(ci)
 
         objtype = context.get(s_objtypes.ObjectTypeCommandContext)
 
@@ -2796,8 +3011,15 @@ class CreateProperty(PropertyMetaCommand, adapts=s_props.CreateProperty):
                 default_value = self.get_pointer_default(prop, schema, context)
 
                 cols = self.get_columns(prop, schema, default_value)
+                online = self.is_online_column_add(
+                    prop, schema, context, src.op)
 
                 for col in cols:
+                    if online and default_value is not None:
+                        self.add_column_online(
+                            schema, context, src.scls, alter_table, col)
+                        continue
+
                     # The column may already exist as inherited from
                     # parent table
                     cond = dbops.ColumnExists(
@@ -2809,10 +3031,20 @@ class CreateProperty(PropertyMetaCommand, adapts=s_props.CreateProperty):
                         # constraints from inherited columns, but we really
                         # should only always increase constraints down the
                         # inheritance chain.
-                        cmd = dbops.AlterTableAlterColumnNull(
-                            column_name=col.name,
-                            null=not prop.get_required(schema))
-                        alter_table.add_operation((cmd, (cond, ), None))
+                        if (context.online_ddl_batch_size is not None
+                                and not isinstance(src.op, sd.CreateObject)
+                                and self.has_inherited_column(prop, schema)):
+                            # The existing column may be backfilled
+                            # online by the parent table command, so the
+                            # constraint must be validated after that.
+                            self.pgops.add(
+                                dbops.AlterTableSetColumnNotNullOnline(
+                                    alter_table.name, col.name, priority=5))
+                        else:
+                            cmd = dbops.AlterTableAlterColumnNull(
+                                column_name=col.name,
+                                null=not prop.get_required(schema))
+                            alter_table.add_operation((cmd, (cond, ), None))
 
                     cmd = dbops.AlterTableAddColumn(col)
                     alter_table.add_operation((cmd, None, (cond, )))
@@ -3718,7 +3950,11 @@ class DeltaRoot(MetaCommand, adapts=sd.DeltaRoot):
         queues = {}
         self._serialize_ops(self, queues)
         queues = (i[1] for i in sorted(queues.items(), key=lambda i: i[0]))
-        return itertools.chain.from_iterable(queues)
+        return dbops.coalesce_alter_tables(
+            itertools.chain.from_iterable(queues))
+
+    def explain_table_effects(self) -> List[str]:
+        return dbops.explain_table_effects(self.serialize_ops())
 
     def _serialize_ops(self, obj, queues):
         for op in obj.pgops:
@@ -2022,6 +2022,34 @@ class SysVersionFunction(dbops.Function):
         )
 
 
+class SysQueryStatsFunction(dbops.Function):
+
+    # This is a function because "_edgecon_state" is a temporary table
+    # and therefore cannot be used in a view.  The query statistics
+    # are stored there by the server before a query reading them.
+
+    text = f'''
+        BEGIN
+        RETURN COALESCE(
+            (SELECT value::jsonb
+             FROM _edgecon_state
+             WHERE name = 'query_stats' AND type = 'R'),
+            '[]'::jsonb
+        );
+        END;
+    '''
+
+    def __init__(self) -> None:
+        super().__init__(
+            name=('edgedb', '_read_query_stats'),
+            args=[],
+            returns=('jsonb',),
+            language='plpgsql',
+            volatility='stable',
+            text=self.text,
+        )
+
+
 class SysGetTransactionIsolation(dbops.Function):
     "Get transaction isolation value as text compatible with EdgeDB's enum."
     text = r'''
@@ -2092,7 +2120,7 @@ class GetBaseScalarTypeMap(dbops.Function):
         )
 
 
-async def bootstrap(conn):
+def get_bootstrap_commands() -> dbops.CommandGroup:
     commands = dbops.CommandGroup()
     commands.add_commands([
         dbops.DropSchema(name='public'),
@@ -2162,11 +2190,23 @@ async def bootstrap(conn):
         dbops.CreateCompositeType(SysConfigValueType()),
         dbops.CreateFunction(SysConfigFunction()),
         dbops.CreateFunction(SysVersionFunction()),
+        dbops.CreateFunction(SysQueryStatsFunction()),
         dbops.CreateFunction(SysGetTransactionIsolation()),
         dbops.CreateFunction(GetCachedReflection()),
         dbops.CreateFunction(GetBaseScalarTypeMap()),
     ])
 
+    # The support functions can only be as parallel safe as the
+    # support functions they call.
+    dbops.propagate_parallel_safety(
+        cmd.function for cmd in commands.commands
+        if isinstance(cmd, dbops.CreateFunction))
+
+    return commands
+
+
+async def bootstrap(conn):
+    commands = get_bootstrap_commands()
     block = dbops.PLTopBlock(disable_ddl_triggers=True)
     commands.generate(block)
     await _execute_block(conn, block)
@@ -2381,6 +2421,35 @@ def _generate_role_views(schema):
     ]
 
 
+def _generate_query_stats_views(schema):
+    QueryStats = schema.get('sys::QueryStats')
+
+    view_query = f'''
+        SELECT
+            (s->>'id')::uuid                            AS id,
+            (SELECT id FROM edgedb."_SchemaObjectType"
+                 WHERE name = 'sys::QueryStats')        AS __type__,
+            (s->>'database')                            AS database,
+            (s->>'query')                               AS query,
+            (s->>'calls')::bigint                       AS calls,
+            (s->>'cache_hits')::bigint                  AS cache_hits,
+            (s->>'result_cache_hits')::bigint           AS result_cache_hits,
+            (s->>'rows')::bigint                        AS rows,
+            (s->>'compile_time')::bigint
+                * interval '1 microsecond'              AS compile_time,
+            (s->>'total_time')::bigint
+                * interval '1 microsecond'              AS total_time,
+            (s->>'max_time')::bigint
+                * interval '1 microsecond'              AS max_time
+        FROM
+            jsonb_array_elements(edgedb._read_query_stats()) AS s
+    '''
+
+    return [
+        dbops.View(name=tabname(schema, QueryStats), query=view_query),
+    ]
+
+
 def _make_json_caster(schema, json_casts, stype, context):
     cast = json_casts.get(stype)
 
@@ -2452,6 +2521,9 @@ async def generate_support_views(conn, schema):
     for roleview in _generate_role_views(schema):
         commands.add_command(dbops.CreateView(roleview, or_replace=True))
 
+    for statsview in _generate_query_stats_views(schema):
+        commands.add_command(dbops.CreateView(statsview, or_replace=True))
+
     block = dbops.PLTopBlock(disable_ddl_triggers=True)
     commands.generate(block)
     await _execute_block(conn, block)
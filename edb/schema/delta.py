@@ -640,7 +640,8 @@ class CommandContext:
         descriptive_mode: bool = False,
         schema_object_ids: Optional[
             Mapping[Tuple[str, Optional[str]], uuid.UUID]
-        ] = None
+        ] = None,
+        online_ddl_batch_size: Optional[int] = None,
     ) -> None:
         self.stack: List[CommandContextToken[Command]] = []
         self._cache: Dict[Hashable, Any] = {}
@@ -656,6 +657,9 @@ class CommandContext:
         self.renamed_objs: Set[so.Object] = set()
         self.altered_targets: Set[so.Object] = set()
         self.schema_object_ids = schema_object_ids
+        # If set, DDL on existing tables must avoid long-held locks,
+        # and existing rows are backfilled in batches of this size.
+        self.online_ddl_batch_size = online_ddl_batch_size
 
     @property
     def modaliases(self) -> Mapping[Optional[str], str]:
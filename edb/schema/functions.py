@@ -953,6 +953,11 @@ class Function(CallableObject, VolatilitySubject, s_abc.Function,
     session_only = so.SchemaField(
         bool, default=False, compcoef=0.4, coerce=True, allow_ddl_set=True)
 
+    # Whether the body of an EdgeQL function can be inlined
+    # into the queries calling it.
+    inlinable = so.SchemaField(
+        bool, default=True, compcoef=0.9, coerce=True, allow_ddl_set=True)
+
     def has_inlined_defaults(self, schema: s_schema.Schema) -> bool:
         # This can be relaxed to just `language is EdgeQL` when we
         # support non-constant defaults.
@@ -25,7 +25,6 @@ import builtins
 import collections
 import collections.abc
 import enum
-import itertools
 import sys
 import uuid
 
@@ -419,6 +418,9 @@ class ObjectMeta(type):
     _hashable_fields: Set[Field[Any]]  # if f.is_schema_field and f.hashable
     _sorted_fields: collections.OrderedDict[str, Field[Any]]
     _object_fields: FrozenSet[Field[Any]]
+    # Schema fields in the order of their slots in schema object data
+    _schema_field_names: Tuple[str, ...]
+    _schema_field_slots: Dict[str, int]
     _refdicts: collections.OrderedDict[str, RefDict]
     _refdicts_by_refclass: Dict[type, RefDict]
     _refdicts_by_field: Dict[str, RefDict]  # key is rd.attr
@@ -499,6 +501,10 @@ class ObjectMeta(type):
             sorted(fields.items(), key=lambda e: e[0]))
         # Populated lazily
         cls._object_fields = _EMPTY_FIELD_FROZENSET
+        cls._schema_field_names = tuple(
+            fn for fn, f in fields.items() if f.is_schema_field)
+        cls._schema_field_slots = {
+            fn: i for i, fn in enumerate(cls._schema_field_names)}
 
         fa = '{}.{}_fields'.format(cls.__module__, cls.__name__)
         setattr(cls, fa, myfields)
@@ -890,7 +896,7 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
         *,
         allow_default: bool = True,
     ) -> Any:
-        val = schema._get_obj_field(self.id, field_name)
+        val = schema._get_obj_field(self, field_name)
         if val is not None:
             return val
 
@@ -936,7 +942,7 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
         field = type(self).get_field(field_name)
 
         if field.is_schema_field:
-            val = schema._get_obj_field(self.id, field_name)
+            val = schema._get_obj_field(self, field_name)
             if val is not None:
                 return val
             elif default is not NoDefault:
@@ -998,7 +1004,7 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
         sig: List[Union[Type[Object_T], Tuple[str, Any]]] = [cls]
         for f in cls._hashable_fields:
             fn = f.name
-            val = schema._get_obj_field(self.id, fn)
+            val = schema._get_obj_field(self, fn)
             if val is None:
                 continue
             sig.append((fn, val))
@@ -1468,8 +1474,15 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
             o for o in new
             if newkeys[o.id] not in unchanged)
 
+        candidates = _get_delta_candidates(
+            list(new),
+            list(old),
+            old_schema=old_schema,  # type: ignore
+            new_schema=new_schema,
+        )
+
         comparison: List[Tuple[float, Object, Object]] = []
-        for x, y in itertools.product(new, old):
+        for x, y in candidates:
             # type ignore below, because mypy does not correlate `old`
             # and `old_schema`.
             comp = x.compare(
@@ -2663,3 +2676,283 @@ def derive_name(
     name = sn.get_specialized_name(derived_name_base, *qualifiers)
 
     return sn.Name(name=name, module=module)
+
+
+# Rename and alter detection in Object.delta_sets() only compares a
+# bounded number of candidate pairs of objects, see _get_delta_candidates().
+_MAX_DELTA_CANDIDATES = 8
+_MAX_RANKED_DELTA_CANDIDATES = 256
+
+_CompareKeyFunc = Callable[[Any, 's_schema.Schema'], Any]
+_compare_keys_cache: Dict[
+    type,
+    Tuple[
+        Tuple[Tuple[str, float, _CompareKeyFunc], ...],
+        Tuple[Tuple[str, _CompareKeyFunc], ...],
+    ],
+] = {}
+
+
+def _value_compare_key(value: Any, schema: s_schema.Schema) -> Any:
+    return value
+
+
+def _object_compare_key(value: Any, schema: s_schema.Schema) -> Any:
+    if value is None:
+        return None
+    return type(value), value.get_name(schema)
+
+
+def _collection_compare_key(value: Any, schema: s_schema.Schema) -> Any:
+    if value is None:
+        return None
+    return value.names(schema)
+
+
+def _index_compare_key(value: Any, schema: s_schema.Schema) -> Any:
+    if value is None:
+        return None
+    return frozenset(value.keys(schema))
+
+
+def _expr_compare_key(value: Any, schema: s_schema.Schema) -> Any:
+    if not value:
+        return None
+    return value.text
+
+
+def _expr_list_compare_key(value: Any, schema: s_schema.Schema) -> Any:
+    if not value:
+        return None
+    return tuple(expr.text for expr in value)
+
+
+def _get_compare_keys(
+    objcls: Type[Object],
+) -> Tuple[
+    Tuple[Tuple[str, float, _CompareKeyFunc], ...],
+    Tuple[Tuple[str, _CompareKeyFunc], ...],
+]:
+    """Return key functions for the compared fields of *objcls*.
+
+    The first element of the result lists the fields for which values
+    with equal keys compare as identical, and values with different
+    keys compare exactly as the field's *compcoef*.  The second element
+    lists the fields with a more elaborate comparator, where key
+    equality merely hints at a high similarity.
+    """
+    try:
+        return _compare_keys_cache[objcls]
+    except KeyError:
+        pass
+
+    from . import expr as s_expr
+
+    exact: List[Tuple[str, float, _CompareKeyFunc]] = []
+    fuzzy: List[Tuple[str, _CompareKeyFunc]] = []
+
+    for fn, field in objcls.get_fields(sorted=True).items():
+        if field.compcoef is None:
+            continue
+
+        comparator = getattr(field.type, 'compare_values', None)
+        impl = getattr(comparator, '__func__', comparator)
+
+        if comparator is None:
+            exact.append((fn, field.compcoef, _value_compare_key))
+        elif impl is Object.compare_values.__func__:
+            exact.append((fn, field.compcoef, _object_compare_key))
+        elif impl is ObjectCollection.compare_values.__func__:
+            exact.append((fn, field.compcoef, _collection_compare_key))
+        elif impl is s_expr.Expression.compare_values.__func__:
+            exact.append((fn, field.compcoef, _expr_compare_key))
+        elif impl is ObjectIndexBase.compare_values.__func__:
+            fuzzy.append((fn, _index_compare_key))
+        elif impl is s_expr.ExpressionList.compare_values.__func__:
+            fuzzy.append((fn, _expr_list_compare_key))
+
+    result = tuple(exact), tuple(fuzzy)
+    _compare_keys_cache[objcls] = result
+    return result
+
+
+def _get_delta_candidates(
+    new: Sequence[Object],
+    old: Sequence[Object],
+    *,
+    old_schema: s_schema.Schema,
+    new_schema: s_schema.Schema,
+) -> List[Tuple[Object, Object]]:
+    """Return the pairs of objects that Object.delta_sets() should compare.
+
+    Comparing every new object with every old object is quadratic, and
+    every comparison might recurse into the referenced collections of
+    the objects.  Instead, objects are only paired with objects of the
+    same class, and, within a class, a new object is paired with:
+
+    * an old object with the same name (an altered object);
+    * up to _MAX_DELTA_CANDIDATES old objects which have the same keys
+      of all compared fields except the name (a renamed object);
+    * failing the above, up to _MAX_DELTA_CANDIDATES unpaired old
+      objects with the highest similarity upper bound computed from
+      the field keys.  Only up to _MAX_RANKED_DELTA_CANDIDATES old
+      objects that share the most selective field keys (or the member
+      names of indexes) with the new object are ranked.
+
+    The pairs are returned in the order of the cartesian product of
+    *new* and *old*.
+    """
+    new_order = {x: i for i, x in enumerate(new)}
+    old_order = {y: i for i, y in enumerate(old)}
+
+    new_by_class: Dict[type, List[Object]] = collections.defaultdict(list)
+    for x in new:
+        new_by_class[type(x)].append(x)
+
+    old_by_class: Dict[type, List[Object]] = collections.defaultdict(list)
+    for y in old:
+        old_by_class[type(y)].append(y)
+
+    pairs: Set[Tuple[int, int]] = set()
+
+    for objcls, new_objs in new_by_class.items():
+        old_objs = old_by_class.get(objcls)
+        if not old_objs:
+            continue
+
+        exact, fuzzy = _get_compare_keys(objcls)
+
+        def _keys(
+            obj: Object,
+            schema: s_schema.Schema,
+        ) -> Tuple[Tuple[Any, ...], Tuple[Any, ...]]:
+            exact_keys = tuple(
+                keyfunc(obj.get_field_value(schema, fn), schema)
+                for fn, _, keyfunc in exact
+            )
+            fuzzy_keys = tuple(
+                keyfunc(obj.get_field_value(schema, fn), schema)
+                for fn, keyfunc in fuzzy
+            )
+            return exact_keys, fuzzy_keys
+
+        def _fingerprint(
+            keys: Tuple[Tuple[Any, ...], Tuple[Any, ...]],
+        ) -> Optional[Tuple[Any, ...]]:
+            exact_keys, fuzzy_keys = keys
+            fp = tuple(
+                k for (fn, _, _), k in zip(exact, exact_keys) if fn != 'name'
+            ) + fuzzy_keys
+            try:
+                hash(fp)
+            except TypeError:
+                return None
+            else:
+                return fp
+
+        def _index_keys(
+            keys: Tuple[Tuple[Any, ...], Tuple[Any, ...]],
+        ) -> Iterator[Tuple[str, Any]]:
+            exact_keys, fuzzy_keys = keys
+            index_keys: List[Tuple[str, Any]] = [
+                (fn, k) for (fn, _, _), k in zip(exact, exact_keys)
+                if fn != 'name' and k is not None
+            ]
+            for (fn, _), k in zip(fuzzy, fuzzy_keys):
+                if isinstance(k, frozenset):
+                    index_keys.extend((fn, member) for member in k)
+                elif k is not None:
+                    index_keys.append((fn, k))
+
+            for key in index_keys:
+                try:
+                    hash(key)
+                except TypeError:
+                    continue
+                else:
+                    yield key
+
+        old_keys = {y: _keys(y, old_schema) for y in old_objs}
+        old_by_name = {y.get_name(old_schema): y for y in old_objs}
+        old_by_fp: Dict[Tuple[Any, ...], List[Object]] = (
+            collections.defaultdict(list))
+        for y, keys in old_keys.items():
+            fp = _fingerprint(keys)
+            if fp is not None:
+                old_by_fp[fp].append(y)
+
+        new_keys: Dict[Object, Tuple[Tuple[Any, ...], Tuple[Any, ...]]] = {}
+        paired_old: Set[Object] = set()
+        unpaired_new: List[Object] = []
+
+        for x in new_objs:
+            keys = new_keys[x] = _keys(x, new_schema)
+            candidates: List[Object] = []
+
+            y = old_by_name.get(x.get_name(new_schema))
+            if y is not None:
+                candidates.append(y)
+
+            fp = _fingerprint(keys)
+            if fp is not None:
+                candidates.extend(
+                    old_by_fp.get(fp, ())[:_MAX_DELTA_CANDIDATES])
+
+            if candidates:
+                for y in candidates:
+                    pairs.add((new_order[x], old_order[y]))
+                paired_old.update(candidates)
+            else:
+                unpaired_new.append(x)
+
+        unpaired_old = [y for y in old_objs if y not in paired_old]
+        if not unpaired_new or not unpaired_old:
+            continue
+
+        old_by_key: Dict[Tuple[str, Any], List[Object]] = (
+            collections.defaultdict(list))
+        for y in unpaired_old:
+            for key in _index_keys(old_keys[y]):
+                old_by_key[key].append(y)
+
+        for x in unpaired_new:
+            # Collect the old objects sharing the keys of the new
+            # object, the most selective keys first, and count the
+            # shared keys of each of them.
+            postings = sorted(
+                (
+                    old_by_key[key]
+                    for key in _index_keys(new_keys[x])
+                    if key in old_by_key
+                ),
+                key=len,
+            )
+            shared: Dict[Object, int] = {}
+            budget = _MAX_RANKED_DELTA_CANDIDATES
+            for posting in postings:
+                for y in posting[:budget]:
+                    shared[y] = shared.get(y, 0) + 1
+                budget -= len(posting)
+                if budget <= 0:
+                    break
+
+            for y in unpaired_old:
+                if len(shared) >= _MAX_DELTA_CANDIDATES:
+                    break
+                shared.setdefault(y, 0)
+
+            x_keys = new_keys[x][0]
+            ranked: List[Tuple[float, int, int, Object]] = []
+            for y, nshared in shared.items():
+                bound = 1.0
+                for (_, compcoef, _), xk, yk in zip(
+                        exact, x_keys, old_keys[y][0]):
+                    if xk != yk:
+                        bound *= compcoef
+                ranked.append((bound, nshared, -old_order[y], y))
+
+            ranked.sort(key=lambda item: item[:3], reverse=True)
+            for _, _, _, y in ranked[:_MAX_DELTA_CANDIDATES]:
+                pairs.add((new_order[x], old_order[y]))
+
+    return [(new[i], old[j]) for i, j in sorted(pairs)]
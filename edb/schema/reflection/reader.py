@@ -187,11 +187,11 @@ def parse_into(
                             if (pv := e_dict[f'@{p}']) is not None
                         }
 
-        id_to_data[objid] = immutables.Map(objdata)
+        id_to_data[objid] = objdata
 
     for objid, updates in refdict_updates.items():
         if updates:
-            id_to_data[objid] = id_to_data[objid].update(updates)
+            id_to_data[objid].update(updates)
 
     with schema._refs_to.mutate() as mm:
         for referred_id, refdata in refs_to.items():
@@ -218,7 +218,10 @@ def parse_into(
 
     schema = schema._replace(
         id_to_type=schema._id_to_type.update(id_to_type),
-        id_to_data=schema._id_to_data.update(id_to_data),
+        id_to_data=schema._id_to_data.update(
+            (objid, s_schema.pack_obj_data(type(id_to_type[objid]), data))
+            for objid, data in id_to_data.items()
+        ),
         name_to_id=schema._name_to_id.update(name_to_id),
         shortname_to_id=schema._shortname_to_id.update(
             (k, frozenset(v)) for k, v in shortname_to_id.items()
@@ -51,6 +51,11 @@ if TYPE_CHECKING:
         ],
     ]
 
+# Values of schema fields of an object, laid out in the order of
+# the schema fields of its class (see ObjectMeta._schema_field_slots).
+# Unset fields are None.
+ObjData_T = Tuple[Any, ...]
+
 STD_LIB = ('std', 'schema', 'math', 'sys', 'cfg', 'cal')
 STD_MODULES = frozenset(STD_LIB + ('stdgraphql',))
 
@@ -58,9 +63,33 @@ STD_MODULES = frozenset(STD_LIB + ('stdgraphql',))
 _void = object()
 
 
+def pack_obj_data(
+    cls: Type[so.Object],
+    data: Mapping[str, Any],
+) -> ObjData_T:
+    """Lay out a mapping of field values of a *cls* object as a tuple."""
+    values: List[Any] = [None] * len(cls._schema_field_names)
+    slots = cls._schema_field_slots
+    for field, value in data.items():
+        values[slots[field]] = value
+    return tuple(values)
+
+
+def unpack_obj_data(
+    cls: Type[so.Object],
+    data: ObjData_T,
+) -> Dict[str, Any]:
+    """Return a mapping of the set fields in object *data*."""
+    return {
+        field: value
+        for field, value in zip(cls._schema_field_names, data)
+        if value is not None
+    }
+
+
 class Schema(s_abc.Schema):
 
-    _id_to_data: immu.Map[uuid.UUID, immu.Map[str, Any]]
+    _id_to_data: immu.Map[uuid.UUID, ObjData_T]
     _id_to_type: immu.Map[uuid.UUID, so.Object]
     _name_to_id: immu.Map[str, uuid.UUID]
     _shortname_to_id: immu.Map[
@@ -83,7 +112,7 @@ class Schema(s_abc.Schema):
     def _replace(
         self,
         *,
-        id_to_data: Optional[immu.Map[uuid.UUID, immu.Map[str, Any]]] = None,
+        id_to_data: Optional[immu.Map[uuid.UUID, ObjData_T]] = None,
         id_to_type: Optional[immu.Map[uuid.UUID, so.Object]] = None,
         name_to_id: Optional[immu.Map[str, uuid.UUID]] = None,
         shortname_to_id: Optional[
@@ -204,36 +233,40 @@ class Schema(s_abc.Schema):
         if not updates:
             return self
 
+        scls = self._id_to_type[obj_id]
+        slots = type(scls)._schema_field_slots
+
         try:
             data = self._id_to_data[obj_id]
         except KeyError:
-            data = immu.Map()
+            data = (None,) * len(slots)
 
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
-        with data.mutate() as mm:
-            for field, value in updates.items():
-                if field == 'name':
-                    name_to_id, shortname_to_id, globalname_to_id = (
-                        self._update_obj_name(
-                            obj_id,
-                            self._id_to_type[obj_id],
-                            mm.get('name'),
-                            value
-                        )
+        new_values = list(data)
+        orig_field_data = {}
+        new_field_data = {}
+        for field, value in updates.items():
+            slot = slots[field]
+            if field == 'name':
+                name_to_id, shortname_to_id, globalname_to_id = (
+                    self._update_obj_name(
+                        obj_id,
+                        scls,
+                        new_values[slot],
+                        value
                     )
+                )
 
-                if value is None:
-                    mm.pop(field, None)
-                else:
-                    mm[field] = value
-
-            new_data = mm.finish()
+            if data[slot] is not None:
+                orig_field_data[field] = data[slot]
+            if value is not None:
+                new_field_data[field] = value
+            new_values[slot] = value
 
-        id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, data, new_data)
+        id_to_data = self._id_to_data.set(obj_id, tuple(new_values))
+        refs_to = self._update_refs_to(scls, orig_field_data, new_field_data)
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
                              globalname_to_id=globalname_to_id,
@@ -242,17 +275,17 @@ class Schema(s_abc.Schema):
 
     def _get_obj_field(
         self,
-        obj_id: uuid.UUID,
+        obj: so.Object,
         field: str,
     ) -> Any:
         try:
-            d = self._id_to_data[obj_id]
+            d = self._id_to_data[obj.id]
         except KeyError:
-            err = (f'cannot get {field!r} value: item {str(obj_id)!r} '
+            err = (f'cannot get {field!r} value: item {str(obj.id)!r} '
                    f'is not present in the schema {self!r}')
             raise errors.SchemaError(err) from None
 
-        return d.get(field)
+        return d[type(obj)._schema_field_slots[field]]
 
     def _set_obj_field(
         self,
@@ -267,26 +300,28 @@ class Schema(s_abc.Schema):
                    f'is not present in the schema {self!r}')
             raise errors.SchemaError(err) from None
 
+        scls = self._id_to_type[obj_id]
+        slot = type(scls)._schema_field_slots[field]
+        old_value = data[slot]
+
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
         if field == 'name':
-            old_name = data.get('name')
             name_to_id, shortname_to_id, globalname_to_id = (
                 self._update_obj_name(
                     obj_id,
-                    self._id_to_type[obj_id],
-                    old_name,
+                    scls,
+                    old_value,
                     value
                 )
             )
 
-        new_data = data.set(field, value)
+        new_data = data[:slot] + (value,) + data[slot + 1:]
         id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
 
-        if field in data:
-            orig_field_data = {field: data[field]}
+        if old_value is not None:
+            orig_field_data = {field: old_value}
         else:
             orig_field_data = {}
 
@@ -308,29 +343,28 @@ class Schema(s_abc.Schema):
         except KeyError:
             return self
 
+        scls = self._id_to_type[obj_id]
+        slot = type(scls)._schema_field_slots[field]
+        old_value = data[slot]
+        if old_value is None:
+            return self
+
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
-        name = data.get('name')
-        if field == 'name' and name is not None:
+        if field == 'name':
             name_to_id, shortname_to_id, globalname_to_id = (
                 self._update_obj_name(
                     obj_id,
-                    self._id_to_type[obj_id],
-                    name,
+                    scls,
+                    old_value,
                     None
                 )
             )
-            new_data = data.delete(field)
-        else:
-            try:
-                new_data = data.delete(field)
-            except KeyError:
-                return self
 
+        new_data = data[:slot] + (None,) + data[slot + 1:]
         id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, {field: data[field]}, None)
+        refs_to = self._update_refs_to(scls, {field: old_value}, None)
 
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
@@ -446,13 +480,12 @@ class Schema(s_abc.Schema):
                 f'{type(scls).__name__} {name!r} is already present '
                 f'in the schema {self!r}')
 
-        data = immu.Map(data)
-
         name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
             id, scls, None, name)
 
         updates = dict(
-            id_to_data=self._id_to_data.set(id, data),
+            id_to_data=self._id_to_data.set(
+                id, pack_obj_data(type(scls), data)),
             id_to_type=self._id_to_type.set(id, scls),
             name_to_id=name_to_id,
             shortname_to_id=shortname_to_id,
@@ -473,14 +506,16 @@ class Schema(s_abc.Schema):
             raise errors.InvalidReferenceError(
                 f'cannot delete {obj!r}: not in this schema')
 
-        name = data['name']
+        scls = self._id_to_type[obj.id]
+        obj_data = unpack_obj_data(type(scls), data)
+        name = obj_data['name']
 
         updates = {}
 
         name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
-            obj.id, self._id_to_type[obj.id], name, None)
+            obj.id, scls, name, None)
 
-        refs_to = self._update_refs_to(obj, self._id_to_data[obj.id], None)
+        refs_to = self._update_refs_to(scls, obj_data, None)
 
         updates.update(dict(
             name_to_id=name_to_id,
@@ -0,0 +1,321 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compact serialization of schemas.
+
+A snapshot stores a schema as a set of tables instead of a pickled
+graph of per-object maps:
+
+* all object ids are stored once, as a single blob of 16-byte UUIDs;
+* the data of objects is stored per class, as rows of field values
+  in the slot order of the class schema fields;
+* references to ids, objects and strings in field values are stored
+  as indexes into the id, object and string tables, so every id,
+  object stub and string is materialized exactly once on load;
+* name and reference indexes are stored as rows of table indexes.
+
+Snapshots carry a format version and are only loaded by the code
+that wrote the same version.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import io
+import pickle
+import struct
+import uuid
+
+import immutables as immu
+
+from . import objects as so
+from . import schema as s_schema
+
+
+SNAPSHOT_MAGIC = b'EDBSCHEMA'
+SNAPSHOT_VERSION = 2
+
+_header = struct.Struct(f'!{len(SNAPSHOT_MAGIC)}sI')
+
+# Tags of the persistent ids, stored in the two low bits.
+_PID_UUID = 0
+_PID_OBJECT = 1
+_PID_STR = 2
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class _Tables:
+
+    def __init__(self) -> None:
+        self.ids: Dict[uuid.UUID, int] = {}
+        self.classes: Dict[Type[so.Object], int] = {}
+        self.objects: Dict[Tuple[int, int], int] = {}
+        self.strings: Dict[str, int] = {}
+
+    def id_index(self, id: uuid.UUID) -> int:
+        try:
+            return self.ids[id]
+        except KeyError:
+            idx = self.ids[id] = len(self.ids)
+            return idx
+
+    def class_index(self, cls: Type[so.Object]) -> int:
+        try:
+            return self.classes[cls]
+        except KeyError:
+            idx = self.classes[cls] = len(self.classes)
+            return idx
+
+    def object_index(self, obj: so.Object) -> int:
+        key = (self.class_index(type(obj)), self.id_index(obj.id))
+        try:
+            return self.objects[key]
+        except KeyError:
+            idx = self.objects[key] = len(self.objects)
+            return idx
+
+    def string_index(self, s: str) -> int:
+        try:
+            return self.strings[s]
+        except KeyError:
+            idx = self.strings[s] = len(self.strings)
+            return idx
+
+
+class _Pickler(pickle.Pickler):
+
+    def __init__(self, file: IO[bytes], tables: _Tables) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._tables = tables
+
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        objtype = type(obj)
+        if objtype is str:
+            return (self._tables.string_index(obj) << 2) | _PID_STR
+        elif objtype is uuid.UUID:
+            return (self._tables.id_index(obj) << 2) | _PID_UUID
+        elif isinstance(obj, so.Object):
+            return (self._tables.object_index(obj) << 2) | _PID_OBJECT
+        else:
+            return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        ids: List[uuid.UUID],
+        objects: List[so.Object],
+        strings: List[str],
+    ) -> None:
+        super().__init__(file)
+        self._tables = (ids, objects, strings)
+
+    def persistent_load(self, pid: int) -> Any:
+        return self._tables[pid & 3][pid >> 2]
+
+
+def dump_schema(schema: s_schema.Schema) -> bytes:
+    """Serialize *schema* into a snapshot."""
+
+    tables = _Tables()
+    id_index = tables.id_index
+    class_index = tables.class_index
+
+    by_class: Dict[Type[so.Object], List[uuid.UUID]] = {}
+    for obj_id, obj in schema._id_to_type.items():
+        by_class.setdefault(type(obj), []).append(obj_id)
+
+    data = []
+    for cls, obj_ids in by_class.items():
+        data.append((
+            class_index(cls),
+            cls._schema_field_names,
+            [id_index(obj_id) for obj_id in obj_ids],
+            [schema._id_to_data[obj_id] for obj_id in obj_ids],
+        ))
+
+    name_to_id = [
+        (name, id_index(obj_id))
+        for name, obj_id in schema._name_to_id.items()
+    ]
+
+    shortname_to_id = [
+        (class_index(cls), name, [id_index(obj_id) for obj_id in obj_ids])
+        for (cls, name), obj_ids in schema._shortname_to_id.items()
+    ]
+
+    globalname_to_id = [
+        (class_index(cls), name, id_index(obj_id))
+        for (cls, name), obj_id in schema._globalname_to_id.items()
+    ]
+
+    refs_to = [
+        (
+            id_index(ref_id),
+            [
+                (
+                    class_index(cls),
+                    field,
+                    [id_index(referrer) for referrer in referrers],
+                )
+                for (cls, field), referrers in refs.items()
+            ],
+        )
+        for ref_id, refs in schema._refs_to.items()
+    ]
+
+    body = io.BytesIO()
+    _Pickler(body, tables).dump((
+        data,
+        name_to_id,
+        shortname_to_id,
+        globalname_to_id,
+        refs_to,
+        schema._generation,
+    ))
+
+    # The tables are complete only after the body is pickled,
+    # as field values add ids, objects and strings to them.
+    tables_payload = pickle.dumps(
+        (
+            b''.join(obj_id.bytes for obj_id in tables.ids),
+            list(tables.classes),
+            list(tables.objects),
+            list(tables.strings),
+        ),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+    return b''.join((
+        _header.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION),
+        struct.pack('!Q', len(tables_payload)),
+        tables_payload,
+        body.getbuffer(),
+    ))
+
+
+def load_schema(buf: Union[bytes, bytearray, memoryview]) -> s_schema.Schema:
+    """Load a schema from a snapshot produced by :func:`dump_schema`.
+
+    *buf* can be any object supporting the buffer protocol, such as
+    a memory-mapped snapshot file.
+    """
+
+    view = memoryview(buf)
+
+    try:
+        magic, version = _header.unpack_from(view)
+    except struct.error:
+        raise SnapshotError('not a schema snapshot') from None
+
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError('not a schema snapshot')
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f'unsupported schema snapshot version {version}, '
+            f'expected {SNAPSHOT_VERSION}')
+
+    offset = _header.size
+    tables_len, = struct.unpack_from('!Q', view, offset)
+    offset += 8
+
+    id_blob, classes, object_keys, strings = pickle.loads(
+        view[offset:offset + tables_len])
+    offset += tables_len
+
+    ids = [
+        uuid.UUID(bytes=bytes(id_blob[i:i + 16]))
+        for i in range(0, len(id_blob), 16)
+    ]
+
+    objects = [
+        classes[cls_idx]._create_from_id(ids[id_idx])
+        for cls_idx, id_idx in object_keys
+    ]
+
+    (
+        data,
+        name_to_id,
+        shortname_to_id,
+        globalname_to_id,
+        refs_to,
+        generation,
+    ) = _Unpickler(
+        io.BytesIO(view[offset:]), ids, objects, strings,
+    ).load()
+
+    obj_index = {(cls_idx, id_idx): i
+                 for i, (cls_idx, id_idx) in enumerate(object_keys)}
+
+    id_to_data = immu.Map().mutate()
+    id_to_type = immu.Map().mutate()
+
+    for cls_idx, field_names, obj_ids, rows in data:
+        cls = classes[cls_idx]
+        # Rows are stored in the slot layout of the class that dumped
+        # them, re-lay them out if the class fields have changed since.
+        relayout = field_names != cls._schema_field_names
+        for id_idx, row in zip(obj_ids, rows):
+            obj_id = ids[id_idx]
+            if relayout:
+                row = s_schema.pack_obj_data(cls, {
+                    fn: v for fn, v in zip(field_names, row)
+                    if v is not None and fn in cls._schema_field_slots
+                })
+            id_to_data[obj_id] = row
+            try:
+                obj = objects[obj_index[cls_idx, id_idx]]
+            except KeyError:
+                obj = cls._create_from_id(obj_id)
+            id_to_type[obj_id] = obj
+
+    schema = s_schema.Schema()
+    schema._id_to_data = id_to_data.finish()
+    schema._id_to_type = id_to_type.finish()
+    schema._name_to_id = immu.Map(
+        (name, ids[id_idx]) for name, id_idx in name_to_id
+    )
+    schema._shortname_to_id = immu.Map(
+        ((classes[cls_idx], name), frozenset(ids[i] for i in id_idxs))
+        for cls_idx, name, id_idxs in shortname_to_id
+    )
+    schema._globalname_to_id = immu.Map(
+        ((classes[cls_idx], name), ids[id_idx])
+        for cls_idx, name, id_idx in globalname_to_id
+    )
+    schema._refs_to = immu.Map(
+        (
+            ids[ref_idx],
+            immu.Map(
+                (
+                    (classes[cls_idx], field),
+                    immu.Map((ids[i], None) for i in referrers),
+                )
+                for cls_idx, field, referrers in refs
+            ),
+        )
+        for ref_idx, refs in refs_to
+    )
+    schema._generation = generation
+
+    return schema
@@ -74,13 +74,22 @@ class Port:
             raise RuntimeError('already serving')
         self._serving = True
 
+        worker_cls = self.get_compiler_worker_cls()
+        if worker_cls is None:
+            # The port does not compile queries.
+            return
+
         self._compiler_manager = await procpool.create_manager(
             runstate_dir=self._internal_runstate_dir,
-            worker_args=(self._pg_addr,),
-            worker_cls=self.get_compiler_worker_cls(),
+            worker_args=(self._pg_addr, self._internal_runstate_dir),
+            worker_cls=worker_cls,
             name=self.get_compiler_worker_name(),
         )
 
+    def set_compiler_workers_sampling(self, enabled):
+        if self._compiler_manager is not None:
+            self._compiler_manager.set_sampling(enabled)
+
     async def stop(self):
         if self._compiler_manager is not None:
             await self._compiler_manager.stop()
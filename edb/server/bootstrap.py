@@ -20,6 +20,8 @@
 from __future__ import annotations
 from typing import *
 
+import asyncio
+import concurrent.futures
 import json
 import logging
 import os
@@ -47,6 +49,7 @@ from edb.schema import modules as s_mod
 from edb.schema import objects as s_obj
 from edb.schema import reflection as s_refl
 from edb.schema import schema as s_schema
+from edb.schema import snapshot as s_snapshot
 from edb.schema import std as s_std
 
 from edb.server import buildmeta
@@ -319,6 +322,51 @@ def compile_bootstrap_script(
     return edbcompiler.compile_edgeql_script(compiler, ctx, eql)
 
 
+def _compile_intro_query(
+    compiler: edbcompiler.Compiler,
+    reflschema: s_schema.Schema,
+    intropart: str,
+) -> str:
+    compilerctx = edbcompiler.new_compiler_context(
+        reflschema,
+        schema_reflection_mode=True,
+        output_format=edbcompiler.IoFormat.JSON_ELEMENTS,
+    )
+
+    introtokens = tokenizer.tokenize(intropart.encode())
+    units = compiler._compile(ctx=compilerctx, tokens=introtokens)
+    assert len(units) == 1 and len(units[0].sql) == 1
+    return units[0].sql[0].decode()
+
+
+# The compiler and the reflection schema of a bootstrap worker process.
+_worker_state: Optional[Tuple[edbcompiler.Compiler, s_schema.Schema]] = None
+
+
+def _init_compile_worker(
+    std_snapshot: bytes,
+    refl_snapshot: bytes,
+    classlayout: Dict[Type[s_obj.Object], s_refl.SchemaTypeLayout],
+) -> None:
+    global _worker_state
+
+    schema = s_snapshot.load_schema(std_snapshot)
+    reflschema = s_snapshot.load_schema(refl_snapshot)
+    compiler = edbcompiler.new_compiler(
+        std_schema=schema,
+        reflection_schema=reflschema,
+        schema_class_layout=classlayout,
+        bootstrap_mode=True,
+    )
+    _worker_state = (compiler, reflschema)
+
+
+def _compile_intro_query_in_worker(intropart: str) -> str:
+    assert _worker_state is not None
+    compiler, reflschema = _worker_state
+    return _compile_intro_query(compiler, reflschema, intropart)
+
+
 class StdlibBits(NamedTuple):
 
     #: User-visible std.
@@ -402,37 +450,57 @@ async def _make_stdlib(testmode: bool, global_ids) -> StdlibBits:
         bootstrap_mode=True,
     )
 
-    compilerctx = edbcompiler.new_compiler_context(reflschema)
-
-    for std_plan in std_plans:
-        compiler._compile_schema_storage_in_delta(
-            ctx=compilerctx,
-            delta=std_plan,
-            block=subblock,
-            is_internal_reflection=std_plan is refldelta,
-            stdmode=True,
-        )
-
-    sqltext = current_block.to_string()
-
-    compilerctx = edbcompiler.new_compiler_context(
-        reflschema,
-        schema_reflection_mode=True,
-        output_format=edbcompiler.IoFormat.JSON_ELEMENTS,
-    )
-
     # The introspection query bits are returned in chunks
     # because it's a large UNION and we currently generate SQL
     # that is much harder for Posgres to plan as opposed to a
     # straight flat UNION.
-    sql_introparts = []
+    #
+    # The chunks are independent of each other and of the schema
+    # storage SQL, so they are compiled by a pool of worker processes
+    # while the schema storage SQL is compiled here.
+    workers = min(os.cpu_count() or 1, len(introparts))
+    pool = None
+    if workers > 1:
+        loop = asyncio.get_running_loop()
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_compile_worker,
+            initargs=(
+                s_snapshot.dump_schema(schema),
+                s_snapshot.dump_schema(reflschema),
+                classlayout,
+            ),
+        )
+        intro_futs = [
+            loop.run_in_executor(
+                pool, _compile_intro_query_in_worker, intropart)
+            for intropart in introparts
+        ]
+
+    try:
+        compilerctx = edbcompiler.new_compiler_context(reflschema)
+
+        for std_plan in std_plans:
+            compiler._compile_schema_storage_in_delta(
+                ctx=compilerctx,
+                delta=std_plan,
+                block=subblock,
+                is_internal_reflection=std_plan is refldelta,
+                stdmode=True,
+            )
+
+        sqltext = current_block.to_string()
 
-    for intropart in introparts:
-        introtokens = tokenizer.tokenize(intropart.encode())
-        units = compiler._compile(ctx=compilerctx, tokens=introtokens)
-        assert len(units) == 1 and len(units[0].sql) == 1
-        sql_intropart = units[0].sql[0].decode()
-        sql_introparts.append(sql_intropart)
+        if pool is not None:
+            sql_introparts = await asyncio.gather(*intro_futs)
+        else:
+            sql_introparts = [
+                _compile_intro_query(compiler, reflschema, intropart)
+                for intropart in introparts
+            ]
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
 
     introsql = ' UNION ALL '.join(sql_introparts)
 
@@ -614,28 +682,29 @@ async def _init_stdlib(cluster, conn, testmode, global_ids):
             target_dir=cache_dir,
         )
 
-    await _store_static_bin_cache(
-        cluster,
-        'stdschema',
-        pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL),
-    )
-
-    await _store_static_bin_cache(
-        cluster,
-        'reflschema',
-        pickle.dumps(stdlib.reflschema, protocol=pickle.HIGHEST_PROTOCOL),
-    )
-
-    await _store_static_bin_cache(
-        cluster,
-        'classlayout',
-        pickle.dumps(stdlib.classlayout, protocol=pickle.HIGHEST_PROTOCOL),
-    )
-
-    await _store_static_json_cache(
-        cluster,
-        'introquery',
-        json.dumps(stdlib.introquery),
+    # The caches are stored over separate connections, concurrently.
+    await asyncio.gather(
+        _store_static_bin_cache(
+            cluster,
+            'stdschema',
+            s_snapshot.dump_schema(schema),
+        ),
+        _store_static_bin_cache(
+            cluster,
+            'reflschema',
+            s_snapshot.dump_schema(stdlib.reflschema),
+        ),
+        _store_static_bin_cache(
+            cluster,
+            'classlayout',
+            pickle.dumps(
+                stdlib.classlayout, protocol=pickle.HIGHEST_PROTOCOL),
+        ),
+        _store_static_json_cache(
+            cluster,
+            'introquery',
+            json.dumps(stdlib.introquery),
+        ),
     )
 
     await metaschema.generate_support_views(conn, stdlib.reflschema)
@@ -788,6 +857,10 @@ async def _configure(
 
 
 async def _compile_sys_queries(schema, compiler, cluster):
+    # Unlike the introspection query chunks, these are compiled in
+    # process: there are only three small queries, and a worker would
+    # first have to load the schema snapshots, which takes longer
+    # than compiling them.
     queries = {}
 
     cfg_query = config.generate_config_query(schema)
@@ -0,0 +1,433 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Bulk loading of objects directly into their backend tables.
+
+A bulk load is described by a set of blocks.  The object block holds
+the rows of the object type table, link blocks hold the rows of the
+tables of its multi links and multi properties.  Every block is
+copied into a temporary staging table with ``COPY FROM STDIN`` and
+then moved into the backend table with a single ``INSERT``, after
+which the link targets and required multi pointers are validated
+with one query per pointer.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import json
+import uuid
+
+from edb import errors
+
+from edb.common import uuidgen
+
+from edb.schema import links as s_links
+from edb.schema import objtypes as s_objtypes
+from edb.schema import pointers as s_pointers
+from edb.schema import schema as s_schema
+
+from edb.pgsql import common as pg_common
+from edb.pgsql import types as pg_types
+
+
+class BulkLoadBlockDescriptor(NamedTuple):
+
+    block_id: uuid.UUID
+    sql_copy_stmt: bytes
+
+
+class BulkLoadDescriptor(NamedTuple):
+
+    blocks: Sequence[BulkLoadBlockDescriptor]
+    setup_sql: bytes
+    finalize_sql: bytes
+
+
+def describe_bulk_load(
+    schema: s_schema.Schema,
+    type_name: str,
+    blocks: List[Tuple[bytes, bytes]],  # block_id, description
+) -> BulkLoadDescriptor:
+    """Generate the SQL loading *blocks* of data for *type_name*.
+
+    The description of a block is a JSON object with the "columns"
+    list of the pointer names of the CSV columns of the block, and
+    the "pointer" name for the blocks of multi pointers.  The object
+    block columns are the names of the single properties and links
+    of the type, which must include all of them that have defaults,
+    except for "id".  The link block columns are "source", "target" and
+    the names of the link properties prefixed with "@".
+    """
+    objtype = schema.get(
+        type_name, None, module_aliases={None: 'default'},
+        type=s_objtypes.ObjectType)
+
+    if objtype is None:
+        raise errors.InvalidReferenceError(
+            f'object type {type_name!r} does not exist')
+
+    if (objtype.get_is_abstract(schema)
+            or objtype.is_view(schema)
+            or objtype.is_union_type(schema)
+            or objtype.get_name(schema).module in s_schema.STD_MODULES):
+        raise errors.QueryError(
+            f'cannot load objects of type '
+            f'{objtype.get_displayname(schema)!r}')
+
+    loader = _BulkLoader(schema, objtype)
+    for block_id, description in blocks:
+        try:
+            desc = json.loads(description)
+            pointer = desc.get('pointer')
+            columns = list(desc['columns'])
+        except (ValueError, TypeError, KeyError, AttributeError):
+            raise errors.ProtocolError(
+                'invalid bulk load block description') from None
+
+        block_uuid = uuidgen.from_bytes(block_id)
+        if pointer is None:
+            loader.add_object_block(block_uuid, columns)
+        else:
+            loader.add_pointer_block(block_uuid, pointer, columns)
+
+    return loader.describe()
+
+
+class _BulkLoader:
+
+    def __init__(
+        self,
+        schema: s_schema.Schema,
+        objtype: s_objtypes.ObjectType,
+    ) -> None:
+        self.schema = schema
+        self.objtype = objtype
+        self.table = pg_common.get_backend_name(
+            schema, objtype, catenate=True)
+        self.blocks: List[BulkLoadBlockDescriptor] = []
+        self.setup: List[str] = []
+        self.inserts: List[str] = []
+        self.checks: List[str] = []
+        self.object_stage: Optional[str] = None
+
+    def describe(self) -> BulkLoadDescriptor:
+        if self.object_stage is not None:
+            self._check_required_multi_pointers(self.object_stage)
+
+        return BulkLoadDescriptor(
+            blocks=self.blocks,
+            setup_sql='\n'.join(self.setup).encode(),
+            finalize_sql='\n'.join(self.inserts + self.checks).encode(),
+        )
+
+    def add_object_block(
+        self,
+        block_id: uuid.UUID,
+        columns: List[str],
+    ) -> None:
+        schema = self.schema
+
+        if self.object_stage is not None:
+            raise errors.QueryError(
+                'bulk load must have at most one object block')
+
+        stage = self._new_stage()
+        self.object_stage = stage
+
+        ptrs = self._resolve_columns(self.objtype, columns)
+
+        # The rows are inserted as is, so the defaults of the omitted
+        # pointers would not be applied.
+        omitted = [
+            ptr for name, ptr in self._single_pointers().items()
+            if (name not in ptrs and name != 'id'
+                and ptr.get_default(schema) is not None)
+        ]
+        if omitted:
+            raise errors.QueryError(
+                f'bulk load does not apply defaults, the object block '
+                f'must have the columns of: '
+                f'{", ".join(self._ptr_displayname(p) for p in omitted)}')
+
+        cols = {}
+        for name, ptr in ptrs.items():
+            if not ptr.singular(schema):
+                raise errors.QueryError(
+                    f'{self._ptr_displayname(ptr)} is a multi '
+                    f'{_ptr_kind(ptr)} and must be loaded with '
+                    f'a separate block')
+
+            if ptr.has_user_defined_properties(schema):
+                raise errors.QueryError(
+                    f'bulk loading of single links with link properties '
+                    f'is not supported: {self._ptr_displayname(ptr)}')
+
+            cols[name] = pg_types.get_pointer_storage_info(
+                ptr, schema=schema, source=self.objtype).column_name
+
+            if isinstance(ptr, s_links.Link) and name != 'id':
+                self._check_targets(
+                    stage, cols[name], ptr, ptr.get_target(schema))
+
+        # The id column is always staged, so that the objects can be
+        # referred to by the checks, but it may be omitted from the
+        # data, in which case the ids are generated.
+        stage_cols = ['id'] + [c for c in cols.values() if c != 'id']
+        self._create_stage(stage, self.table, stage_cols)
+        self.setup.append(
+            f'ALTER TABLE {stage} ALTER COLUMN "id" '
+            f'SET DEFAULT edgedb.uuid_generate_v1mc();')
+
+        self._add_block(block_id, stage, cols.values())
+
+        self.inserts.append(
+            f'INSERT INTO {self.table} '
+            f'({_qcols(stage_cols)}, "__type__") '
+            f'SELECT {_qcols(stage_cols)}, '
+            f'{pg_common.quote_literal(str(self.objtype.id))}::uuid '
+            f'FROM {stage};')
+
+    def add_pointer_block(
+        self,
+        block_id: uuid.UUID,
+        pointer: str,
+        columns: List[str],
+    ) -> None:
+        schema = self.schema
+
+        ptr = self.objtype.getptr(schema, pointer)
+        if ptr is None or pointer in {'id', '__type__'}:
+            raise errors.InvalidReferenceError(
+                f'object type {self.objtype.get_displayname(schema)!r} '
+                f'has no link or property {pointer!r}')
+
+        if ptr.is_pure_computable(schema):
+            raise errors.QueryError(
+                f'cannot load computable {self._ptr_displayname(ptr)}')
+
+        if ptr.singular(schema):
+            raise errors.QueryError(
+                f'{self._ptr_displayname(ptr)} is a single '
+                f'{_ptr_kind(ptr)} and must be loaded as a column of '
+                f'the object block')
+
+        if 'source' not in columns or 'target' not in columns:
+            raise errors.QueryError(
+                f'the block of {self._ptr_displayname(ptr)} must have '
+                f'the "source" and "target" columns')
+
+        cols = {'source': 'source', 'target': 'target'}
+        props = [c for c in columns if c not in cols]
+        if props and not isinstance(ptr, s_links.Link):
+            raise errors.QueryError(
+                f'unexpected columns in the block of '
+                f'{self._ptr_displayname(ptr)}: {", ".join(props)}')
+
+        for name in props:
+            if not name.startswith('@'):
+                raise errors.QueryError(
+                    f'link property column {name!r} of '
+                    f'{self._ptr_displayname(ptr)} must start with "@"')
+
+        lprops = self._resolve_columns(ptr, [name[1:] for name in props])
+        for name, lprop in lprops.items():
+            cols[f'@{name}'] = pg_types.get_pointer_storage_info(
+                lprop, schema=schema, source=ptr,
+                link_bias=True).column_name
+
+        if len(cols) != len(columns):
+            raise errors.QueryError(
+                f'duplicate columns in the block of '
+                f'{self._ptr_displayname(ptr)}')
+
+        table = pg_common.get_backend_name(schema, ptr, catenate=True)
+        stage = self._new_stage()
+        stage_cols = list(cols.values())
+        self._create_stage(stage, table, stage_cols)
+        self._add_block(block_id, stage, [cols[c] for c in columns])
+
+        material_ptr = ptr.material_type(schema) or ptr
+        self.inserts.append(
+            f'INSERT INTO {table} '
+            f'({_qcols(stage_cols)}, "ptr_item_id") '
+            f'SELECT {_qcols(stage_cols)}, '
+            f'{pg_common.quote_literal(str(material_ptr.id))}::uuid '
+            f'FROM {stage};')
+
+        # Link sources must be objects of this exact type, as the
+        # objects of its subtypes use the tables of their own links.
+        self._check_exists(
+            stage, 'source', [f'ONLY {self.table}'],
+            f'invalid source of {self._ptr_displayname(ptr)}: object ',
+            errors.ConstraintViolationError)
+
+        if isinstance(ptr, s_links.Link):
+            self._check_targets(stage, 'target', ptr, ptr.get_target(schema))
+
+    def _single_pointers(self) -> Dict[str, s_pointers.Pointer]:
+        schema = self.schema
+        return {
+            ptr.get_shortname(schema).name: ptr
+            for ptr in self.objtype.get_pointers(schema).objects(schema)
+            if ptr.singular(schema) and not ptr.is_pure_computable(schema)
+        }
+
+    def _resolve_columns(
+        self,
+        source: Union[s_objtypes.ObjectType, s_pointers.Pointer],
+        columns: List[str],
+    ) -> Dict[str, s_pointers.Pointer]:
+        schema = self.schema
+        ptrs: Dict[str, s_pointers.Pointer] = {}
+
+        for name in columns:
+            ptr = source.getptr(schema, name)
+            if (ptr is None
+                    or name == '__type__'
+                    or ptr.is_endpoint_pointer(schema)):
+                raise errors.InvalidReferenceError(
+                    f'{source.get_verbosename(schema)} has no link '
+                    f'or property {name!r}')
+
+            if ptr.is_pure_computable(schema):
+                raise errors.QueryError(
+                    f'cannot load computable {self._ptr_displayname(ptr)}')
+
+            if name in ptrs:
+                raise errors.QueryError(
+                    f'duplicate column {name!r} in the block of '
+                    f'{source.get_verbosename(schema)}')
+
+            ptrs[name] = ptr
+
+        return ptrs
+
+    def _check_targets(
+        self,
+        stage: str,
+        column: str,
+        ptr: s_pointers.Pointer,
+        target: s_objtypes.ObjectType,
+    ) -> None:
+        schema = self.schema
+
+        if target.is_union_type(schema):
+            targets = list(target.get_union_of(schema).objects(schema))
+        else:
+            targets = [target]
+
+        self._check_exists(
+            stage, column,
+            [pg_common.get_backend_name(schema, t, catenate=True)
+             for t in targets],
+            f'invalid target for {self._ptr_displayname(ptr)}: object ',
+            errors.ConstraintViolationError)
+
+    def _check_exists(
+        self,
+        stage: str,
+        column: str,
+        tables: List[str],
+        msg: str,
+        errcls: Type[errors.EdgeDBError],
+    ) -> None:
+        col = pg_common.quote_ident(column)
+        exists = ' OR '.join(
+            f'EXISTS (SELECT FROM {table} AS t WHERE t.id = s.{col})'
+            for table in tables
+        )
+        self.checks.append(self._raise(
+            f'{pg_common.quote_literal(msg)} || s.{col}::text '
+            f'|| \' does not exist\'',
+            f'{stage} AS s WHERE s.{col} IS NOT NULL AND NOT ({exists})',
+            errcls,
+        ))
+
+    def _check_required_multi_pointers(self, stage: str) -> None:
+        schema = self.schema
+
+        for ptr in self.objtype.get_pointers(schema).objects(schema):
+            if (not ptr.get_required(schema)
+                    or ptr.singular(schema)
+                    or ptr.is_pure_computable(schema)):
+                continue
+
+            table = pg_common.get_backend_name(schema, ptr, catenate=True)
+            msg = (
+                f'missing value for required {_ptr_kind(ptr)} '
+                f'{self._ptr_displayname(ptr)} of object '
+            )
+            self.checks.append(self._raise(
+                f'{pg_common.quote_literal(msg)} || s.id::text',
+                f'{stage} AS s WHERE NOT EXISTS '
+                f'(SELECT FROM {table} AS l WHERE l.source = s.id)',
+                errors.MissingRequiredError,
+            ))
+
+    def _raise(
+        self,
+        msg_expr: str,
+        from_clause: str,
+        errcls: Type[errors.EdgeDBError],
+    ) -> str:
+        detail = json.dumps({'code': errcls.get_code()})
+        return (
+            f'SELECT edgedb._raise_specific_exception('
+            f'\'23000\', {msg_expr}, '
+            f'{pg_common.quote_literal(detail)}, NULL::text) '
+            f'FROM {from_clause} LIMIT 1;'
+        )
+
+    def _new_stage(self) -> str:
+        return pg_common.quote_ident(f'_edgedb_load_{len(self.blocks)}')
+
+    def _create_stage(self, stage: str, table: str, cols: List[str]) -> None:
+        # The staging tables have the column types of the backend
+        # table, but none of its constraints, so the rows are checked
+        # only once they are inserted into the backend table.
+        self.setup.append(
+            f'CREATE TEMPORARY TABLE {stage} ON COMMIT DROP AS '
+            f'SELECT {_qcols(cols)} FROM {table} WITH NO DATA;')
+
+    def _add_block(
+        self,
+        block_id: uuid.UUID,
+        stage: str,
+        cols: Iterable[str],
+    ) -> None:
+        self.blocks.append(BulkLoadBlockDescriptor(
+            block_id=block_id,
+            sql_copy_stmt=(
+                f'COPY {stage} ({_qcols(cols)}) '
+                f'FROM STDIN WITH (FORMAT csv)'
+            ).encode(),
+        ))
+
+    def _ptr_displayname(self, ptr: s_pointers.Pointer) -> str:
+        return repr(
+            f'{self.objtype.get_displayname(self.schema)}.'
+            f'{ptr.get_shortname(self.schema).name}')
+
+
+def _ptr_kind(ptr: s_pointers.Pointer) -> str:
+    return 'link' if isinstance(ptr, s_links.Link) else 'property'
+
+
+def _qcols(cols: Iterable[str]) -> str:
+    return ', '.join(pg_common.quote_ident(c) for c in cols)
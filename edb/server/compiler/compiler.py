@@ -21,10 +21,14 @@ from __future__ import annotations
 from typing import *
 
 import collections
+import contextlib
 import dataclasses
 import json
 import hashlib
+import mmap
+import os
 import pickle
+import time
 import uuid
 
 import asyncpg
@@ -38,6 +42,7 @@ from edb.server import tokenizer
 from edb.pgsql import compiler as pg_compiler
 
 from edb import edgeql
+from edb.common import ast
 from edb.common import debug
 from edb.common import uuidgen
 
@@ -45,19 +50,23 @@ from edb.edgeql import ast as qlast
 from edb.edgeql import compiler as qlcompiler
 from edb.edgeql import qltypes
 
+from edb.ir import ast as irast
 from edb.ir import staeval as ireval
 
 from edb.schema import database as s_db
 from edb.schema import ddl as s_ddl
 from edb.schema import delta as s_delta
+from edb.schema import functions as s_func
 from edb.schema import links as s_links
 from edb.schema import lproperties as s_props
 from edb.schema import migrations as s_migrations
 from edb.schema import modules as s_mod
 from edb.schema import objects as s_obj
 from edb.schema import objtypes as s_objtypes
+from edb.schema import pointers as s_pointers
 from edb.schema import reflection as s_refl
 from edb.schema import schema as s_schema
+from edb.schema import snapshot as s_snapshot
 from edb.schema import types as s_types
 
 from edb.pgsql import ast as pg_ast
@@ -69,6 +78,7 @@ from edb.pgsql import types as pg_types
 
 from edb.server import config
 
+from . import bulkload
 from . import dbstate
 from . import enums
 from . import errormech
@@ -96,6 +106,7 @@ class CompileContext:
     implicit_limit: int = 0
     schema_object_ids: Optional[Mapping[str, uuid.UUID]] = None
     first_extracted_var: Optional[int] = None
+    profile: Optional[dbstate.CompileProfile] = None
 
 
 EMPTY_MAP = immutables.Map()
@@ -184,14 +195,47 @@ def new_compiler_context(
     return ctx
 
 
-async def load_cached_schema(backend_conn, key) -> s_schema.Schema:
+async def load_cached_schema(
+    backend_conn,
+    key: str,
+    *,
+    cache_dir: Optional[str] = None,
+) -> s_schema.Schema:
+    """Load a schema snapshot stored in the system cache.
+
+    If *cache_dir* is specified, the snapshot is also written into it
+    and subsequent loads (e.g. by other compiler workers of the same
+    server) memory-map the local copy instead of fetching it from
+    the backend.
+    """
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f'{key}.snapshot')
+        try:
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return s_snapshot.load_schema(mm)
+        except FileNotFoundError:
+            pass
+
     data = await backend_conn.fetchval(
         f'SELECT edgedbinstdata.__syscache_{key}();')
     try:
-        return pickle.loads(data)
+        schema = s_snapshot.load_schema(data)
     except Exception as e:
         raise RuntimeError(
-            'could not load std schema pickle') from e
+            f'could not load {key} schema snapshot') from e
+
+    if cache_dir is not None:
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The local copy is only an optimization.
+            pass
+
+    return schema
 
 
 async def load_std_schema(backend_conn) -> s_schema.Schema:
@@ -214,14 +258,102 @@ async def load_schema_class_layout(backend_conn) -> s_schema.Schema:
             'could not load schema class layout pickle') from e
 
 
+def _group_ddl_statements(
+    statements: Sequence[qlast.Base],
+) -> List[List[qlast.Base]]:
+    """Group runs of consecutive schema DDL statements together.
+
+    Database and migration commands are compiled separately, so they
+    are never grouped with other statements.
+    """
+    groups: List[List[qlast.Base]] = []
+    in_ddl_run = False
+
+    for stmt in statements:
+        is_ddl = (
+            isinstance(stmt, qlast.DDL)
+            and not isinstance(stmt, (qlast.Database, qlast.Delta))
+        )
+        if is_ddl and in_ddl_run:
+            groups[-1].append(stmt)
+        else:
+            groups.append([stmt])
+        in_ddl_run = is_ddl
+
+    return groups
+
+
+def _is_schema_only_result(ir: irast.Statement) -> bool:
+    """Return True if the result of *ir* depends only on the schema.
+
+    These are read-only queries over the ``schema`` module that call
+    only immutable functions and operators, so their results do not
+    change until the next DDL.
+    """
+    if ir.volatility is qltypes.Volatility.VOLATILE:
+        return False
+
+    schema = ir.schema
+    has_schema_refs = False
+
+    for ref in ir.schema_refs:
+        if isinstance(ref, s_func.VolatilitySubject):
+            volatility = ref.get_volatility(schema)
+            if volatility is not qltypes.Volatility.IMMUTABLE:
+                return False
+        elif isinstance(ref, s_objtypes.ObjectType):
+            if ref.get_name(schema).module != 'schema':
+                return False
+            has_schema_refs = True
+        elif isinstance(ref, s_pointers.Pointer):
+            source = ref.get_source(schema)
+            if (isinstance(source, s_objtypes.ObjectType) and
+                    source.get_name(schema).module not in {'schema', 'std'}):
+                return False
+
+    return has_schema_refs
+
+
+def _count_nodes(tree: ast.AST) -> int:
+    return len(ast.find_children(tree, lambda n: True)) + 1
+
+
+def _phase(ctx: CompileContext, name: str) -> ContextManager[None]:
+    if ctx.profile is None:
+        return contextlib.nullcontext()
+    else:
+        return ctx.profile.phase(name)
+
+
+def _get_query_stats_refs(ir: irast.Statement) -> Tuple[bool, bool]:
+    """Return whether *ir* reads and whether it resets the query stats."""
+    schema = ir.schema
+    reads = resets = False
+
+    for ref in ir.schema_refs:
+        if isinstance(ref, s_objtypes.ObjectType):
+            if ref.get_name(schema) == 'sys::QueryStats':
+                reads = True
+        elif isinstance(ref, s_func.Function):
+            if ref.get_shortname(schema) == 'sys::reset_query_stats':
+                resets = True
+
+    return reads, resets
+
+
 class BaseCompiler:
 
     _connect_args: dict
     _dbname: Optional[str]
     _cached_db: Optional[CompilerDatabaseState]
 
-    def __init__(self, connect_args: dict):
+    def __init__(
+        self,
+        connect_args: dict,
+        runstate_dir: Optional[str] = None,
+    ):
         self._connect_args = connect_args
+        self._runstate_dir = runstate_dir
         self._dbname = None
         self._cached_db = None
         self._std_schema = None
@@ -306,10 +438,12 @@ class BaseCompiler:
 
     async def ensure_initialized(self, con: asyncpg.Connection) -> None:
         if self._std_schema is None:
-            self._std_schema = await load_cached_schema(con, 'stdschema')
+            self._std_schema = await load_cached_schema(
+                con, 'stdschema', cache_dir=self._runstate_dir)
 
         if self._refl_schema is None:
-            self._refl_schema = await load_cached_schema(con, 'reflschema')
+            self._refl_schema = await load_cached_schema(
+                con, 'reflschema', cache_dir=self._runstate_dir)
 
         if self._schema_class_layout is None:
             self._schema_class_layout = await load_schema_class_layout(con)
@@ -341,8 +475,12 @@ class BaseCompiler:
 
 class Compiler(BaseCompiler):
 
-    def __init__(self, connect_args: dict):
-        super().__init__(connect_args)
+    def __init__(
+        self,
+        connect_args: dict,
+        runstate_dir: Optional[str] = None,
+    ):
+        super().__init__(connect_args, runstate_dir)
 
         self._current_db_state = None
         self._bootstrap_mode = False
@@ -357,9 +495,27 @@ class Compiler(BaseCompiler):
             session_config,
             allow_unrecognized=True)
 
+    def _get_online_ddl_batch_size(
+        self,
+        ctx: CompileContext,
+    ) -> Optional[int]:
+        current_tx = ctx.state.current_tx()
+        if self._bootstrap_mode or not current_tx.is_implicit():
+            # Online DDL is executed as a series of transactions,
+            # which is impossible inside a transaction block.
+            return None
+
+        session_config = current_tx.get_session_config()
+        settings = config.get_settings()
+        if not config.lookup(settings, 'online_ddl', session_config):
+            return None
+
+        return config.lookup(settings, 'online_ddl_batch_size', session_config)
+
     def _new_delta_context(self, ctx: CompileContext):
         context = s_delta.CommandContext()
         context.testmode = self._in_testmode(ctx)
+        context.online_ddl_batch_size = self._get_online_ddl_batch_size(ctx)
         context.stdmode = self._bootstrap_mode
         context.schema_object_ids = ctx.schema_object_ids
         return context
@@ -367,6 +523,31 @@ class Compiler(BaseCompiler):
     def _process_delta(self, ctx: CompileContext, delta):
         """Adapt and process the delta command."""
 
+        delta, context = self._apply_delta(ctx, delta)
+
+        if isinstance(delta, (s_db.CreateDatabase, s_db.DropDatabase)):
+            block = pg_dbops.SQLBlock()
+            new_types = frozenset()
+        else:
+            block = self._new_delta_block(context)
+            new_types = frozenset(str(tid) for tid in delta.new_types)
+
+        # Generate SQL DDL for the delta.
+        self._generate_delta(delta, block)
+
+        # Generate schema storage SQL (DML into schema storage tables).
+        subblock = block.add_block()
+        self._compile_schema_storage_in_delta(ctx, delta, subblock)
+
+        return block, new_types
+
+    def _apply_delta(
+        self,
+        ctx: CompileContext,
+        delta: s_delta.Command,
+    ) -> Tuple[s_delta.Command, s_delta.CommandContext]:
+        """Adapt the delta command and apply it to the current schema."""
+
         current_tx = ctx.state.current_tx()
         schema = current_tx.get_schema()
 
@@ -383,21 +564,34 @@ class Compiler(BaseCompiler):
             debug.header('PgSQL Delta Plan')
             debug.dump(delta, schema=schema)
 
-        if isinstance(delta, (s_db.CreateDatabase, s_db.DropDatabase)):
-            block = pg_dbops.SQLBlock()
-            new_types = frozenset()
-        else:
-            block = pg_dbops.PLTopBlock()
-            new_types = frozenset(str(tid) for tid in delta.new_types)
+        return delta, context
 
-        # Generate SQL DDL for the delta.
-        delta.generate(block)
+    def _new_delta_block(
+        self,
+        context: s_delta.CommandContext,
+    ) -> pg_dbops.SQLBlock:
+        if context.online_ddl_batch_size is not None:
+            # Online DDL commands may need to run outside of
+            # a transaction, so every command is a separate statement.
+            # The schema storage block is added last as a single
+            # statement, so the schema is only written once all of
+            # the steps have succeeded.
+            return pg_dbops.SQLBlock()
+        else:
+            return pg_dbops.PLTopBlock()
 
-        # Generate schema storage SQL (DML into schema storage tables).
-        subblock = block.add_block()
-        self._compile_schema_storage_in_delta(ctx, delta, subblock)
+    def _generate_delta(
+        self,
+        delta: s_delta.Command,
+        block: pg_dbops.SQLBlock,
+    ) -> None:
+        if (debug.flags.delta_table_effects
+                and isinstance(delta, pg_delta.DeltaRoot)):
+            debug.header('Table Effects')
+            debug.dump_code(
+                '\n'.join(delta.explain_table_effects()), lexer='sql')
 
-        return block, new_types
+        delta.generate(block)
 
     def _compile_schema_storage_in_delta(
         self,
@@ -409,28 +603,64 @@ class Compiler(BaseCompiler):
         stdmode: bool = False,
     ):
 
-        current_tx = ctx.state.current_tx()
-        schema = current_tx.get_schema()
-
         meta_blocks: List[Tuple[str, Dict[str, Any]]] = []
+        self._write_meta(
+            ctx, delta, meta_blocks,
+            is_internal_reflection=is_internal_reflection,
+            stdmode=stdmode,
+        )
+        self._compile_schema_storage(ctx, meta_blocks, block)
+
+    def _write_meta(
+        self,
+        ctx: CompileContext,
+        delta: s_delta.Command,
+        meta_blocks: List[Tuple[str, Dict[str, Any]]],
+        *,
+        is_internal_reflection: bool = False,
+        stdmode: bool = False,
+    ) -> None:
+        """Add the schema storage mutations of *delta* to *meta_blocks*."""
 
         s_refl.write_meta(
             delta,
             classlayout=self._schema_class_layout,
-            schema=schema,
+            schema=ctx.state.current_tx().get_schema(),
             context=s_delta.CommandContext(),
             blocks=meta_blocks,
             is_internal_reflection=is_internal_reflection,
             stdmode=stdmode,
         )
 
+    def _compile_schema_storage(
+        self,
+        ctx: CompileContext,
+        meta_blocks: List[Tuple[str, Dict[str, Any]]],
+        block: pg_dbops.SQLBlock,
+    ) -> None:
+
+        current_tx = ctx.state.current_tx()
         cache = current_tx.get_cached_reflection()
 
+        # Consecutive mutations of the same kind (same class, operation
+        # and set of fields) share the reflection function and are
+        # submitted together.  Batches never span a different mutation,
+        # as later mutations may depend on the effects of earlier ones.
+        batch_fname: Optional[Tuple[str, str]] = None
+        batch_argnames: Tuple[str, ...] = ()
+        batch: List[Dict[str, Any]] = []
+
         with cache.mutate() as cache_mm:
             for eql, args in meta_blocks:
                 eql_hash = hashlib.sha1(eql.encode()).hexdigest()
                 fname = ('edgedb', f'__rh_{eql_hash}')
 
+                if fname != batch_fname:
+                    if batch:
+                        self._write_schema_storage_batch(
+                            block, batch_fname, batch_argnames, batch)
+                    batch = []
+
                 if eql_hash in cache_mm:
                     argnames = cache_mm[eql_hash]
                 else:
@@ -449,16 +679,55 @@ class Compiler(BaseCompiler):
 
                     cache_mm[eql_hash] = argnames
 
-                argvals = []
-                for argname in argnames:
-                    argvals.append(pg_common.quote_literal(args[argname]))
+                batch_fname = fname
+                batch_argnames = argnames
+                batch.append(args)
 
-                block.add_command(f'''
-                    PERFORM {pg_common.qname(*fname)}({", ".join(argvals)});
-                ''')
+            if batch:
+                self._write_schema_storage_batch(
+                    block, batch_fname, batch_argnames, batch)
 
         ctx.state.current_tx().update_cached_reflection(cache_mm.finish())
 
+    def _write_schema_storage_batch(
+        self,
+        block: pg_dbops.SQLBlock,
+        fname: Tuple[str, str],
+        argnames: Tuple[str, ...],
+        batch: List[Dict[str, Any]],
+    ) -> None:
+
+        if len(batch) == 1:
+            argvals = []
+            for argname in argnames:
+                argvals.append(pg_common.quote_literal(batch[0][argname]))
+
+            block.add_command(f'''
+                PERFORM {pg_common.qname(*fname)}({", ".join(argvals)});
+            ''')
+            return
+
+        # Arguments are JSON-encoded already, decode them to
+        # pass the whole batch as a single JSON array.
+        items = json.dumps([
+            {argname: json.loads(args[argname]) for argname in argnames}
+            for args in batch
+        ])
+
+        argvals = []
+        for argname in argnames:
+            argvals.append(f'item.value -> {pg_common.quote_literal(argname)}')
+
+        # Volatile functions in the target list are evaluated after
+        # sorting, so the mutations are applied in their original order,
+        # and every call sees the effects of the previous ones.
+        block.add_command(f'''
+            PERFORM {pg_common.qname(*fname)}({", ".join(argvals)})
+            FROM json_array_elements({pg_common.quote_literal(items)}::json)
+                WITH ORDINALITY AS item(value, num)
+            ORDER BY item.num;
+        ''')
+
     def _compile_schema_storage_stmt(
         self,
         ctx: CompileContext,
@@ -522,7 +791,9 @@ class Compiler(BaseCompiler):
 
     def _compile_ql_query(
             self, ctx: CompileContext,
-            ql: qlast.Base) -> dbstate.BaseQuery:
+            ql: qlast.Base, *,
+            source_map: Optional[Dict[str, Any]] = None,
+    ) -> dbstate.BaseQuery:
 
         current_tx = ctx.state.current_tx()
         session_config = current_tx.get_session_config()
@@ -548,21 +819,23 @@ class Compiler(BaseCompiler):
         # commands indicates that session mode is available
         session_mode = ctx.state.capability & (enums.Capability.TRANSACTION |
                                                enums.Capability.SESSION)
-        ir = qlcompiler.compile_ast_to_ir(
-            ql,
-            schema=current_tx.get_schema(),
-            options=qlcompiler.CompilerOptions(
-                modaliases=current_tx.get_modaliases(),
-                implicit_tid_in_shapes=implicit_fields,
-                implicit_id_in_shapes=implicit_fields,
-                constant_folding=not disable_constant_folding,
-                json_parameters=ctx.json_parameters,
-                implicit_limit=ctx.implicit_limit,
-                session_mode=session_mode,
-                allow_writing_protected_pointers=ctx.schema_reflection_mode,
-                introspection_schema_rewrites=not ctx.schema_reflection_mode,
-            ),
-        )
+        reflection_mode = ctx.schema_reflection_mode
+        with _phase(ctx, 'ql_to_ir'):
+            ir = qlcompiler.compile_ast_to_ir(
+                ql,
+                schema=current_tx.get_schema(),
+                options=qlcompiler.CompilerOptions(
+                    modaliases=current_tx.get_modaliases(),
+                    implicit_tid_in_shapes=implicit_fields,
+                    implicit_id_in_shapes=implicit_fields,
+                    constant_folding=not disable_constant_folding,
+                    json_parameters=ctx.json_parameters,
+                    implicit_limit=ctx.implicit_limit,
+                    session_mode=session_mode,
+                    allow_writing_protected_pointers=reflection_mode,
+                    introspection_schema_rewrites=not reflection_mode,
+                ),
+            )
 
         if ir.cardinality.is_single():
             result_cardinality = enums.ResultCardinality.ONE
@@ -573,23 +846,37 @@ class Compiler(BaseCompiler):
                     f'the query has cardinality {result_cardinality} '
                     f'which does not match the expected cardinality ONE')
 
-        sql_text, argmap = pg_compiler.compile_ir_to_sql(
-            ir,
-            pretty=debug.flags.edgeql_compile or debug.flags.delta_execute,
-            expected_cardinality_one=ctx.expected_cardinality_one,
-            output_format=_convert_format(ctx.output_format),
-        )
+        if ctx.profile is not None:
+            ctx.profile.ir_nodes += _count_nodes(ir)
+
+        with _phase(ctx, 'ir_to_pgast'):
+            qtree = pg_compiler.compile_ir_to_sql_tree(
+                ir,
+                expected_cardinality_one=ctx.expected_cardinality_one,
+                output_format=_convert_format(ctx.output_format),
+                source_map=source_map,
+            )
+
+        with _phase(ctx, 'sql_codegen'):
+            sql_text, argmap = pg_compiler.generate_sql(
+                qtree,
+                pretty=(
+                    debug.flags.edgeql_compile or debug.flags.delta_execute
+                ),
+            )
 
         sql_bytes = sql_text.encode(defines.EDGEDB_ENCODING)
 
         if single_stmt_mode:
-            if native_out_format:
-                out_type_data, out_type_id = sertypes.TypeSerializer.describe(
-                    ir.schema, ir.stype,
-                    ir.view_shapes, ir.view_shapes_metadata)
-            else:
-                out_type_data, out_type_id = \
-                    sertypes.TypeSerializer.describe_json()
+            with _phase(ctx, 'type_desc'):
+                if native_out_format:
+                    out_type_data, out_type_id = \
+                        sertypes.TypeSerializer.describe(
+                            ir.schema, ir.stype,
+                            ir.view_shapes, ir.view_shapes_metadata)
+                else:
+                    out_type_data, out_type_id = \
+                        sertypes.TypeSerializer.describe_json()
 
             in_type_args = None
 
@@ -634,8 +921,9 @@ class Compiler(BaseCompiler):
                 ir.schema, params_type = s_types.Tuple.create(
                     ir.schema, element_types={}, named=False)
 
-            in_type_data, in_type_id = sertypes.TypeSerializer.describe(
-                ir.schema, params_type, {}, {})
+            with _phase(ctx, 'type_desc'):
+                in_type_data, in_type_id = sertypes.TypeSerializer.describe(
+                    ir.schema, params_type, {}, {})
 
             sql_hash = self._hash_sql(
                 sql_bytes,
@@ -643,6 +931,8 @@ class Compiler(BaseCompiler):
                 intype=in_type_id.bytes,
                 outtype=out_type_id.bytes)
 
+            query_stats, reset_query_stats = _get_query_stats_refs(ir)
+
             return dbstate.Query(
                 sql=(sql_bytes,),
                 sql_hash=sql_hash,
@@ -652,6 +942,9 @@ class Compiler(BaseCompiler):
                 in_type_args=in_type_args,
                 out_type_id=out_type_id.bytes,
                 out_type_data=out_type_data,
+                cacheable_result=_is_schema_only_result(ir),
+                query_stats=query_stats,
+                reset_query_stats=reset_query_stats,
             )
 
         else:
@@ -659,7 +952,70 @@ class Compiler(BaseCompiler):
                 raise errors.QueryError(
                     'EdgeQL script queries cannot accept parameters')
 
-            return dbstate.SimpleQuery(sql=(sql_bytes,))
+            _, reset_query_stats = _get_query_stats_refs(ir)
+
+            return dbstate.SimpleQuery(
+                sql=(sql_bytes,),
+                reset_query_stats=reset_query_stats,
+            )
+
+    def _compile_ql_explain(
+            self, ctx: CompileContext,
+            ql: qlast.ExplainStmt) -> dbstate.BaseQuery:
+
+        if ctx.stmt_mode is not enums.CompileStatementMode.SINGLE:
+            raise errors.QueryError(
+                'EXPLAIN cannot be used in scripts',
+                context=ql.context)
+
+        if ctx.output_format is enums.IoFormat.JSON_ELEMENTS:
+            # The HTTP port streams the JSON elements of the result
+            # as they are, without annotating the plan.
+            raise errors.QueryError(
+                'EXPLAIN is not supported over HTTP',
+                context=ql.context)
+
+        # The plan is a single JSON document, whatever the cardinality
+        # of the explained query is.
+        qctx = dataclasses.replace(ctx, expected_cardinality_one=False)
+        source_map: Dict[str, Any] = {}
+        query = self._compile_ql_query(qctx, ql.query, source_map=source_map)
+        assert isinstance(query, dbstate.Query)
+
+        if ql.analyze:
+            options = b'FORMAT JSON, ANALYZE, BUFFERS'
+        else:
+            options = b'FORMAT JSON'
+
+        sql_bytes = b'EXPLAIN (' + options + b') ' + query.sql[0]
+
+        if ctx.output_format is enums.IoFormat.BINARY:
+            schema = ctx.state.current_tx().get_schema()
+            out_type_data, out_type_id = sertypes.TypeSerializer.describe(
+                schema, schema.get('std::json'), {}, {})
+        else:
+            out_type_data, out_type_id = \
+                sertypes.TypeSerializer.describe_json()
+
+        sql_hash = self._hash_sql(
+            sql_bytes,
+            mode=str(ctx.output_format).encode(),
+            intype=query.in_type_id,
+            outtype=out_type_id.bytes)
+
+        return dataclasses.replace(
+            query,
+            sql=(sql_bytes,),
+            sql_hash=sql_hash,
+            cardinality=enums.ResultCardinality.ONE,
+            out_type_id=out_type_id.bytes,
+            out_type_data=out_type_data,
+            cacheable_result=False,
+            # Without ANALYZE the query is only planned, not executed.
+            query_stats=query.query_stats and ql.analyze,
+            reset_query_stats=query.reset_query_stats and ql.analyze,
+            explain_map=json.dumps(source_map).encode(),
+        )
 
     def _compile_and_apply_migration_command(
             self, ctx: CompileContext, cmd) -> dbstate.BaseQuery:
@@ -708,22 +1064,70 @@ class Compiler(BaseCompiler):
                     f'unexpected delta command: {cmd!r}')  # pragma: no cover
 
     def _compile_and_apply_ddl_command(self, ctx: CompileContext, cmd):
-        current_tx = ctx.state.current_tx()
+        self._canonicalize_delta(ctx, cmd)
 
+        # Apply and adapt delta, build native delta plan, which
+        # will also update the schema.
+        block, new_types = self._process_delta(ctx, cmd)
+
+        return self._new_ddl_query(block, new_types)
+
+    def _canonicalize_delta(
+        self,
+        ctx: CompileContext,
+        cmd: s_delta.Command,
+    ) -> None:
         if debug.flags.delta_plan_input:
             debug.header('Delta Plan Input')
             debug.dump(cmd)
 
         # Do a dry-run on test_schema to canonicalize
         # the schema delta-commands.
-        test_schema = current_tx.get_schema()
+        test_schema = ctx.state.current_tx().get_schema()
         context = self._new_delta_context(ctx)
         cmd.apply(test_schema, context=context)
         cmd.canonical = True
 
-        # Apply and adapt delta, build native delta plan, which
-        # will also update the schema.
-        block, new_types = self._process_delta(ctx, cmd)
+    def _compile_and_apply_ddl_script(
+        self,
+        ctx: CompileContext,
+        stmts: List[qlast.DDL],
+    ) -> dbstate.DDLQuery:
+        """Compile a sequence of DDL statements into a single DDL query.
+
+        The statements are applied one by one, as every statement is
+        compiled against the schema produced by the previous ones, but
+        their SQL is generated into a single block, and the schema
+        storage mutations of all of them are written at once, which
+        allows batching them across statements.
+        """
+        block = None
+        new_types: Set[str] = set()
+        meta_blocks: List[Tuple[str, Dict[str, Any]]] = []
+
+        for ql in stmts:
+            cmd = self._delta_from_ddl(ctx, ql)
+            self._canonicalize_delta(ctx, cmd)
+
+            delta, context = self._apply_delta(ctx, cmd)
+            if block is None:
+                block = self._new_delta_block(context)
+
+            self._generate_delta(delta, block)
+            self._write_meta(ctx, delta, meta_blocks)
+            new_types.update(str(tid) for tid in delta.new_types)
+
+        assert block is not None
+        subblock = block.add_block()
+        self._compile_schema_storage(ctx, meta_blocks, subblock)
+
+        return self._new_ddl_query(block, frozenset(new_types))
+
+    def _new_ddl_query(
+        self,
+        block: pg_dbops.SQLBlock,
+        new_types: FrozenSet[str],
+    ) -> dbstate.DDLQuery:
 
         is_transactional = block.is_transactional()
         if not is_transactional:
@@ -756,18 +1160,23 @@ class Compiler(BaseCompiler):
             raise errors.InternalServerError(
                 f'unexpected plan {cmd!r}')  # pragma: no cover
 
-    def _compile_ql_ddl(self, ctx: CompileContext, ql: qlast.DDL):
+    def _delta_from_ddl(
+        self,
+        ctx: CompileContext,
+        ql: qlast.DDL,
+    ) -> s_delta.Command:
         current_tx = ctx.state.current_tx()
-        schema = current_tx.get_schema()
 
-        cmd = s_ddl.delta_from_ddl(
+        return s_ddl.delta_from_ddl(
             ql,
-            schema=schema,
+            schema=current_tx.get_schema(),
             modaliases=current_tx.get_modaliases(),
             testmode=self._in_testmode(ctx),
             schema_object_ids=ctx.schema_object_ids,
         )
 
+    def _compile_ql_ddl(self, ctx: CompileContext, ql: qlast.DDL):
+        cmd = self._delta_from_ddl(ctx, ql)
         return self._compile_command(ctx, cmd)
 
     def _compile_ql_migration(self, ctx: CompileContext,
@@ -1061,48 +1470,71 @@ class Compiler(BaseCompiler):
             config_op=config_op,
         )
 
-    def _compile_dispatch_ql(self, ctx: CompileContext, ql: qlast.Base):
+    def _check_capability(self, ctx: CompileContext, ql: qlast.Base):
+        capability = ctx.state.capability
 
-        if isinstance(ql, (qlast.Database, qlast.Delta)):
-            if not (ctx.state.capability & enums.Capability.DDL):
+        if isinstance(ql, qlast.DDL):
+            if not (capability & enums.Capability.DDL):
                 raise errors.ProtocolError(
                     f'cannot execute DDL commands for the current connection')
-            return self._compile_ql_migration(ctx, ql)
-
-        elif isinstance(ql, qlast.DDL):
-            if not (ctx.state.capability & enums.Capability.DDL):
-                raise errors.ProtocolError(
-                    f'cannot execute DDL commands for the current connection')
-            return self._compile_ql_ddl(ctx, ql)
 
         elif isinstance(ql, qlast.Transaction):
-            if not (ctx.state.capability & enums.Capability.TRANSACTION):
+            if not (capability & enums.Capability.TRANSACTION):
                 raise errors.ProtocolError(
                     f'cannot execute transaction control commands '
                     f'for the current connection')
-            return self._compile_ql_transaction(ctx, ql)
 
-        elif isinstance(ql, (qlast.BaseSessionSet, qlast.BaseSessionReset)):
-            if not (ctx.state.capability & enums.Capability.SESSION):
+        elif isinstance(ql, (qlast.BaseSessionSet, qlast.BaseSessionReset,
+                             qlast.ConfigOp)):
+            if not (capability & enums.Capability.SESSION):
                 raise errors.ProtocolError(
                     f'cannot execute session control commands '
                     f'for the current connection')
-            return self._compile_ql_sess_state(ctx, ql)
 
-        elif isinstance(ql, qlast.ConfigOp):
-            if not (ctx.state.capability & enums.Capability.SESSION):
+        else:
+            if not (capability & enums.Capability.QUERY):
                 raise errors.ProtocolError(
-                    f'cannot execute session control commands '
+                    f'cannot execute query/DML commands '
                     f'for the current connection')
+
+    def _compile_dispatch_ql(self, ctx: CompileContext, ql: qlast.Base):
+
+        self._check_capability(ctx, ql)
+
+        if isinstance(ql, (qlast.Database, qlast.Delta)):
+            return self._compile_ql_migration(ctx, ql)
+
+        elif isinstance(ql, qlast.DDL):
+            return self._compile_ql_ddl(ctx, ql)
+
+        elif isinstance(ql, qlast.Transaction):
+            return self._compile_ql_transaction(ctx, ql)
+
+        elif isinstance(ql, (qlast.BaseSessionSet, qlast.BaseSessionReset)):
+            return self._compile_ql_sess_state(ctx, ql)
+
+        elif isinstance(ql, qlast.ConfigOp):
             return self._compile_ql_config_op(ctx, ql)
 
+        elif isinstance(ql, qlast.ExplainStmt):
+            return self._compile_ql_explain(ctx, ql)
+
         else:
-            if not (ctx.state.capability & enums.Capability.QUERY):
-                raise errors.ProtocolError(
-                    f'cannot execute query/DML commands '
-                    f'for the current connection')
             return self._compile_ql_query(ctx, ql)
 
+    def _compile_dispatch_ql_group(
+        self,
+        ctx: CompileContext,
+        stmts: List[qlast.Base],
+    ) -> dbstate.BaseQuery:
+        if len(stmts) == 1:
+            return self._compile_dispatch_ql(ctx, stmts[0])
+
+        # Only runs of schema DDL statements are grouped,
+        # see _group_ddl_statements().
+        self._check_capability(ctx, stmts[0])
+        return self._compile_and_apply_ddl_script(ctx, stmts)
+
     def _compile(
         self,
         *,
@@ -1116,7 +1548,13 @@ class Compiler(BaseCompiler):
         single_stmt_mode = ctx.stmt_mode is enums.CompileStatementMode.SINGLE
         default_cardinality = enums.ResultCardinality.NO_RESULT
 
-        statements = edgeql.parse_block_tokens(tokens)
+        # The time it takes to parse the block is attributed
+        # to the first compiled unit.
+        unit_profile: Optional[dbstate.CompileProfile]
+        unit_profile = dbstate.CompileProfile()
+        with unit_profile.phase('parse'):
+            statements = edgeql.parse_block_tokens(tokens)
+        unit_profile.total = unit_profile.phases['parse']
         statements_len = len(statements)
 
         if ctx.stmt_mode is enums.CompileStatementMode.SKIP_FIRST:
@@ -1137,8 +1575,16 @@ class Compiler(BaseCompiler):
         units = []
         unit = None
 
-        for stmt in statements:
-            comp: dbstate.BaseQuery = self._compile_dispatch_ql(ctx, stmt)
+        for stmt_group in _group_ddl_statements(statements):
+            stmt = stmt_group[-1]
+            profile = dbstate.CompileProfile(
+                ast_nodes=sum(_count_nodes(st) for st in stmt_group))
+            sctx = dataclasses.replace(ctx, profile=profile)
+            started_at = time.perf_counter()
+
+            comp = self._compile_dispatch_ql_group(sctx, stmt_group)
+
+            profile.total = time.perf_counter() - started_at
 
             if unit is not None:
                 if comp.single_unit:
@@ -1151,9 +1597,17 @@ class Compiler(BaseCompiler):
                     sql=(),
                     status=status.get_status(stmt),
                     cardinality=default_cardinality)
+                if unit_profile is not None:
+                    unit.compile_profile = unit_profile
+                    unit_profile = None
+                else:
+                    unit.compile_profile = dbstate.CompileProfile()
             else:
                 unit.status = status.get_status(stmt)
 
+            assert unit.compile_profile is not None
+            unit.compile_profile.add(profile)
+
             if not comp.is_transactional:
                 if not comp.single_unit:
                     raise errors.InternalServerError(
@@ -1175,14 +1629,22 @@ class Compiler(BaseCompiler):
                     unit.in_type_id = comp.in_type_id
 
                     unit.cacheable = True
+                    unit.cacheable_result = comp.cacheable_result
+                    unit.query_stats = comp.query_stats
+                    unit.explain_map = comp.explain_map
 
                     unit.cardinality = comp.cardinality
                 else:
                     unit.sql += comp.sql
 
+                if comp.reset_query_stats:
+                    unit.reset_query_stats = True
+
             elif isinstance(comp, dbstate.SimpleQuery):
                 assert not single_stmt_mode
                 unit.sql += comp.sql
+                if comp.reset_query_stats:
+                    unit.reset_query_stats = True
 
             elif isinstance(comp, dbstate.DDLQuery):
                 unit.sql += comp.sql
@@ -1814,6 +2276,15 @@ class Compiler(BaseCompiler):
             tables=tables,
         )
 
+    async def describe_bulk_load(
+        self,
+        dbver: bytes,
+        type_name: str,
+        blocks: List[Tuple[bytes, bytes]],  # block_id, description
+    ) -> bulkload.BulkLoadDescriptor:
+        db = await self._get_database(dbver)
+        return bulkload.describe_bulk_load(db.schema, type_name, blocks)
+
 
 class DumpDescriptor(NamedTuple):
 
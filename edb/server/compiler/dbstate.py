@@ -19,6 +19,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import enum
 import time
@@ -67,6 +68,10 @@ class Query(BaseQuery):
 
     is_transactional: bool = True
     single_unit: bool = False
+    cacheable_result: bool = False
+    query_stats: bool = False
+    reset_query_stats: bool = False
+    explain_map: Optional[bytes] = None
 
 
 @dataclasses.dataclass(frozen=True)
@@ -75,6 +80,7 @@ class SimpleQuery(BaseQuery):
     sql: Tuple[bytes, ...]
     is_transactional: bool = True
     single_unit: bool = False
+    reset_query_stats: bool = False
 
 
 @dataclasses.dataclass(frozen=True)
@@ -117,6 +123,36 @@ class Param:
 #############################
 
 
+@dataclasses.dataclass
+class CompileProfile:
+    """Time spent compiling a query unit, broken down by phase.
+
+    The times are in seconds.  *total* is the wall time of the whole
+    compilation, which includes the time not covered by any phase.
+    """
+
+    phases: Dict[str, float] = dataclasses.field(default_factory=dict)
+    total: float = 0
+    ast_nodes: int = 0
+    ir_nodes: int = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.phases[name] = self.phases.get(name, 0) + elapsed
+
+    def add(self, other: CompileProfile) -> None:
+        for name, elapsed in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0) + elapsed
+        self.total += other.total
+        self.ast_nodes += other.ast_nodes
+        self.ir_nodes += other.ir_nodes
+
+
 @dataclasses.dataclass
 class QueryUnit:
 
@@ -166,6 +202,22 @@ class QueryUnit:
     # True if it is safe to cache this unit.
     cacheable: bool = False
 
+    # True if the result of this unit depends only on the schema and
+    # the query arguments, and so can be cached until the next DDL.
+    cacheable_result: bool = False
+
+    # True if this unit reads sys::QueryStats, which must then be
+    # synced to the backend connection before the unit is executed.
+    query_stats: bool = False
+
+    # True if this unit calls sys::reset_query_stats().
+    reset_query_stats: bool = False
+
+    # Set only when this unit is an EXPLAIN statement: a JSON object
+    # mapping the range aliases and CTE names found in the query plan
+    # to the EdgeQL source they were compiled from.
+    explain_map: Optional[bytes] = None
+
     # Cardinality of the result set.  Set to NO_RESULT if the
     # unit represents multiple queries compiled as one script.
     cardinality: enums.ResultCardinality = \
@@ -187,6 +239,9 @@ class QueryUnit:
         dataclasses.field(default_factory=list))
     modaliases: Optional[immutables.Map] = None
 
+    # Per-phase compilation times of this unit.
+    compile_profile: Optional[CompileProfile] = None
+
 
 #############################
 
@@ -62,6 +62,8 @@ class PGErrorCode(enum.Enum):
 
     ObjectInUse = '55006'
 
+    QueryCanceledError = '57014'
+
 
 class SchemaRequired:
     '''A sentinel used to signal that a particular error requires a schema.'''
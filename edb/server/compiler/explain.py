@@ -0,0 +1,70 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Annotation of backend query plans produced by EXPLAIN.
+
+The EXPLAIN statement is compiled into ``EXPLAIN (FORMAT JSON)`` of
+the SQL of the explained query along with a map of the range aliases
+and CTE names used in that SQL to the EdgeQL source they were compiled
+from.  The plan nodes that scan a mapped relation are annotated with
+an ``"EdgeQL Source"`` key holding the matching map entry.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import json
+
+
+SOURCE_KEY = 'EdgeQL Source'
+
+
+def annotate_plan(plan: bytes, source_map: bytes) -> bytes:
+    """Annotate a JSON-encoded backend plan with the EdgeQL source."""
+
+    smap = json.loads(source_map)
+    doc = json.loads(plan)
+
+    for stmt in doc:
+        _annotate_node(stmt['Plan'], smap)
+
+    return json.dumps(doc).encode()
+
+
+def _annotate_node(node: Dict[str, Any], smap: Dict[str, Any]) -> None:
+    source = None
+
+    alias = node.get('Alias')
+    if alias is not None:
+        source = smap.get(alias)
+
+    if source is None:
+        cte_name = node.get('CTE Name')
+        if cte_name is not None:
+            source = smap.get(cte_name)
+
+    if source is None:
+        subplan = node.get('Subplan Name')
+        if subplan is not None and subplan.startswith('CTE '):
+            source = smap.get(subplan[4:])
+
+    if source is not None:
+        node[SOURCE_KEY] = source
+
+    for child in node.get('Plans', ()):
+        _annotate_node(child, smap)
@@ -150,3 +150,8 @@ def _describe(ql):
 @get_status.register(qlast.Rename)
 def _rename(ql):
     return f'RENAME'.encode()
+
+
+@get_status.register(qlast.ExplainStmt)
+def _explain(ql):
+    return f'EXPLAIN'.encode()
@@ -16,6 +16,28 @@
 # limitations under the License.
 #
 
+from libc.stdint cimport int64_t
+
+
+cdef class QueryStats:
+    cdef:
+        readonly object id
+        readonly str dbname
+        readonly str query
+
+        readonly int64_t calls
+        readonly int64_t cache_hits
+        readonly int64_t result_cache_hits
+        readonly int64_t rows
+        readonly double compile_time
+        readonly double total_time
+        readonly double max_time
+
+    cdef record_compile(self, double elapsed)
+    cdef record_cache_hit(self)
+    cdef record_result_cache_hit(self)
+    cdef record_execute(self, double elapsed, int64_t rows)
+
 
 cdef class DatabaseIndex:
     cdef:
@@ -27,6 +49,10 @@ cdef class DatabaseIndex:
         object _sys_queries
         object _instance_data
 
+        object _query_stats
+
+    cdef QueryStats _get_query_stats(self, str dbname, str query)
+
 
 cdef class Database:
 
@@ -34,11 +60,13 @@ cdef class Database:
         str _name
         object _dbver
         object _eql_to_compiled
+        object _results
         DatabaseIndex _index
 
     cdef _signal_ddl(self, new_dbver)
     cdef _invalidate_caches(self)
     cdef _cache_compiled_query(self, key, query_unit)
+    cdef _cache_result(self, key, dbver, bytes data, int64_t rows)
     cdef _new_view(self, user, query_cache)
 
 
@@ -79,6 +107,12 @@ cdef class DatabaseConnectionView:
     cdef lookup_compiled_query(self, str eql, object io_format,
                                bint expect_one, int implicit_limit)
 
+    cdef cache_result(self, key, dbver, bytes data, int64_t rows)
+    cdef lookup_cached_result(self, key)
+
+    cdef QueryStats get_query_stats(self, str query)
+    cdef query_stats_to_json(self)
+
     cdef tx_error(self)
 
     cdef start(self, query_unit)
@@ -87,3 +121,4 @@ cdef class DatabaseConnectionView:
 
     cdef get_session_config(self)
     cdef set_session_config(self, new_conf)
+    cdef lookup_config(self, str name)
@@ -24,14 +24,56 @@ import typing
 
 import immutables
 
+from libc.stdint cimport int64_t
+
 from edb import errors
 from edb.common import lru, uuidgen
-from edb.server import defines, config
+from edb.server import defines, config, metrics
 from edb.server.compiler import dbstate
 from edb.pgsql import dbops
 
 
-__all__ = ('DatabaseIndex', 'DatabaseConnectionView')
+__all__ = ('DatabaseIndex', 'DatabaseConnectionView', 'QueryStats')
+
+
+cdef class QueryStats:
+    """Execution statistics of a normalized query in a database."""
+
+    def __init__(self, str dbname, str query):
+        self.id = uuidgen.uuid1mc()
+        self.dbname = dbname
+        self.query = query
+
+    cdef record_compile(self, double elapsed):
+        self.compile_time += elapsed
+
+    cdef record_cache_hit(self):
+        self.cache_hits += 1
+
+    cdef record_result_cache_hit(self):
+        self.result_cache_hits += 1
+
+    cdef record_execute(self, double elapsed, int64_t rows):
+        self.calls += 1
+        self.rows += rows
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def as_json(self):
+        # Times are in microseconds.
+        return {
+            'id': str(self.id),
+            'database': self.dbname,
+            'query': self.query,
+            'calls': self.calls,
+            'cache_hits': self.cache_hits,
+            'result_cache_hits': self.result_cache_hits,
+            'rows': self.rows,
+            'compile_time': int(self.compile_time * 1e6),
+            'total_time': int(self.total_time * 1e6),
+            'max_time': int(self.max_time * 1e6),
+        }
 
 
 cdef class Database:
@@ -48,6 +90,11 @@ cdef class Database:
         self._eql_to_compiled = lru.LRUMapping(
             maxsize=defines._MAX_QUERIES_CACHE)
 
+        # Encoded results of queries that depend only on the schema,
+        # such as introspection queries.
+        self._results = lru.LRUMapping(
+            maxsize=defines._MAX_RESULTS_CACHE)
+
     cdef _signal_ddl(self, new_dbver):
         if new_dbver is None:
             self._dbver = uuidgen.uuid1mc().bytes
@@ -57,6 +104,7 @@ cdef class Database:
 
     cdef _invalidate_caches(self):
         self._eql_to_compiled.clear()
+        self._results.clear()
 
     cdef _cache_compiled_query(self, key, compiled: dbstate.QueryUnit):
         assert compiled.cacheable
@@ -68,6 +116,13 @@ cdef class Database:
 
         self._eql_to_compiled[key] = compiled
 
+    cdef _cache_result(self, key, dbver, bytes data, int64_t rows):
+        if dbver != self._dbver:
+            # The schema has changed while the query was running.
+            return
+
+        self._results[key] = (data, rows)
+
     cdef _new_view(self, user, query_cache):
         return DatabaseConnectionView(self, user=user, query_cache=query_cache)
 
@@ -142,6 +197,13 @@ cdef class DatabaseConnectionView:
         else:
             self._config = new_conf
 
+    cdef lookup_config(self, str name):
+        return config.lookup(
+            config.get_settings(),
+            name,
+            self.get_session_config(),
+            self._db._index._sys_config)
+
     property modaliases:
         def __get__(self):
             return self._modaliases
@@ -200,6 +262,29 @@ cdef class DatabaseConnectionView:
 
         return query_unit
 
+    cdef cache_result(self, key, dbver, bytes data, int64_t rows):
+        if self._in_tx or not self._query_cache_enabled:
+            return
+
+        self._db._cache_result(key, dbver, data, rows)
+
+    cdef lookup_cached_result(self, key):
+        if self._in_tx or not self._query_cache_enabled:
+            return None
+
+        result = self._db._results.get(key)
+        if result is None:
+            metrics.result_cache_misses_total.inc()
+        else:
+            metrics.result_cache_hits_total.inc()
+        return result
+
+    cdef QueryStats get_query_stats(self, str query):
+        return self._db._index._get_query_stats(self._db._name, query)
+
+    cdef query_stats_to_json(self):
+        return self._db._index.query_stats_to_json()
+
     cdef tx_error(self):
         if self._in_tx:
             self._tx_error = True
@@ -240,6 +325,9 @@ cdef class DatabaseConnectionView:
         if query_unit.modaliases is not None:
             self._modaliases = query_unit.modaliases
 
+        if query_unit.reset_query_stats:
+            self._db._index.reset_query_stats()
+
         if query_unit.tx_commit:
             if not self._in_tx:
                 # This shouldn't happen because compiler has
@@ -294,6 +382,11 @@ cdef class DatabaseIndex:
         self._instance_data = None
         self._sys_config = None
 
+        # Statistics of the most recently used queries of all
+        # databases, see sys::QueryStats.
+        self._query_stats = lru.LRUMapping(
+            maxsize=defines._MAX_QUERY_STATS)
+
     async def get_sys_query(self, conn, key: str) -> bytes:
         if self._sys_queries is None:
             result = await conn.simple_query(
@@ -330,6 +423,23 @@ cdef class DatabaseIndex:
     def get_sys_config(self):
         return self._sys_config
 
+    cdef QueryStats _get_query_stats(self, str dbname, str query):
+        key = (dbname, query)
+        stats = self._query_stats.get(key)
+        if stats is None:
+            stats = QueryStats(dbname, query)
+            self._query_stats[key] = stats
+        return stats
+
+    def reset_query_stats(self):
+        self._query_stats.clear()
+
+    def query_stats_to_json(self) -> str:
+        return json.dumps([
+            (<QueryStats>self._query_stats[key]).as_json()
+            for key in list(self._query_stats)
+        ])
+
     def get_dbver(self, dbname):
         db = self._get_db(dbname)
         return (<Database>db)._dbver
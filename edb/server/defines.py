@@ -25,9 +25,11 @@ EDGEDB_TEMPLATE_DB = 'edgedb0'
 EDGEDB_SUPERUSER_DB = 'edgedb'
 EDGEDB_ENCODING = 'utf-8'
 EDGEDB_VISIBLE_METADATA_PREFIX = r'EdgeDB metadata follows, do not modify.\n'
+# HINT of NOTICE messages reporting the progress of online DDL.
+EDGEDB_DDL_PROGRESS_HINT = 'edgedb:ddl_progress'
 
 # Increment this whenever the database layout or stdlib changes.
-EDGEDB_CATALOG_VERSION = 2020_05_24_00_00
+EDGEDB_CATALOG_VERSION = 2020_06_03_00_00
 
 # Resource limit on open FDs for the server process.
 # By default, at least on macOS, the max number of open FDs
@@ -37,6 +39,9 @@ EDGEDB_MIN_RLIMIT_NOFILE = 2048
 
 
 _MAX_QUERIES_CACHE = 1000
+_MAX_RESULTS_CACHE = 1000
+_MAX_CACHED_RESULT_SIZE = 1024 * 1024
+_MAX_QUERY_STATS = 5000
 
 _QUERY_ROLLING_AVG_LEN = 10
 _QUERIES_ROLLING_AVG_LEN = 300
@@ -45,4 +50,16 @@ DEFAULT_MODULE_ALIAS = 'default'
 
 
 HTTP_PORT_QUERY_CACHE_SIZE = 500
+HTTP_PORT_PERSISTED_QUERIES_CACHE_SIZE = 1000
+# Number of operations of a persisted GraphQL query whose rewrites
+# are cached.
+HTTP_PORT_PERSISTED_QUERY_REWRITES_CACHE_SIZE = 16
 HTTP_PORT_MAX_CONCURRENCY = 250
+# Upper bound on the number of pipelined requests that are handled
+# concurrently on a single HTTP connection.
+HTTP_PORT_MAX_PIPELINED_REQUESTS = 32
+# Size of the chunks of the streamed results of the HTTP ports.
+HTTP_PORT_STREAM_CHUNK_SIZE = 64 * 1024
+# Amount of the result of a pipelined query that is buffered while
+# the responses to the requests before it are sent.
+HTTP_PORT_PIPELINE_BUFFER_SIZE = 1024 * 1024
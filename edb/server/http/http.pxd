@@ -35,6 +35,17 @@ cdef class HttpResponse:
         bint close_connection
         bytes content_type
         bytes body
+        object stream
+        bint streamed
+
+
+cdef class PipelinedRequest:
+
+    cdef:
+        HttpRequest request
+        HttpResponse response
+        object error
+        bint done
 
 
 cdef class HttpProtocol:
@@ -44,15 +55,32 @@ cdef class HttpProtocol:
         object parser
         object transport
         object unprocessed
-        bint in_response
+        object in_flight
+        int max_concurrency
+        str proto_name
+        bint accepting
+        bint writing_paused
+        object write_waiter
 
         HttpRequest current_request
 
+    cdef list _make_headers(self, bytes req_version, bytes resp_status,
+                            bytes content_type, bint close_connection)
     cdef _write(self, bytes req_version, bytes resp_status,
                 bytes content_type, bytes body, bint close_connection)
 
     cdef write(self, HttpRequest request, HttpResponse response)
 
     cdef unhandled_exception(self, ex)
-    cdef resume(self)
+    cdef dispatch(self)
+    cdef flush(self)
     cdef close(self)
+
+
+cdef class HttpResponseWriter:
+
+    cdef:
+        HttpProtocol protocol
+        bint chunked
+
+    cdef finish(self)
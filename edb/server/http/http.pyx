@@ -19,11 +19,13 @@
 
 import collections
 import http
+import time
 
 import httptools
 
 from edb.common import debug
 from edb.common import markup
+from edb.server import metrics
 
 
 HTTPStatus = http.HTTPStatus
@@ -40,25 +42,76 @@ cdef class HttpResponse:
         self.content_type = b'text/plain'
         self.body = b''
         self.close_connection = False
+        self.stream = None
+        self.streamed = False
+
+
+cdef class PipelinedRequest:
+
+    def __cinit__(self, HttpRequest request):
+        self.request = request
+        self.response = HttpResponse()
+        self.error = None
+        self.done = False
 
 
 cdef class HttpProtocol:
 
-    def __init__(self, loop):
+    def __init__(self, loop, int max_concurrency=1, str proto_name=None):
+        if max_concurrency <= 0:
+            raise ValueError('max_concurrency must be greater than 0')
+
         self.loop = loop
+        # The request durations are recorded in the metrics
+        # under this protocol name, if set.
+        self.proto_name = proto_name
         self.transport = None
 
         self.parser = httptools.HttpRequestParser(self)
         self.current_request = HttpRequest()
-        self.in_response = False
-        self.unprocessed = None
+        self.max_concurrency = max_concurrency
+        self.accepting = True
+        # Requests that were parsed but not yet dispatched.
+        self.unprocessed = collections.deque()
+        # Dispatched requests in the order they were received;
+        # responses are written strictly in this order.
+        self.in_flight = collections.deque()
+
+        self.writing_paused = False
+        self.write_waiter = None
 
     def connection_made(self, transport):
         self.transport = transport
 
     def connection_lost(self, exc):
+        # Requests that are still being handled are allowed to finish
+        # (they might hold pooled resources), their responses are
+        # simply discarded.
         self.transport = None
-        self.unprocessed = None
+        self.unprocessed.clear()
+        self.in_flight.clear()
+
+        if self.write_waiter is not None and not self.write_waiter.done():
+            self.write_waiter.set_exception(
+                ConnectionResetError('connection lost'))
+        self.write_waiter = None
+
+    def pause_writing(self):
+        self.writing_paused = True
+
+    def resume_writing(self):
+        self.writing_paused = False
+        if self.write_waiter is not None and not self.write_waiter.done():
+            self.write_waiter.set_result(None)
+        self.write_waiter = None
+
+    async def drain(self):
+        if self.transport is None:
+            raise ConnectionResetError('connection lost')
+        if self.writing_paused:
+            if self.write_waiter is None:
+                self.write_waiter = self.loop.create_future()
+            await self.write_waiter
 
     def data_received(self, data):
         try:
@@ -78,8 +131,6 @@ cdef class HttpProtocol:
         self.current_request.body = body
 
     def on_message_complete(self):
-        self.transport.pause_reading()
-
         req = self.current_request
         self.current_request = HttpRequest()
 
@@ -87,19 +138,79 @@ cdef class HttpProtocol:
         req.should_keep_alive = self.parser.should_keep_alive()
         req.method = self.parser.get_method().upper()
 
-        if self.in_response:
-            # pipelining support
-            if self.unprocessed is None:
-                self.unprocessed = collections.deque()
+        if self.accepting:
             self.unprocessed.append(req)
+            self.dispatch()
+
+    cdef dispatch(self):
+        cdef:
+            HttpRequest req
+            PipelinedRequest pending
+
+        if self.transport is None:
+            return
+
+        while (self.accepting and self.unprocessed and
+                len(self.in_flight) < self.max_concurrency):
+            req = self.unprocessed.popleft()
+            pending = PipelinedRequest(req)
+            self.in_flight.append(pending)
+            self.loop.create_task(self._handle_request(pending))
+
+            if not req.should_keep_alive:
+                # The connection will be closed after this request,
+                # anything pipelined after it is never going to be
+                # answered.
+                self.accepting = False
+                self.unprocessed.clear()
+
+        if (not self.accepting or self.unprocessed or
+                len(self.in_flight) >= self.max_concurrency):
+            self.transport.pause_reading()
         else:
-            self.in_response = True
-            self.loop.create_task(self._handle_request(req))
+            self.transport.resume_reading()
+
+    cdef flush(self):
+        cdef:
+            PipelinedRequest pending
+
+        while self.in_flight and self.transport is not None:
+            pending = self.in_flight[0]
+            if not pending.done:
+                break
+
+            if (pending.error is None and
+                    pending.response.stream is not None):
+                # The request stays at the head of the queue while
+                # its response is streamed, so that the responses to
+                # the requests pipelined after it are held back.
+                pending.done = False
+                self.loop.create_task(self._stream_response(pending))
+                break
+
+            self.in_flight.popleft()
+
+            if pending.error is not None:
+                self.unhandled_exception(pending.error)
+                return
+
+            if not pending.response.streamed:
+                self.write(pending.request, pending.response)
+
+            if (pending.response.close_connection or
+                    not pending.request.should_keep_alive):
+                self.close()
+                return
+
+        self.dispatch()
 
     cdef close(self):
-        self.transport.close()
-        self.transport = None
-        self.unprocessed = None
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        self.accepting = False
+        self.unprocessed.clear()
+        self.in_flight.clear()
 
     cdef unhandled_exception(self, ex):
         if debug.flags.server:
@@ -114,24 +225,11 @@ cdef class HttpProtocol:
 
         self.close()
 
-    cdef resume(self):
-        if self.transport is None:
-            return
-
-        if self.unprocessed:
-            req = self.unprocessed.popleft()
-            self.loop.create_task(self._handle_request(req))
-        else:
-            self.transport.resume_reading()
-
-    cdef _write(self, bytes req_version, bytes resp_status,
-                bytes content_type, bytes body, bint close_connection):
-        if self.transport is None:
-            return
+    cdef list _make_headers(self, bytes req_version, bytes resp_status,
+                            bytes content_type, bint close_connection):
         data = [
             b'HTTP/', req_version, b' ', resp_status, b'\r\n',
             b'Content-Type: ', content_type, b'\r\n',
-            b'Content-Length: ', f'{len(body)}'.encode(), b'\r\n',
         ]
 
         if debug.flags.http_inject_cors:
@@ -139,7 +237,16 @@ cdef class HttpProtocol:
 
         if close_connection:
             data.append(b'Connection: close\r\n')
-        data.append(b'\r\n')
+        return data
+
+    cdef _write(self, bytes req_version, bytes resp_status,
+                bytes content_type, bytes body, bint close_connection):
+        if self.transport is None:
+            return
+        data = self._make_headers(
+            req_version, resp_status, content_type, close_connection)
+        data.append(b'Content-Length: ')
+        data.append(f'{len(body)}\r\n\r\n'.encode())
         if body:
             data.append(body)
         self.transport.write(b''.join(data))
@@ -153,26 +260,87 @@ cdef class HttpProtocol:
             response.body,
             response.close_connection)
 
-    async def _handle_request(self, HttpRequest request):
+    async def _stream_response(self, PipelinedRequest pending):
         cdef:
-            HttpResponse response = HttpResponse()
+            HttpRequest request = pending.request
+            HttpResponse response = pending.response
+            HttpResponseWriter writer
+
+        stream = response.stream
+        response.stream = None
+        response.streamed = True
+
+        # HTTP/1.0 clients do not support the chunked transfer
+        # encoding, the end of the body is signalled by closing
+        # the connection instead.
+        chunked = request.version != b'1.0'
+        if not chunked:
+            response.close_connection = True
+
+        if self.transport is not None:
+            assert type(response.status) is HTTPStatus
+            data = self._make_headers(
+                request.version,
+                f'{response.status.value} {response.status.phrase}'.encode(),
+                response.content_type,
+                response.close_connection)
+            if chunked:
+                data.append(b'Transfer-Encoding: chunked\r\n')
+            data.append(b'\r\n')
+            self.transport.write(b''.join(data))
+
+        writer = HttpResponseWriter(self, chunked)
+        try:
+            await stream(writer)
+        except Exception as ex:
+            if debug.flags.server:
+                markup.dump(ex)
+            # The status line is already sent, so the only way to
+            # signal the error is to abort the response.
+            response.close_connection = True
+        else:
+            writer.finish()
+
+        pending.done = True
+        self.flush()
 
+    async def _handle_request(self, PipelinedRequest pending):
         if self.transport is None:
             return
 
+        started_at = time.monotonic()
         try:
-            await self.handle_request(request, response)
+            await self.handle_request(pending.request, pending.response)
         except Exception as ex:
-            self.unhandled_exception(ex)
-            return
+            pending.error = ex
 
-        self.write(request, response)
-        self.in_response = False
+        if self.proto_name is not None:
+            metrics.http_request_duration.observe(
+                time.monotonic() - started_at, self.proto_name)
 
-        if response.close_connection or not request.should_keep_alive:
-            self.close()
-        else:
-            self.resume()
+        pending.done = True
+        self.flush()
 
     async def handle_request(self, request, response):
         raise NotImplementedError
+
+
+cdef class HttpResponseWriter:
+
+    def __cinit__(self, HttpProtocol protocol, bint chunked):
+        self.protocol = protocol
+        self.chunked = chunked
+
+    def write(self, bytes data):
+        if not data or self.protocol.transport is None:
+            return
+        if self.chunked:
+            data = b''.join((f'{len(data):x}\r\n'.encode(), data, b'\r\n'))
+        self.protocol.transport.write(data)
+
+    async def drain(self):
+        await self.protocol.drain()
+
+    cdef finish(self):
+        if self.chunked and self.protocol.transport is not None:
+            self.protocol.transport.write(b'0\r\n\r\n')
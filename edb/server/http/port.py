@@ -70,6 +70,12 @@ class BaseHttpPort(baseport.Port):
     def pgcons(self):
         return self._pgcons
 
+    @property
+    def max_pipelined_requests(self):
+        # There is no point in handling more requests concurrently
+        # than there are compilers and backend connections to serve them.
+        return min(self.concurrency, defines.HTTP_PORT_MAX_PIPELINED_REQUESTS)
+
     @classmethod
     def get_proto_name(cls):
         raise NotImplementedError
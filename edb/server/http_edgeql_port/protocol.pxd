@@ -25,3 +25,14 @@ cdef class Protocol(http.HttpProtocol):
     cdef:
         object server
         stmt_cache.StatementsCache query_cache
+        object pgcon_turn
+        object buffers
+
+
+cdef class ResponseBuffer:
+    cdef:
+        list chunks
+        int size
+        int limit
+        http.HttpResponseWriter writer
+        object attached
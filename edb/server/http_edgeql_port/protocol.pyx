@@ -17,6 +17,7 @@
 #
 
 
+import functools
 import json
 import urllib.parse
 
@@ -29,8 +30,10 @@ from edb.common import debug
 from edb.common import markup
 
 from edb.server import compiler
+from edb.server import defines
 from edb.server import tokenizer
 from edb.server.compiler import IoFormat
+from edb.server.compiler import errormech
 from edb.server.http import http
 from edb.server.http cimport http
 
@@ -38,12 +41,57 @@ from edb.server.http cimport http
 cdef class Protocol(http.HttpProtocol):
 
     def __init__(self, loop, server, query_cache):
-        http.HttpProtocol.__init__(self, loop)
+        http.HttpProtocol.__init__(
+            self, loop, max_concurrency=server.max_pipelined_requests,
+            proto_name=server.get_proto_name())
         self.server = server
         self.query_cache = query_cache
+        # Resolved when the last dispatched request has acquired
+        # a backend connection or has given up its turn to do so.
+        self.pgcon_turn = None
+        # Buffers of the results that are not sent yet.
+        self.buffers = set()
+
+    def connection_lost(self, exc):
+        # Stop the queries whose results are buffered, they are
+        # never going to be sent.
+        for buffer in self.buffers:
+            buffer.abort()
+        self.buffers.clear()
+        http.HttpProtocol.connection_lost(self, exc)
 
     async def handle_request(self, http.HttpRequest request,
                              http.HttpResponse response):
+        # The backend connections are acquired in the order of the
+        # requests.  Otherwise the queries pipelined after a request
+        # could take the last connections of the pool while waiting
+        # for their responses to reach the head of the pipeline.
+        prev_turn = self.pgcon_turn
+        turn = self.pgcon_turn = self.loop.create_future()
+
+        executing = False
+        try:
+            prepared = await self.parse_request(request, response)
+            if prepared is None:
+                return
+
+            # The query is executed right away and its result is
+            # buffered until the response is at the head of the
+            # pipeline, from then on it is streamed row by row.
+            buffer = ResponseBuffer(
+                self.loop, defines.HTTP_PORT_PIPELINE_BUFFER_SIZE)
+            self.buffers.add(buffer)
+            task = self.loop.create_task(
+                self.execute(*prepared, buffer, prev_turn, turn))
+            executing = True
+            response.stream = functools.partial(
+                self.stream_result, buffer, task)
+        finally:
+            if not executing:
+                pass_turn(prev_turn, turn)
+
+    async def parse_request(self, http.HttpRequest request,
+                            http.HttpResponse response):
         url_path = request.url.path.strip(b'/')
 
         if url_path != b'':
@@ -106,25 +154,29 @@ cdef class Protocol(http.HttpProtocol):
         response.status = http.HTTPStatus.OK
         response.content_type = b'application/json'
         try:
-            result = await self.execute(query.encode(), variables)
+            query_unit, use_prep_stmt, args = await self.prepare(
+                query.encode(), variables)
         except Exception as ex:
-            if debug.flags.server:
-                markup.dump(ex)
+            response.body = b'{"error":' + self.encode_error(ex) + b'}'
+        else:
+            return query_unit, use_prep_stmt, args
 
-            ex_type = type(ex)
-            if not issubclass(ex_type, errors.EdgeDBError):
-                # XXX Fix this when LSP "location" objects are implemented
-                ex_type = errors.InternalServerError
+    def encode_error(self, ex):
+        if debug.flags.server:
+            markup.dump(ex)
 
-            err_dct = {
-                'message': str(ex),
-                'type': str(ex_type.__name__),
-                'code': ex_type.get_code(),
-            }
+        ex_type = type(ex)
+        if not issubclass(ex_type, errors.EdgeDBError):
+            # XXX Fix this when LSP "location" objects are implemented
+            ex_type = errors.InternalServerError
 
-            response.body = json.dumps({'error': err_dct}).encode()
-        else:
-            response.body = b'{"data":' + result + b'}'
+        err_dct = {
+            'message': str(ex),
+            'type': str(ex_type.__name__),
+            'code': ex_type.get_code(),
+        }
+
+        return json.dumps(err_dct).encode()
 
     async def compile(self, dbver, bytes query):
         comp = await self.server.compilers.get()
@@ -135,7 +187,7 @@ cdef class Protocol(http.HttpProtocol):
                 tokenizer.tokenize(query),
                 None,           # modaliases
                 None,           # session config
-                IoFormat.JSON,  # json mode
+                IoFormat.JSON_ELEMENTS,  # json mode
                 False,          # expected cardinality is MANY
                 0,              # no implicit limit
                 compiler.CompileStatementMode.SINGLE,
@@ -147,7 +199,7 @@ cdef class Protocol(http.HttpProtocol):
         finally:
             self.server.compilers.put_nowait(comp)
 
-    async def execute(self, bytes query, variables):
+    async def prepare(self, bytes query, variables):
         dbver = self.server.get_dbver()
         cache_key = (query, dbver)
         use_prep_stmt = False
@@ -175,16 +227,154 @@ cdef class Protocol(http.HttpProtocol):
                             f'parameter ${param.name} is required')
                     args.append(value)
 
-        pgcon = await self.server.pgcons.get()
+        return query_unit, use_prep_stmt, args
+
+    async def interpret_backend_error(self, dbver, ex):
+        static_exc = errormech.static_interpret_backend_error(ex.fields)
+        if static_exc is not errormech.SchemaRequired:
+            return static_exc
+
+        comp = await self.server.compilers.get()
+        try:
+            return await comp.call('interpret_backend_error', dbver,
+                                   ex.fields)
+        finally:
+            self.server.compilers.put_nowait(comp)
+
+    async def execute(self, query_unit, use_prep_stmt, args,
+                      ResponseBuffer buffer, prev_turn, turn):
+        rows = JsonElementsWriter(buffer)
+
         try:
-            data = await pgcon.parse_execute_json(
+            if prev_turn is not None:
+                await prev_turn
+            pgcon = await self.server.pgcons.get()
+        finally:
+            turn.set_result(None)
+
+        try:
+            await pgcon.parse_execute_json_stream(
                 query_unit.sql[0], query_unit.sql_hash, query_unit.dbver,
-                use_prep_stmt, args)
+                use_prep_stmt, args, rows)
+        except Exception as ex:
+            if isinstance(ex, pgerrors.BackendError):
+                try:
+                    ex = await self.interpret_backend_error(
+                        query_unit.dbver, ex)
+                except Exception as interpret_ex:
+                    ex = interpret_ex
+            rows.finish(self.encode_error(ex))
+        else:
+            rows.finish()
         finally:
             self.server.pgcons.put_nowait(pgcon)
+            self.buffers.discard(buffer)
+
+    async def stream_result(self, ResponseBuffer buffer, task,
+                            http.HttpResponseWriter writer):
+        buffer.attach(writer)
+        await task
+
+
+def pass_turn(prev_turn, turn):
+    if prev_turn is None or prev_turn.done():
+        turn.set_result(None)
+    else:
+        prev_turn.add_done_callback(lambda _: turn.set_result(None))
+
+
+cdef class ResponseBuffer:
+    """Buffer a response body until the response can be sent.
+
+    Once *limit* bytes are buffered, drain() waits until the buffer
+    is attached to the writer of the response.
+    """
+
+    def __init__(self, loop, int limit):
+        self.chunks = []
+        self.size = 0
+        self.limit = limit
+        self.writer = None
+        self.attached = loop.create_future()
+
+    def write(self, bytes data):
+        if self.writer is not None:
+            self.writer.write(data)
+        elif not self.attached.done():
+            self.chunks.append(data)
+            self.size += len(data)
+
+    async def drain(self):
+        if self.writer is None:
+            if self.size < self.limit:
+                return
+            await self.attached
+            if self.writer is None:
+                raise ConnectionResetError('connection lost')
+        await self.writer.drain()
+
+    def attach(self, http.HttpResponseWriter writer):
+        for chunk in self.chunks:
+            writer.write(chunk)
+        self.chunks.clear()
+        self.size = 0
+        self.writer = writer
+        if not self.attached.done():
+            self.attached.set_result(None)
+
+    def abort(self):
+        self.chunks.clear()
+        self.size = 0
+        if not self.attached.done():
+            self.attached.set_result(None)
+
+
+class JsonElementsWriter:
+    """Write the rows of a JSON_ELEMENTS query as a response body.
+
+    The body is ``{"data": [rows...]}``.  An error that occurs after
+    some of the rows are sent is appended as the "error" key, so
+    the clients must check for it before using the data.
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+        self._chunk = []
+        self._chunk_size = 0
+        self._started = False
+
+    def write(self, bytes row):
+        if self._started or self._chunk:
+            self._chunk.append(b',')
+        else:
+            self._chunk.append(b'{"data":[')
+        self._chunk.append(row)
+        self._chunk_size += len(row) + 1
 
-        if data is None:
-            raise errors.InternalServerError(
-                f'no data received for a JSON query {query_unit.sql[0]!r}')
-
-        return data
+        if self._chunk_size >= defines.HTTP_PORT_STREAM_CHUNK_SIZE:
+            self.flush()
+            return True
+        else:
+            return False
+
+    async def drain(self):
+        await self._writer.drain()
+
+    def flush(self):
+        if self._chunk:
+            self._started = True
+            self._writer.write(b''.join(self._chunk))
+            self._chunk.clear()
+            self._chunk_size = 0
+
+    def finish(self, error=None):
+        if self._started or self._chunk:
+            if error is None:
+                self._chunk.append(b']}')
+            else:
+                self._chunk.append(b'],"error":' + error + b'}')
+        elif error is None:
+            self._chunk.append(b'{"data":[]}')
+        else:
+            self._chunk.append(b'{"error":' + error + b'}')
+        self.flush()
@@ -56,13 +56,27 @@ class CompiledOperation:
 
 class Compiler(compiler.BaseCompiler):
 
+    _gql_introspection: Optional[Tuple[int, Dict[str, Any]]]
+
+    def __init__(
+        self,
+        connect_args: dict,
+        runstate_dir: Optional[str] = None,
+    ):
+        super().__init__(connect_args, runstate_dir)
+        self._gql_introspection = None
+
     def _wrap_schema(
         self,
         dbver: int,
         schema: s_schema.Schema,
         cached_reflection: immutables.Map[str, Tuple[str, ...]],
     ) -> CompilerDatabaseState:
-        gqlcore = graphql.GQLCoreSchema(schema)
+        introspection = None
+        if (self._gql_introspection is not None
+                and self._gql_introspection[0] == dbver):
+            introspection = self._gql_introspection[1]
+        gqlcore = graphql.GQLCoreSchema(schema, introspection=introspection)
         return CompilerDatabaseState(
             dbver=dbver,
             schema=schema,
@@ -70,6 +84,29 @@ class Compiler(compiler.BaseCompiler):
             gqlcore=gqlcore,
         )
 
+    async def get_graphql_introspection(
+        self,
+        dbver: int,
+    ) -> Dict[str, Any]:
+        db = await self._get_database(dbver)
+        return db.gqlcore.get_introspection()
+
+    async def set_graphql_introspection(
+        self,
+        dbver: int,
+        introspection: Dict[str, Any],
+    ) -> None:
+        # Use the GraphQL schema built by another compiler for
+        # the same dbver instead of building it from scratch.
+        self._gql_introspection = (dbver, introspection)
+        db = self._cached_db
+        if db is not None and db.dbver == dbver:
+            self._cached_db = dataclasses.replace(
+                db,
+                gqlcore=graphql.GQLCoreSchema(
+                    db.schema, introspection=introspection),
+            )
+
     async def compile_graphql(
         self,
         dbver: int,
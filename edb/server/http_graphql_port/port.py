@@ -19,6 +19,10 @@
 
 from __future__ import annotations
 
+import weakref
+
+from edb.server import cache
+from edb.server import defines
 from edb.server import http
 
 from . import compiler
@@ -27,8 +31,36 @@ from . import protocol
 
 class HttpGraphQLPort(http.BaseHttpPort):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Registry of automatic persisted queries: maps the SHA-256
+        # hash of a GraphQL document to its text and cached rewrites.
+        self._persisted_queries = cache.StatementsCache(
+            maxsize=defines.HTTP_PORT_PERSISTED_QUERIES_CACHE_SIZE)
+        # The GraphQL schema introspection for the most recent dbver,
+        # shared between compilers so that only one of them has to
+        # build the GraphQL schema from the EdgeDB schema.
+        self._gql_introspection = None
+        self._compiler_dbvers = weakref.WeakKeyDictionary()
+
+    async def prepare_compiler(self, compiler, dbver):
+        if self._compiler_dbvers.get(compiler) == dbver:
+            return
+
+        shared = self._gql_introspection
+        if shared is not None and shared[0] == dbver:
+            await compiler.call('set_graphql_introspection', *shared)
+        else:
+            introspection = await compiler.call(
+                'get_graphql_introspection', dbver)
+            if dbver == self.get_dbver():
+                self._gql_introspection = (dbver, introspection)
+
+        self._compiler_dbvers[compiler] = dbver
+
     def build_protocol(self):
-        return protocol.Protocol(self._loop, self, self._query_cache)
+        return protocol.Protocol(
+            self._loop, self, self._query_cache, self._persisted_queries)
 
     def get_compiler_worker_cls(self):
         return compiler.Compiler
@@ -25,3 +25,6 @@ cdef class Protocol(http.HttpProtocol):
     cdef:
         object server
         stmt_cache.StatementsCache query_cache
+        stmt_cache.StatementsCache persisted_queries
+
+    cdef _rewrite(self, str query, operation_name)
@@ -18,6 +18,7 @@
 
 
 import cython
+import hashlib
 import json
 import logging
 import urllib.parse
@@ -33,6 +34,8 @@ from edb.server.pgcon import errors as pgerrors
 from edb.common import debug
 from edb.common import markup
 
+from edb.server import defines
+from edb.server.cache cimport stmt_cache
 from edb.server.http import http
 from edb.server.http cimport http
 
@@ -58,12 +61,30 @@ cdef class CacheRedirect:
 CacheEntry = Union[CacheRedirect, compiler.CompiledOperation]
 
 
+@cython.final
+cdef class PersistedQuery:
+    cdef public str query
+    # Rewrite results keyed by operation name; None means that the
+    # query could not be rewritten and has to be compiled as is.
+    # The operation names come from the clients, so the cache is
+    # bounded.
+    cdef public stmt_cache.StatementsCache rewrites
+
+    def __init__(self, query: str):
+        self.query = query
+        self.rewrites = stmt_cache.StatementsCache(
+            maxsize=defines.HTTP_PORT_PERSISTED_QUERY_REWRITES_CACHE_SIZE)
+
+
 cdef class Protocol(http.HttpProtocol):
 
-    def __init__(self, loop, server, query_cache):
-        http.HttpProtocol.__init__(self, loop)
+    def __init__(self, loop, server, query_cache, persisted_queries):
+        http.HttpProtocol.__init__(
+            self, loop, max_concurrency=server.max_pipelined_requests,
+            proto_name=server.get_proto_name())
         self.server = server
         self.query_cache = query_cache
+        self.persisted_queries = persisted_queries
 
     async def handle_request(self, http.HttpRequest request,
                              http.HttpResponse response):
@@ -82,7 +103,9 @@ cdef class Protocol(http.HttpProtocol):
 
         operation_name = None
         variables = None
+        extensions = None
         query = None
+        persisted_hash = None
 
         try:
             if request.method == b'POST':
@@ -94,6 +117,7 @@ cdef class Protocol(http.HttpProtocol):
                     query = body.get('query')
                     operation_name = body.get('operationName')
                     variables = body.get('variables')
+                    extensions = body.get('extensions')
                 elif request.content_type == 'application/graphql':
                     query = request.body.decode('utf-8')
                 else:
@@ -121,10 +145,32 @@ cdef class Protocol(http.HttpProtocol):
                             raise TypeError(
                                 '"variables" must be a JSON object')
 
+                    extensions = qs.get('extensions')
+                    if extensions is not None:
+                        try:
+                            extensions = json.loads(extensions[0])
+                        except Exception:
+                            raise TypeError(
+                                '"extensions" must be a JSON object')
+
             else:
                 raise TypeError('expected a GET or a POST request')
 
-            if not query:
+            if extensions is not None:
+                if not isinstance(extensions, dict):
+                    raise TypeError('"extensions" must be a JSON object')
+                persisted = extensions.get('persistedQuery')
+                if persisted is not None:
+                    if (not isinstance(persisted, dict) or
+                            persisted.get('version') != 1):
+                        raise TypeError(
+                            'unsupported "persistedQuery" version')
+                    persisted_hash = persisted.get('sha256Hash')
+                    if not isinstance(persisted_hash, str):
+                        raise TypeError(
+                            '"persistedQuery.sha256Hash" must be a string')
+
+            if not query and persisted_hash is None:
                 raise TypeError('invalid GraphQL request: query is missing')
 
             if (operation_name is not None and
@@ -146,7 +192,17 @@ cdef class Protocol(http.HttpProtocol):
         response.status = http.HTTPStatus.OK
         response.content_type = b'application/json'
         try:
-            result = await self.execute(query, operation_name, variables)
+            result = await self.execute(
+                query, operation_name, variables, persisted_hash)
+        except gql_errors.GraphQLPersistedQueryNotFound as ex:
+            # This is the response expected by Apollo clients, upon
+            # receiving it they retry the request with the full query.
+            response.body = json.dumps({
+                'errors': [{
+                    'message': str(ex),
+                    'extensions': {'code': 'PERSISTED_QUERY_NOT_FOUND'},
+                }]
+            }).encode()
         except Exception as ex:
             if debug.flags.server:
                 markup.dump(ex)
@@ -180,6 +236,7 @@ cdef class Protocol(http.HttpProtocol):
         ):
         compiler = await self.server.compilers.get()
         try:
+            await self.server.prepare_compiler(compiler, dbver)
             return await compiler.call(
                 'compile_graphql',
                 dbver,
@@ -191,9 +248,40 @@ cdef class Protocol(http.HttpProtocol):
         finally:
             self.server.compilers.put_nowait(compiler)
 
-    async def execute(self, query, operation_name, variables):
+    cdef _rewrite(self, str query, operation_name):
+        try:
+            return _graphql_rewrite.rewrite(operation_name, query)
+        except _graphql_rewrite.QueryError as e:
+            raise errors.QueryError(e.args[0])
+        except Exception as e:
+            if isinstance(e, _USER_ERRORS):
+                logger.info("Error rewriting graphql query: %s", e)
+            else:
+                logger.warning("Error rewriting graphql query: %s", e)
+            return None
+
+    async def execute(self, query, operation_name, variables,
+                      persisted_hash=None):
+        cdef PersistedQuery persisted = None
+
         dbver = self.server.get_dbver()
 
+        if persisted_hash is not None:
+            persisted_hash = persisted_hash.lower()
+            persisted = self.persisted_queries.get(persisted_hash, None)
+            if persisted is None:
+                if not query:
+                    raise gql_errors.GraphQLPersistedQueryNotFound()
+                query_hash = hashlib.sha256(query.encode()).hexdigest()
+                if query_hash != persisted_hash:
+                    raise errors.QueryError(
+                        'provided sha does not match query')
+                persisted = PersistedQuery(query)
+                self.persisted_queries[persisted_hash] = persisted
+                while self.persisted_queries.needs_cleanup():
+                    self.persisted_queries.cleanup_one()
+            query = persisted.query
+
         if variables:
             for var_name in variables:
                 if var_name.startswith('_edb_arg__'):
@@ -205,24 +293,33 @@ cdef class Protocol(http.HttpProtocol):
             print(query)
             print(f'variables: {variables}')
 
-        try:
-            rewritten = _graphql_rewrite.rewrite(operation_name, query)
+        if persisted is not None:
+            # A hit in the persisted query registry skips the
+            # tokenization and rewriting of the query text entirely.
+            try:
+                rewritten = persisted.rewrites[operation_name]
+            except KeyError:
+                rewritten = self._rewrite(query, operation_name)
+                persisted.rewrites[operation_name] = rewritten
+                while persisted.rewrites.needs_cleanup():
+                    persisted.rewrites.cleanup_one()
+        else:
+            rewritten = self._rewrite(query, operation_name)
 
+        if rewritten is not None:
             vars = rewritten.variables().copy()
             if variables:
                 vars.update(variables)
             key_var_names = rewritten.key_vars()
-            # on bad queries the following line can trigger KeyError
-            key_vars = tuple(vars[k] for k in key_var_names)
-        except _graphql_rewrite.QueryError as e:
-            raise errors.QueryError(e.args[0])
-        except Exception as e:
-            if isinstance(e, _USER_ERRORS):
+            try:
+                key_vars = tuple(vars[k] for k in key_var_names)
+            except KeyError as e:
+                # on bad queries the variables might be missing,
+                # let the compiler report a proper error
                 logger.info("Error rewriting graphql query: %s", e)
-            else:
-                logger.warning("Error rewriting graphql query: %s", e)
-            rewritten = None
-            rewrite_error = e
+                rewritten = None
+
+        if rewritten is None:
             prepared_query = query
             vars = variables.copy() if variables else {}
             key_var_names = []
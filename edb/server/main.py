@@ -207,6 +207,7 @@ def _run_server(cluster, args: ServerConfig,
         raise
 
     loop.add_signal_handler(signal.SIGTERM, terminate_server, ss, loop)
+    loop.add_signal_handler(signal.SIGUSR2, ss.toggle_sampling_profiler)
 
     # Notify systemd that we've started up.
     _sd_notify('READY=1')
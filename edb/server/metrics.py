@@ -0,0 +1,352 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Runtime metrics of the server.
+
+Metrics are plain in-process counters, gauges and histograms that are
+cheap enough to be updated on every query.  They are exported in the
+Prometheus text exposition format by the metrics port.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import bisect
+
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    elif value == float('-inf'):
+        return '-Inf'
+    elif value != value:
+        return 'NaN'
+    elif isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    else:
+        return repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\n', '\\n')
+        .replace('"', '\\"')
+    )
+
+
+def _escape_help(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+class BaseMetric:
+
+    _type: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        desc: str,
+        *,
+        labels: Tuple[str, ...] = (),
+    ) -> None:
+        self._name = name
+        self._desc = desc
+        self._labels = labels
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def _check_labels(self, values: Tuple[str, ...]) -> None:
+        if len(values) != len(self._labels):
+            raise ValueError(
+                f'{self._name}: expected {len(self._labels)} label '
+                f'values, got {len(values)}')
+
+    def _format_labels(
+        self,
+        values: Tuple[str, ...],
+        extra: Tuple[Tuple[str, str], ...] = (),
+    ) -> str:
+        pairs = list(zip(self._labels, values))
+        pairs.extend(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(
+            f'{n}="{_escape_label(v)}"' for n, v in pairs
+        ) + '}'
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def generate(self) -> Iterator[str]:
+        yield f'# HELP {self._name} {_escape_help(self._desc)}'
+        yield f'# TYPE {self._name} {self._type}'
+        yield from self._samples()
+
+
+class Counter(BaseMetric):
+    """A value that only ever goes up."""
+
+    _type = 'counter'
+
+    def __init__(
+        self,
+        name: str,
+        desc: str,
+        *,
+        labels: Tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(name, desc, labels=labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not labels:
+            self._values[()] = 0
+
+    def inc(self, value: float = 1, *labels: str) -> None:
+        if value < 0:
+            raise ValueError(f'{self._name}: counters cannot decrease')
+        try:
+            self._values[labels] += value
+        except KeyError:
+            self._check_labels(labels)
+            self._values[labels] = value
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> Iterator[str]:
+        for labels, value in self._values.items():
+            yield (
+                f'{self._name}{self._format_labels(labels)} '
+                f'{_format_value(value)}'
+            )
+
+
+class Gauge(Counter):
+    """A value that can go up and down."""
+
+    _type = 'gauge'
+
+    def inc(self, value: float = 1, *labels: str) -> None:
+        try:
+            self._values[labels] += value
+        except KeyError:
+            self._check_labels(labels)
+            self._values[labels] = value
+
+    def dec(self, value: float = 1, *labels: str) -> None:
+        self.inc(-value, *labels)
+
+    def set(self, value: float, *labels: str) -> None:
+        if labels not in self._values:
+            self._check_labels(labels)
+        self._values[labels] = value
+
+
+class Histogram(BaseMetric):
+    """A distribution of observed values, such as durations."""
+
+    _type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        desc: str,
+        *,
+        labels: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, desc, labels=labels)
+        self._buckets = tuple(sorted(buckets))
+        # For every set of label values: the (non-cumulative) number
+        # of observations per bucket, followed by the number of
+        # observations above the last bucket, and the sum of all
+        # observed values.
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        if not labels:
+            self._values[()] = self._new_row()
+
+    def _new_row(self) -> List[float]:
+        return [0] * (len(self._buckets) + 2)
+
+    def observe(self, value: float, *labels: str) -> None:
+        try:
+            row = self._values[labels]
+        except KeyError:
+            self._check_labels(labels)
+            row = self._values[labels] = self._new_row()
+
+        row[bisect.bisect_left(self._buckets, value)] += 1
+        row[-1] += value
+
+    def get_count(self, *labels: str) -> int:
+        row = self._values.get(labels)
+        if row is None:
+            return 0
+        return int(sum(row[:-1]))
+
+    def _samples(self) -> Iterator[str]:
+        for labels, row in self._values.items():
+            total = 0
+            for le, count in zip(self._buckets + (float('inf'),), row):
+                total += count
+                lbl = self._format_labels(labels, (('le', _format_value(le)),))
+                yield f'{self._name}_bucket{lbl} {_format_value(total)}'
+
+            lbl = self._format_labels(labels)
+            yield f'{self._name}_sum{lbl} {_format_value(row[-1])}'
+            yield f'{self._name}_count{lbl} {_format_value(total)}'
+
+
+class Registry:
+    """A set of metrics exported together."""
+
+    def __init__(self, *, prefix: str = '') -> None:
+        self._prefix = prefix
+        self._metrics: Dict[str, BaseMetric] = {}
+
+    def _add(self, metric: BaseMetric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f'duplicate metric {metric.name!r}')
+        self._metrics[metric.name] = metric
+
+    def new_counter(
+        self,
+        name: str,
+        desc: str,
+        *,
+        labels: Tuple[str, ...] = (),
+    ) -> Counter:
+        metric = Counter(f'{self._prefix}{name}', desc, labels=labels)
+        self._add(metric)
+        return metric
+
+    def new_gauge(
+        self,
+        name: str,
+        desc: str,
+        *,
+        labels: Tuple[str, ...] = (),
+    ) -> Gauge:
+        metric = Gauge(f'{self._prefix}{name}', desc, labels=labels)
+        self._add(metric)
+        return metric
+
+    def new_histogram(
+        self,
+        name: str,
+        desc: str,
+        *,
+        labels: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(
+            f'{self._prefix}{name}', desc, labels=labels, buckets=buckets)
+        self._add(metric)
+        return metric
+
+    def generate(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.generate())
+        lines.append('')
+        return '\n'.join(lines)
+
+
+registry = Registry(prefix='edgedb_server_')
+
+
+client_connections_current = registry.new_gauge(
+    'client_connections_current',
+    'Current number of authenticated client connections.',
+)
+
+client_connections_total = registry.new_counter(
+    'client_connections_total',
+    'Total number of authenticated client connections.',
+)
+
+backend_connections_current = registry.new_gauge(
+    'backend_connections_current',
+    'Current number of connections to the backend.',
+)
+
+backend_connections_total = registry.new_counter(
+    'backend_connections_total',
+    'Total number of connections established to the backend.',
+)
+
+compiler_processes_spawned_total = registry.new_counter(
+    'compiler_processes_spawned_total',
+    'Total number of compiler worker processes spawned.',
+)
+
+compiler_processes_killed_total = registry.new_counter(
+    'compiler_processes_killed_total',
+    'Total number of compiler worker processes stopped.',
+)
+
+query_compilation_duration = registry.new_histogram(
+    'query_compilation_duration_seconds',
+    'Time it takes to compile a query.',
+)
+
+query_compilation_phase_duration = registry.new_histogram(
+    'query_compilation_phase_duration_seconds',
+    'Time it takes to run a phase of query compilation.',
+    labels=('phase',),
+)
+
+query_execution_duration = registry.new_histogram(
+    'query_execution_duration_seconds',
+    'Time it takes to execute a compiled query.',
+)
+
+compiled_query_cache_hits_total = registry.new_counter(
+    'compiled_query_cache_hits_total',
+    'Number of queries served from the compiled query cache.',
+)
+
+compiled_query_cache_misses_total = registry.new_counter(
+    'compiled_query_cache_misses_total',
+    'Number of queries that had to be compiled.',
+)
+
+result_cache_hits_total = registry.new_counter(
+    'result_cache_hits_total',
+    'Number of query results served from the result cache.',
+)
+
+result_cache_misses_total = registry.new_counter(
+    'result_cache_misses_total',
+    'Number of cacheable query results that had to be computed.',
+)
+
+http_request_duration = registry.new_histogram(
+    'http_request_duration_seconds',
+    'Time it takes to handle a request to an HTTP port.',
+    labels=('protocol',),
+)
@@ -0,0 +1,95 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+
+from edb.common import taskgroup
+
+from edb.server import baseport
+from edb.server import defines
+
+from . import protocol
+
+
+class MetricsPort(baseport.Port):
+    """An HTTP port exporting the server metrics.
+
+    The metrics are served at ``/metrics`` in the Prometheus text
+    format.  The *database* and *user* of the port configuration are
+    not used, as the port never accesses the backend.
+    """
+
+    def __init__(self, nethost: str, netport: int,
+                 database: str,
+                 user: str,
+                 concurrency: int,
+                 protocol: str,
+                 **kwargs):
+
+        super().__init__(**kwargs)
+
+        if protocol != self.get_proto_name():
+            raise RuntimeError(f'unknown protocol {protocol!r}')
+        if concurrency <= 0 or concurrency > defines.HTTP_PORT_MAX_CONCURRENCY:
+            raise RuntimeError(
+                f'concurrency must be greater than 0 and '
+                f'less than {defines.HTTP_PORT_MAX_CONCURRENCY}')
+
+        self._nethost = nethost
+        self._netport = netport
+
+        self.database = database
+        self.user = user
+        self.concurrency = concurrency
+
+        self._servers = []
+
+    @property
+    def max_pipelined_requests(self):
+        return min(self.concurrency, defines.HTTP_PORT_MAX_PIPELINED_REQUESTS)
+
+    @classmethod
+    def get_proto_name(cls):
+        return 'metrics+http'
+
+    def get_compiler_worker_cls(self):
+        return None
+
+    def build_protocol(self):
+        return protocol.Protocol(self._loop, self)
+
+    async def start(self):
+        await super().start()
+
+        nethost = await self._fix_localhost(self._nethost, self._netport)
+        srv = await self._loop.create_server(
+            self.build_protocol,
+            host=nethost, port=self._netport)
+
+        self._servers.append(srv)
+
+    async def stop(self):
+        try:
+            async with taskgroup.TaskGroup() as g:
+                for srv in self._servers:
+                    srv.close()
+                    g.create_task(srv.wait_closed())
+                self._servers.clear()
+        finally:
+            await super().stop()
@@ -32,6 +32,7 @@ DEF DUMP_HEADER_BLOCK_TYPE_DATA = b'D'
 DEF DUMP_HEADER_SERVER_TIME = 102
 DEF DUMP_HEADER_SERVER_VER = 103
 DEF DUMP_HEADER_BLOCKS_INFO = 104
+DEF DUMP_HEADER_LOAD_TYPE = 105
 
 DEF DUMP_HEADER_BLOCK_ID = 110
 DEF DUMP_HEADER_BLOCK_NUM = 111
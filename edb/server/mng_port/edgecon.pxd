@@ -56,6 +56,7 @@ cdef class CompiledQuery:
     cdef public object first_extra  # Optional[int]
     cdef public int extra_count
     cdef public bytes extra_blob
+    cdef public dbview.QueryStats stats
 
 
 @cython.final
@@ -87,6 +88,14 @@ cdef class EdgeConnection:
         CompiledQuery _last_anon_compiled
         WriteBuffer _write_buf
 
+        object _cursor_query_unit
+        object _cursor_txid
+
+        object _result_capture
+        ssize_t _result_capture_size
+
+        bint _query_timed_out
+
         bint debug
         bint query_cache_enabled
 
@@ -103,6 +112,8 @@ cdef class EdgeConnection:
     cdef char render_cardinality(self, query_unit) except -1
 
     cdef write(self, WriteBuffer buf)
+    cdef _capture_result(self, WriteBuffer buf)
+    cdef write_cached_result(self, bytes data)
     cdef flush(self)
     cdef abort(self)
     cdef close(self)
@@ -116,13 +127,22 @@ cdef class EdgeConnection:
 
     cdef WriteBuffer make_describe_msg(self, CompiledQuery query)
     cdef WriteBuffer make_command_complete_msg(self, query_unit)
+    cdef WriteBuffer make_portal_suspended_msg(self)
 
     cdef inline reject_headers(self)
     cdef dict parse_headers(self)
     cdef write_headers(self, WriteBuffer buf, dict headers)
 
     cdef write_log(self, EdgeSeverity severity, uint32_t code, str message)
+    cdef tuple _parse_restore_block(self)
 
     cdef get_backend(self)
 
+    cdef _start_query_timer(self)
+    cdef _stop_query_timer(self, timer)
+    cdef bint _is_query_timeout(self, exc)
+    cdef _record_compile_profile(self, bytes eql, list units)
+    cdef _start_idle_timer(self)
+
     cdef uint64_t _parse_implicit_limit(self, bytes v) except <uint64_t>-1
+    cdef int32_t _parse_fetch_size(self, bytes v) except -1
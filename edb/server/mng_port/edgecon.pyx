@@ -58,10 +58,14 @@ from edb.server import config
 
 from edb.server import buildmeta
 from edb.server import compiler
+from edb.server import defines
+from edb.server import metrics
 from edb.server.compiler import errormech
+from edb.server.compiler import explain
 from edb.server.pgcon cimport pgcon
 from edb.server.pgcon import errors as pgerror
 
+from edb.pgsql.common import quote_literal as pg_ql
 from edb.schema import objects as s_obj
 
 from edb import errors
@@ -78,6 +82,7 @@ include "./consts.pxi"
 DEF FLUSH_BUFFER_AFTER = 100_000
 cdef bytes ZERO_UUID = b'\x00' * 16
 cdef bytes EMPTY_TUPLE_UUID = s_obj.get_known_type_id('empty-tuple').bytes
+cdef bytes JSON_TYPE_ID = s_obj.get_known_type_id('std::json').bytes
 
 cdef object CAP_ALL = compiler.Capability.ALL
 
@@ -95,6 +100,11 @@ cdef tuple DUMP_VER_MAX = (0, 8)
 cdef object logger = logging.getLogger('edb.server')
 
 DEF QUERY_OPT_IMPLICIT_LIMIT = 0xFF01
+DEF EXECUTE_OPT_FETCH_SIZE = 0xFF02
+
+# Name of the Postgres portal backing the (single) open cursor
+# of a connection.
+cdef bytes CURSOR_PORTAL = b'__edgedb_cursor__'
 
 @cython.final
 cdef class CompiledQuery:
@@ -102,12 +112,14 @@ cdef class CompiledQuery:
     def __init__(self, object query_unit,
         first_extra: Optional[int]=None,
         int extra_count=0,
-        bytes extra_blob=None
+        bytes extra_blob=None,
+        dbview.QueryStats stats=None,
     ):
         self.query_unit = query_unit
         self.first_extra = first_extra
         self.extra_count = extra_count
         self.extra_blob = extra_blob
+        self.stats = stats
 
 
 @cython.final
@@ -138,6 +150,14 @@ cdef class EdgeConnection:
 
         self._write_buf = None
 
+        self._cursor_query_unit = None
+        self._cursor_txid = None
+
+        self._result_capture = None
+        self._result_capture_size = 0
+
+        self._query_timed_out = False
+
         self.debug = debug.flags.server_proto
         self.query_cache_enabled = not (debug.flags.disable_qcache or
                                         debug.flags.edgeql_compile)
@@ -153,6 +173,14 @@ cdef class EdgeConnection:
             return
         self.dbview.on_remote_ddl(dbver)
 
+    def on_backend_notice(self, message):
+        # Progress of online DDL, see BackfillColumn.
+        self.write_log(
+            EdgeSeverity.EDGE_SEVERITY_NOTICE,
+            errors.LogMessage.get_code(),
+            message)
+        self.flush()
+
     cdef get_backend(self):
         if self._con_status is EDGECON_BAD:
             # `self.sync()` is called from `recover_from_error`;
@@ -169,6 +197,96 @@ cdef class EdgeConnection:
 
         raise RuntimeError('requesting backend before it is initialized')
 
+    cdef _start_query_timer(self):
+        self._query_timed_out = False
+        timeout = self.dbview.lookup_config('query_execution_timeout')
+        if timeout <= 0:
+            return None
+        return self.loop.call_later(timeout / 1000, self._on_query_timeout)
+
+    cdef _stop_query_timer(self, timer):
+        if timer is not None:
+            timer.cancel()
+
+    cdef bint _is_query_timeout(self, exc):
+        if (not self._query_timed_out or
+                not isinstance(exc, pgerror.BackendError)):
+            return False
+        code = errormech.PGErrorCode.QueryCanceledError
+        return exc.fields.get('C') == code.value
+
+    cdef _record_compile_profile(self, bytes eql, list units):
+        total = 0
+        phases = {}
+        ast_nodes = ir_nodes = 0
+        for query_unit in units:
+            profile = query_unit.compile_profile
+            if profile is None:
+                continue
+            total += profile.total
+            ast_nodes += profile.ast_nodes
+            ir_nodes += profile.ir_nodes
+            for phase, elapsed in profile.phases.items():
+                metrics.query_compilation_phase_duration.observe(
+                    elapsed, phase)
+                phases[phase] = phases.get(phase, 0) + elapsed
+
+        threshold = self.dbview.lookup_config('slow_compile_log_threshold')
+        if threshold <= 0 or total * 1000 <= threshold:
+            return
+
+        breakdown = ', '.join(
+            f'{phase}: {elapsed * 1000:.2f}ms'
+            for phase, elapsed in phases.items())
+        logger.warning(
+            'slow query compilation: %.2fms (%s; %d AST nodes, '
+            '%d IR nodes): %s',
+            total * 1000, breakdown, ast_nodes, ir_nodes,
+            eql.decode('utf-8', errors='replace'))
+
+    def _on_query_timeout(self):
+        self._query_timed_out = True
+        if self._backend is not None:
+            self.loop.create_task(self._cancel_backend_query())
+
+    async def _cancel_backend_query(self):
+        backend = self._backend
+        if backend is None:
+            return
+        try:
+            await backend.pgcon.cancel_current_query()
+        except Exception as ex:
+            self.loop.call_exception_handler({
+                'message': (
+                    'unhandled error in edgedb protocol while '
+                    'cancelling a query'
+                ),
+                'exception': ex,
+                'protocol': self,
+                'transport': self._transport,
+            })
+
+    cdef _start_idle_timer(self):
+        if not self.dbview.in_tx():
+            return None
+        timeout = self.dbview.lookup_config('idle_transaction_timeout')
+        if timeout <= 0:
+            return None
+        return self.loop.call_later(
+            timeout / 1000, self._on_idle_transaction_timeout)
+
+    def _on_idle_transaction_timeout(self):
+        self.loop.create_task(self._terminate_idle_transaction())
+
+    async def _terminate_idle_transaction(self):
+        if self._transport is None:
+            return
+        # Postgres rolls the transaction back once the backend
+        # connection is closed along with this one.
+        await self.write_error(errors.IdleTransactionTimeoutError(
+            'terminating connection due to idle_transaction_timeout'))
+        self.close()
+
     def debug_print(self, *args):
         print(
             '::EDGEPROTO::',
@@ -180,6 +298,9 @@ cdef class EdgeConnection:
 
     cdef write(self, WriteBuffer buf):
         # One rule for this method: don't write partial messages.
+        if self._result_capture is not None:
+            self._capture_result(buf)
+
         if self._write_buf is not None:
             self._write_buf.write_buffer(buf)
             if self._write_buf.len() >= FLUSH_BUFFER_AFTER:
@@ -187,6 +308,14 @@ cdef class EdgeConnection:
         else:
             self._write_buf = buf
 
+    cdef _capture_result(self, WriteBuffer buf):
+        self._result_capture_size += buf.len()
+        if self._result_capture_size > defines._MAX_CACHED_RESULT_SIZE:
+            # Too large to be worth caching.
+            self._result_capture = None
+        else:
+            self._result_capture.append(bytes(buf))
+
     cdef abort(self):
         self._con_status = EDGECON_BAD
         if self._transport is not None:
@@ -703,10 +832,12 @@ cdef class EdgeConnection:
 
         eql_tokens = tokenize(eql)
         units = await self._compile(eql_tokens, stmt_mode=stmt_mode)
+        self._record_compile_profile(eql, units)
 
         new_type_ids = frozenset()
         for query_unit in units:
             self.dbview.start(query_unit)
+            timer = self._start_query_timer()
             try:
                 if query_unit.system_config:
                     await self._execute_system_config(query_unit)
@@ -725,7 +856,8 @@ cdef class EdgeConnection:
                             query_unit.config_ops)
             except ConnectionAbortedError:
                 raise
-            except Exception:
+            except Exception as ex:
+                self._stop_query_timer(timer)
                 self.dbview.on_error(query_unit)
                 if (not self.get_backend().pgcon.in_tx() and
                         self.dbview.in_tx()):
@@ -734,8 +866,13 @@ cdef class EdgeConnection:
                     # that (until a better solution is found.)
                     self.dbview.abort_tx()
                     await self.recover_current_tx_info()
+                if self._is_query_timeout(ex):
+                    raise errors.QueryTimeoutError(
+                        'canceling query due to query_execution_timeout'
+                    ) from ex
                 raise
             else:
+                self._stop_query_timer(timer)
                 if self.dbview.on_success(query_unit):
                     await self.get_backend().pgcon.signal_ddl(
                         self.dbview.dbver
@@ -774,6 +911,8 @@ cdef class EdgeConnection:
             self.debug_print('Extra variables', normalized.variables(),
                              'after', normalized.first_extra())
 
+        stats = self.dbview.get_query_stats(normalized.key())
+
         query_unit = self.dbview.lookup_compiled_query(
             normalized.key(), io_format, expect_one, implicit_limit)
         cached = True
@@ -791,6 +930,7 @@ cdef class EdgeConnection:
                     # ROLLBACK in that 'eql' string.
                     self.dbview.raise_in_tx_error()
             else:
+                started_at = time.monotonic()
                 query_unit = await self._compile(
                     normalized.tokens(),
                     io_format=io_format,
@@ -799,7 +939,12 @@ cdef class EdgeConnection:
                     implicit_limit=implicit_limit,
                     first_extracted_var=normalized.first_extra(),
                 )
+                self._record_compile_profile(eql, query_unit)
                 query_unit = query_unit[0]
+                elapsed = time.monotonic() - started_at
+                stats.record_compile(elapsed)
+                metrics.query_compilation_duration.observe(elapsed)
+                metrics.compiled_query_cache_misses_total.inc()
         elif self.dbview.in_tx_error():
             # We have a cached QueryUnit for this 'eql', but the current
             # transaction is aborted.  We can only complete this Parse
@@ -807,16 +952,27 @@ cdef class EdgeConnection:
             # 'ROLLBACK TO SAVEPOINT' command.
             if not (query_unit.tx_rollback or query_unit.tx_savepoint_rollback):
                 self.dbview.raise_in_tx_error()
-
-        await self.get_backend().pgcon.parse_execute(
-            1,           # =parse
-            0,           # =execute
-            query_unit,  # =query
-            self,        # =edgecon
-            None,        # =bind_data
-            0,           # =send_sync
-            0,           # =use_prep_stmt
-        )
+        else:
+            stats.record_cache_hit()
+            metrics.compiled_query_cache_hits_total.inc()
+
+        if query_unit.query_stats:
+            # The statistics must be synced before the query is parsed,
+            # as syncing them discards the unnamed prepared statement.
+            await self._sync_query_stats()
+
+        if query_unit.is_transactional:
+            # Non-transactional units are not prepared, they are
+            # executed as simple queries, see _execute().
+            await self.get_backend().pgcon.parse_execute(
+                1,           # =parse
+                0,           # =execute
+                query_unit,  # =query
+                self,        # =edgecon
+                None,        # =bind_data
+                0,           # =send_sync
+                0,           # =use_prep_stmt
+            )
 
         if not cached and query_unit.cacheable:
             self.dbview.cache_compiled_query(
@@ -828,6 +984,22 @@ cdef class EdgeConnection:
             first_extra=normalized.first_extra(),
             extra_count=normalized.extra_count(),
             extra_blob=normalized.extra_blob(),
+            stats=stats,
+        )
+
+    async def _sync_query_stats(self):
+        # sys::QueryStats reads the statistics from the connection
+        # state table, see edgedb._read_query_stats().
+        data = self.dbview.query_stats_to_json()
+        await self.get_backend().pgcon.simple_query(
+            f'''
+                INSERT INTO _edgecon_state(name, value, type)
+                VALUES ('query_stats', {pg_ql(data)}, 'R')
+                ON CONFLICT (name, type) DO
+                UPDATE
+                    SET value = {pg_ql(data)};
+            '''.encode(),
+            ignore_data=True,
         )
 
     cdef parse_cardinality(self, bytes card):
@@ -911,6 +1083,21 @@ cdef class EdgeConnection:
 
         return implicit_limit
 
+    cdef int32_t _parse_fetch_size(self, bytes v) except -1:
+        try:
+            size = int(v.decode())
+        except ValueError:
+            raise errors.BinaryProtocolError(
+                f'invalid fetch size: {v!r}'
+            )
+
+        if size <= 0 or size > 0x7FFFFFFF:
+            raise errors.BinaryProtocolError(
+                f'fetch size out of range: {size}'
+            )
+
+        return <int32_t>size
+
     async def parse(self):
         cdef:
             object io_format
@@ -989,6 +1176,14 @@ cdef class EdgeConnection:
         msg.write_len_prefixed_bytes(query_unit.status)
         return msg.end_message()
 
+    cdef WriteBuffer make_portal_suspended_msg(self):
+        cdef:
+            WriteBuffer msg
+
+        msg = WriteBuffer.new_message(b's')
+        msg.write_int16(0)  # no headers
+        return msg.end_message()
+
     async def describe(self):
         cdef:
             char rtype
@@ -1041,8 +1236,27 @@ cdef class EdgeConnection:
                 'server restart is required for the configuration '
                 'change to take effect')
 
+    async def _execute_explain(self, query_unit, WriteBuffer bind_data):
+        cdef WriteBuffer msg
+
+        plan = await self.get_backend().pgcon.explain(
+            query_unit.sql[0], bind_data)
+        data = explain.annotate_plan(plan, query_unit.explain_map)
+
+        if query_unit.out_type_id == JSON_TYPE_ID:
+            # The binary format of std::json is prefixed with
+            # the format version.
+            data = b'\x01' + data
+
+        msg = WriteBuffer.new_message(b'D')
+        msg.write_int16(1)
+        msg.write_int32(len(data))
+        msg.write_bytes(data)
+        self.write(msg.end_message())
+
     async def _execute(self, compiled: CompiledQuery, bind_args,
-                       bint parse, bint use_prep_stmt):
+                       bint parse, bint use_prep_stmt,
+                       int32_t fetch_size=0):
         query_unit = compiled.query_unit
         if self.dbview.in_tx_error():
             if not (query_unit.tx_savepoint_rollback or query_unit.tx_rollback):
@@ -1061,21 +1275,74 @@ cdef class EdgeConnection:
             return
 
 
+        if fetch_size:
+            # Results are fetched incrementally from a named portal,
+            # which only survives until the end of the transaction.
+            if not self.dbview.in_tx():
+                raise errors.TransactionError(
+                    'cursors can only be used inside a transaction')
+            if (query_unit.cardinality is CARD_NO_RESULT or
+                    query_unit.system_config or
+                    query_unit.explain_map is not None or
+                    len(query_unit.sql) != 1):
+                raise errors.QueryError(
+                    'cannot open a cursor for this command')
+
         process_sync = False
         if self.buffer.take_message_type(b'S'):
             # A "Sync" message follows this "Execute" message;
             # send it right away.
             process_sync = True
 
+        result_key = None
+        cached_result = None
+        if (query_unit.cacheable_result and process_sync and
+                not self.dbview.in_tx()):
+            # The result depends only on the schema, so it can be
+            # served from the cache until the next DDL.
+            result_key = (query_unit.sql_hash, bind_args)
+            cached_result = self.dbview.lookup_cached_result(result_key)
+
+        suspended = False
         try:
             bound_args_buf = self.recode_bind_args(bind_args, compiled)
 
             self.dbview.start(query_unit)
+            timer = self._start_query_timer()
+            started_at = time.monotonic()
+            rows = 0
             try:
+                if parse and query_unit.query_stats:
+                    await self._sync_query_stats()
+
                 if query_unit.system_config:
                     await self._execute_system_config(query_unit)
+                elif query_unit.explain_map is not None:
+                    await self._execute_explain(query_unit, bound_args_buf)
+                    rows = 1
+                elif not query_unit.is_transactional:
+                    # The statements of a non-transactional unit (such
+                    # as online DDL) must not run in the implicit
+                    # transaction of an extended query, so they are
+                    # sent as separate simple queries, as in
+                    # simple_query().
+                    if not process_sync:
+                        await self.get_backend().pgcon.sync()
+                    for sql in query_unit.sql:
+                        await self.get_backend().pgcon.simple_query(
+                            sql, ignore_data=True)
+                elif cached_result is not None:
+                    self.write_cached_result(cached_result[0])
+                    rows = cached_result[1]
+                    if compiled.stats is not None:
+                        compiled.stats.record_result_cache_hit()
+                elif result_key is not None:
+                    await self._execute_and_cache_result(
+                        parse, query_unit, bound_args_buf,
+                        use_prep_stmt, result_key)
+                    rows = self.get_backend().pgcon.last_row_count
                 else:
-                    await self.get_backend().pgcon.parse_execute(
+                    suspended = await self.get_backend().pgcon.parse_execute(
                         parse,              # =parse
                         1,                  # =execute
                         query_unit,         # =query
@@ -1083,14 +1350,18 @@ cdef class EdgeConnection:
                         bound_args_buf,     # =bind_data
                         process_sync,       # =send_sync
                         use_prep_stmt,      # =use_prep_stmt
+                        CURSOR_PORTAL if fetch_size else b'',  # =portal
+                        fetch_size,         # =max_rows
                     )
+                    rows = self.get_backend().pgcon.last_row_count
                     if query_unit.config_ops:
                         await self.dbview.apply_config_ops(
                             self.get_backend().pgcon,
                             query_unit.config_ops)
             except ConnectionAbortedError:
                 raise
-            except Exception:
+            except Exception as ex:
+                self._stop_query_timer(timer)
                 self.dbview.on_error(query_unit)
 
                 if not process_sync and self.dbview.in_tx():
@@ -1109,14 +1380,33 @@ cdef class EdgeConnection:
                     # that (until a better solution is found.)
                     self.dbview.abort_tx()
                     await self.recover_current_tx_info()
+                if self._is_query_timeout(ex):
+                    raise errors.QueryTimeoutError(
+                        'canceling query due to query_execution_timeout'
+                    ) from ex
                 raise
             else:
+                self._stop_query_timer(timer)
+                elapsed = time.monotonic() - started_at
+                metrics.query_execution_duration.observe(elapsed)
+                if compiled.stats is not None:
+                    compiled.stats.record_execute(elapsed, rows)
                 if self.dbview.on_success(query_unit):
                     await self.get_backend().pgcon.signal_ddl(
                         self.dbview.dbver
                     )
 
-            self.write(self.make_command_complete_msg(query_unit))
+            if fetch_size:
+                # Opening a cursor replaces the previously opened one.
+                self._cursor_query_unit = None
+                self._cursor_txid = None
+
+            if suspended:
+                self._cursor_query_unit = query_unit
+                self._cursor_txid = self.dbview.txid
+                self.write(self.make_portal_suspended_msg())
+            else:
+                self.write(self.make_command_complete_msg(query_unit))
 
             if process_sync:
                 self.write(self.pgcon_last_sync_status())
@@ -1132,6 +1422,40 @@ cdef class EdgeConnection:
             if query_unit.new_types and self.dbview.in_tx():
                 await self._update_type_ids(query_unit.new_types)
 
+    async def _execute_and_cache_result(self, bint parse, query_unit,
+                                        WriteBuffer bound_args_buf,
+                                        bint use_prep_stmt, result_key):
+        dbver = self.dbview.dbver
+
+        self._result_capture = []
+        self._result_capture_size = 0
+        try:
+            await self.get_backend().pgcon.parse_execute(
+                parse,              # =parse
+                1,                  # =execute
+                query_unit,         # =query
+                self,               # =edgecon
+                bound_args_buf,     # =bind_data
+                True,               # =send_sync
+                use_prep_stmt,      # =use_prep_stmt
+            )
+            captured = self._result_capture
+        finally:
+            self._result_capture = None
+
+        if captured is not None:
+            self.dbview.cache_result(
+                result_key, dbver, b''.join(captured),
+                self.get_backend().pgcon.last_row_count)
+
+    cdef write_cached_result(self, bytes data):
+        cdef WriteBuffer buf
+
+        if data:
+            buf = WriteBuffer.new()
+            buf.write_bytes(data)
+            self.write(buf)
+
     async def _get_backend_tids(self, tids):
         conn = self.get_backend().pgcon
         server = self.port.get_server()
@@ -1174,8 +1498,18 @@ cdef class EdgeConnection:
         cdef:
             WriteBuffer bound_args_buf
             bint process_sync
+            int32_t fetch_size = 0
+
+        headers = self.parse_headers()
+        if headers:
+            for k, v in headers.items():
+                if k == EXECUTE_OPT_FETCH_SIZE:
+                    fetch_size = self._parse_fetch_size(v)
+                else:
+                    raise errors.BinaryProtocolError(
+                        f'unexpected message header: {k}'
+                    )
 
-        self.reject_headers()
         stmt_name = self.buffer.read_len_prefixed_bytes()
         bind_args = self.buffer.read_len_prefixed_bytes()
         self.buffer.finish_message()
@@ -1194,7 +1528,79 @@ cdef class EdgeConnection:
 
             compiled = self._last_anon_compiled
 
-        await self._execute(compiled, bind_args, False, False)
+        await self._execute(compiled, bind_args, False, False, fetch_size)
+
+    async def fetch(self):
+        cdef:
+            int32_t max_rows
+            bint process_sync
+
+        self.reject_headers()
+        max_rows = self.buffer.read_int32()
+        self.buffer.finish_message()
+
+        if self.debug:
+            self.debug_print('FETCH', max_rows)
+
+        if max_rows <= 0:
+            raise errors.BinaryProtocolError(
+                f'fetch size must be greater than zero, got {max_rows}')
+
+        query_unit = self._cursor_query_unit
+        if (query_unit is None or not self.dbview.in_tx() or
+                self.dbview.txid != self._cursor_txid):
+            self._cursor_query_unit = None
+            self._cursor_txid = None
+            raise errors.BinaryProtocolError('there is no open cursor')
+
+        if self.dbview.in_tx_error():
+            self.dbview.raise_in_tx_error()
+
+        process_sync = False
+        if self.buffer.take_message_type(b'S'):
+            # A "Sync" message follows this "Fetch" message;
+            # send it right away.
+            process_sync = True
+
+        try:
+            timer = self._start_query_timer()
+            try:
+                suspended = await self.get_backend().pgcon.fetch_portal(
+                    CURSOR_PORTAL, max_rows, self, process_sync)
+            except ConnectionAbortedError:
+                raise
+            except Exception as ex:
+                self._stop_query_timer(timer)
+                self._cursor_query_unit = None
+                self._cursor_txid = None
+                self.dbview.on_error(query_unit)
+                if not process_sync:
+                    await self.get_backend().pgcon.sync()
+                if self._is_query_timeout(ex):
+                    raise errors.QueryTimeoutError(
+                        'canceling query due to query_execution_timeout'
+                    ) from ex
+                raise
+            else:
+                self._stop_query_timer(timer)
+
+            if suspended:
+                self.write(self.make_portal_suspended_msg())
+            else:
+                self._cursor_query_unit = None
+                self._cursor_txid = None
+                self.write(self.make_command_complete_msg(query_unit))
+
+            if process_sync:
+                self.write(self.pgcon_last_sync_status())
+                self.flush()
+        except Exception:
+            if process_sync:
+                self.buffer.put_message()
+            raise
+        else:
+            if process_sync:
+                self.buffer.finish_message()
 
     async def optimistic_execute(self):
         cdef:
@@ -1242,11 +1648,15 @@ cdef class EdgeConnection:
             self._last_anon_compiled = compiled
             query_unit = compiled.query_unit
         else:
+            stats = self.dbview.get_query_stats(normalized.key())
+            stats.record_cache_hit()
+            metrics.compiled_query_cache_hits_total.inc()
             compiled = CompiledQuery(
                 query_unit=query_unit,
                 first_extra=normalized.first_extra(),
                 extra_count=normalized.extra_count(),
                 extra_blob=normalized.extra_blob(),
+                stats=stats,
             )
 
         if (query_unit.in_type_id != in_tid or
@@ -1325,7 +1735,12 @@ cdef class EdgeConnection:
         try:
             while True:
                 if not self.buffer.take_message():
-                    await self.wait_for_message()
+                    idle_timer = self._start_idle_timer()
+                    try:
+                        await self.wait_for_message()
+                    finally:
+                        if idle_timer is not None:
+                            idle_timer.cancel()
                 mtype = self.buffer.get_message_type()
 
                 flush_sync_on_error = False
@@ -1343,6 +1758,9 @@ cdef class EdgeConnection:
                     elif mtype == b'O':
                         await self.optimistic_execute()
 
+                    elif mtype == b'F':
+                        await self.fetch()
+
                     elif mtype == b'Q':
                         flush_sync_on_error = True
                         await self.simple_query()
@@ -1869,11 +2287,15 @@ cdef class EdgeConnection:
 
         # Now parse the embedded dump header message:
 
-        # Ignore headers
+        # Ignore headers, except for the load type, which turns
+        # the restore into a bulk load of the data of one type.
+        load_type = None
         headers_num = self.buffer.read_int16()
         for _ in range(headers_num):
-            self.buffer.read_int16()
-            self.buffer.read_len_prefixed_bytes()
+            header = self.buffer.read_int16()
+            value = self.buffer.read_len_prefixed_bytes()
+            if header == DUMP_HEADER_LOAD_TYPE:
+                load_type = value.decode('utf-8')
 
         proto_major = self.buffer.read_int16()
         proto_minor = self.buffer.read_int16()
@@ -1906,6 +2328,14 @@ cdef class EdgeConnection:
                 self.buffer.read_bytes(16)
 
         self.buffer.finish_message()
+
+        if load_type is not None:
+            if schema_ddl or schema_ids:
+                raise errors.ProtocolError(
+                    'bulk load must not contain schema DDL')
+            await self._bulk_load(load_type, blocks)
+            return
+
         dbname = self.dbview.dbname
         pgcon = await self.port.new_pgcon(dbname)
 
@@ -1976,30 +2406,7 @@ cdef class EdgeConnection:
                 mtype = self.buffer.get_message_type()
 
                 if mtype == b'=':
-                    block_type = None
-                    block_id = None
-                    block_num = None
-                    block_data = None
-
-                    num_headers = self.buffer.read_int16()
-                    for _ in range(num_headers):
-                        header = self.buffer.read_int16()
-                        if header == DUMP_HEADER_BLOCK_TYPE:
-                            block_type = self.buffer.read_len_prefixed_bytes()
-                        elif header == DUMP_HEADER_BLOCK_ID:
-                            block_id = self.buffer.read_len_prefixed_bytes()
-                            block_id = pg_UUID(block_id)
-                        elif header == DUMP_HEADER_BLOCK_NUM:
-                            block_num = self.buffer.read_len_prefixed_bytes()
-                        elif header == DUMP_HEADER_BLOCK_DATA:
-                            block_data = self.buffer.read_len_prefixed_bytes()
-
-                    self.buffer.finish_message()
-
-                    if (block_type is None or block_id is None
-                            or block_num is None or block_data is None):
-                        raise errors.ProtocolError('incomplete data block')
-
+                    block_id, block_data = self._parse_restore_block()
                     await pgcon.restore(
                         restore_blocks[block_id], block_data)
 
@@ -2023,3 +2430,99 @@ cdef class EdgeConnection:
         msg.write_len_prefixed_bytes(b'RESTORE')
         self.write(msg.end_message())
         self.flush()
+
+    cdef tuple _parse_restore_block(self):
+        block_type = None
+        block_id = None
+        block_num = None
+        block_data = None
+
+        num_headers = self.buffer.read_int16()
+        for _ in range(num_headers):
+            header = self.buffer.read_int16()
+            if header == DUMP_HEADER_BLOCK_TYPE:
+                block_type = self.buffer.read_len_prefixed_bytes()
+            elif header == DUMP_HEADER_BLOCK_ID:
+                block_id = self.buffer.read_len_prefixed_bytes()
+                block_id = pg_UUID(block_id)
+            elif header == DUMP_HEADER_BLOCK_NUM:
+                block_num = self.buffer.read_len_prefixed_bytes()
+            elif header == DUMP_HEADER_BLOCK_DATA:
+                block_data = self.buffer.read_len_prefixed_bytes()
+
+        self.buffer.finish_message()
+
+        if (block_type is None or block_id is None
+                or block_num is None or block_data is None):
+            raise errors.ProtocolError('incomplete data block')
+
+        return block_id, block_data
+
+    async def _bulk_load(self, str type_name, list blocks):
+        cdef:
+            WriteBuffer msg
+            char mtype
+
+        pgcon = await self.port.new_pgcon(self.dbview.dbname)
+
+        try:
+            load = await self.get_backend().compiler.call(
+                'describe_bulk_load',
+                self.dbview.dbver,
+                type_name,
+                blocks,
+            )
+
+            copy_stmts = {
+                pg_UUID(b.block_id.bytes): b.sql_copy_stmt
+                for b in load.blocks
+            }
+
+            await pgcon.simple_query(
+                b'START TRANSACTION;' + load.setup_sql,
+                True
+            )
+
+            # Send "RestoreReadyMessage"
+            msg = WriteBuffer.new_message(b'+')
+            msg.write_int16(0)  # no headers
+            msg.write_int16(1)  # -j1
+            self.write(msg.end_message())
+            self.flush()
+
+            while True:
+                if not self.buffer.take_message():
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                if mtype == b'=':
+                    block_id, block_data = self._parse_restore_block()
+                    try:
+                        copy_stmt = copy_stmts[block_id]
+                    except KeyError:
+                        raise errors.ProtocolError(
+                            f'unknown data block {block_id}') from None
+                    await pgcon.copy_from_stdin(copy_stmt, block_data)
+
+                elif mtype == b'.':
+                    self.buffer.finish_message()
+                    break
+
+                else:
+                    self.fallthrough()
+
+            # All checks run on the staged data as a whole once
+            # everything is copied in.
+            await pgcon.simple_query(
+                load.finalize_sql + b'COMMIT;',
+                True
+            )
+
+        finally:
+            pgcon.terminate()
+
+        msg = WriteBuffer.new_message(b'C')
+        msg.write_int16(0)  # no headers
+        msg.write_len_prefixed_bytes(b'LOAD')
+        self.write(msg.end_message())
+        self.flush()
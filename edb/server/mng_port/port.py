@@ -30,6 +30,7 @@ import weakref
 from edb.common import taskgroup
 from edb.server import baseport
 from edb.server import compiler
+from edb.server import metrics
 
 from . import edgecon
 
@@ -52,6 +53,14 @@ class Backend:
         return self._compiler
 
     async def close(self):
+        if not self._pgcon.is_idle():
+            # The client is gone, but Postgres would keep working
+            # on its last query until the result is ready; ask it
+            # to stop before terminating the connection.
+            try:
+                await self._pgcon.cancel_current_query()
+            except Exception:
+                logger.exception('could not cancel a running query')
         self._pgcon.terminate()
         await self._compiler.close()
 
@@ -114,9 +123,12 @@ class ManagementPort(baseport.Port):
 
     def on_client_authed(self):
         self._num_connections += 1
+        metrics.client_connections_current.inc()
+        metrics.client_connections_total.inc()
 
     def on_client_disconnected(self):
         self._num_connections -= 1
+        metrics.client_connections_current.dec()
         if not self._num_connections and self._auto_shutdown:
             self._accepting = False
             raise SystemExit
@@ -38,7 +38,8 @@ from edb.server.http cimport http
 cdef class Protocol(http.HttpProtocol):
 
     def __init__(self, loop, server, query_cache):
-        http.HttpProtocol.__init__(self, loop)
+        http.HttpProtocol.__init__(
+            self, loop, proto_name=server.get_proto_name())
         self.server = server
         self.query_cache = query_cache
 
@@ -85,6 +85,9 @@ cdef class PGProto:
         object edgecon_ref
 
         bint idle
+        uint64_t command_serial
+
+        readonly int64_t last_row_count
 
     cdef before_command(self)
     cdef after_command(self)
@@ -99,6 +102,8 @@ cdef class PGProto:
     cdef fallthrough_idle(self)
 
     cdef before_prepare(self, stmt_name, dbver, WriteBuffer outbuf)
+    cdef _read_json_row(self, sql)
 
     cdef make_clean_stmt_message(self, bytes stmt_name)
+    cdef make_close_portal_message(self, bytes portal_name)
     cdef make_auth_password_md5_message(self, bytes salt)
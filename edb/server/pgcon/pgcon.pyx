@@ -52,6 +52,7 @@ from edb.server.pgproto.pgproto cimport (
 from edb.server import buildmeta
 from edb.server import compiler
 from edb.server import defines
+from edb.server import metrics
 from edb.server.cache cimport stmt_cache
 from edb.server.mng_port cimport edgecon
 
@@ -72,6 +73,15 @@ cdef object CARD_NO_RESULT = compiler.ResultCardinality.NO_RESULT
 cdef bytes INIT_CON_SCRIPT = None
 
 
+cdef inline int64_t _parse_row_count(bytes tag):
+    # The tag of CommandComplete is the command name followed by
+    # the number of rows, e.g. "SELECT 10".
+    try:
+        return int(tag.rpartition(b' ')[2])
+    except ValueError:
+        return 0
+
+
 def _build_init_con_script() -> bytes:
     return (f'''
         CREATE TEMPORARY TABLE _edgecon_state (
@@ -176,6 +186,7 @@ cdef class PGProto:
         self.edgecon_ref = None
 
         self.idle = True
+        self.command_serial = 0
 
     def debug_print(self, *args):
         print(
@@ -217,6 +228,46 @@ cdef class PGProto:
             self.msg_waiter.set_exception(ConnectionAbortedError())
             self.msg_waiter = None
 
+    def is_idle(self):
+        return self.idle
+
+    async def cancel_current_query(self):
+        # Postgres can only be asked to cancel whatever the backend is
+        # currently running via a CancelRequest sent over a separate
+        # connection.  Remember which command we are cancelling, so that
+        # a request that arrives late does not hit the next command.
+        cdef:
+            uint64_t serial = self.command_serial
+
+        if self.idle or self.backend_pid < 0:
+            return
+
+        host = self.pgaddr.get('host')
+        port = self.pgaddr.get('port')
+
+        if host.startswith('/'):
+            addr = os.path.join(host, f'.s.PGSQL.{port}')
+            reader, writer = await asyncio.open_unix_connection(addr)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+
+        try:
+            if self.idle or self.command_serial != serial:
+                return
+
+            buf = WriteBuffer.new()
+            buf.write_int32(16)
+            buf.write_int32(80877102)  # CancelRequest code
+            buf.write_int32(self.backend_pid)
+            buf.write_int32(self.backend_secret)
+            writer.write(bytes(buf))
+
+            # The server closes the connection once the request
+            # has been processed.
+            await reader.read()
+        finally:
+            writer.close()
+
     async def signal_ddl(self, dbver):
         query = f"""
             SELECT pg_notify('__edgedb_ddl__', {pg_ql(dbver.hex())})
@@ -289,6 +340,7 @@ cdef class PGProto:
         use_prep_stmt,
         args,
         WriteBuffer out,
+        object writer=None,
     ):
         cdef:
             WriteBuffer parse_buf
@@ -298,6 +350,7 @@ cdef class PGProto:
             ssize_t size
             bint parse = 1
             bint store_stmt = 0
+            bint drain = 0
 
         buf = WriteBuffer.new()
 
@@ -355,7 +408,17 @@ cdef class PGProto:
             try:
                 if mtype == b'D':
                     # DataRow
-                    self.buffer.redirect_messages(out, b'D', 0)
+                    if writer is None:
+                        self.buffer.redirect_messages(out, b'D', 0)
+                    elif error is not None:
+                        # The writer has failed, the rest of the
+                        # result is read only to get to the sync.
+                        self.buffer.discard_message()
+                    else:
+                        try:
+                            drain = writer.write(self._read_json_row(sql))
+                        except Exception as ex:
+                            error = ex
 
                 elif mtype == b'E':
                     # ErrorResponse
@@ -386,11 +449,43 @@ cdef class PGProto:
             finally:
                 self.buffer.finish_message()
 
+            if drain:
+                drain = 0
+                try:
+                    await self._drain_writer(writer)
+                except Exception as ex:
+                    error = ex
+
         if error is not None:
             raise error
 
         return data
 
+    cdef _read_json_row(self, sql):
+        ncol = self.buffer.read_int16()
+        if ncol != 1:
+            raise RuntimeError(
+                f'received more than column in DataRow '
+                f'for a JSON query {sql!r}')
+
+        coll = self.buffer.read_int32()
+        if coll == -1:
+            raise RuntimeError(
+                f'received NULL for a JSON query {sql!r}')
+
+        return self.buffer.read_bytes(coll)
+
+    async def _drain_writer(self, writer):
+        # Stop reading from the backend while the writer is congested,
+        # so that the pending rows stay in the backend socket instead
+        # of the server memory.
+        self.transport.pause_reading()
+        try:
+            await writer.drain()
+        finally:
+            if self.transport is not None:
+                self.transport.resume_reading()
+
     async def _parse_execute_json(
         self,
         sql,
@@ -463,6 +558,37 @@ cdef class PGProto:
         finally:
             self.after_command()
 
+    async def parse_execute_json_stream(
+        self,
+        sql,
+        sql_hash,
+        dbver,
+        use_prep_stmt,
+        args,
+        writer,
+    ):
+        """Execute a JSON_ELEMENTS query passing its rows to *writer*.
+
+        ``writer.write(row)`` is called for every row of the result and
+        returns True when ``writer.drain()`` must be awaited before more
+        rows are written.  If the writer fails, the rest of the result
+        is discarded and the error is raised once the connection is
+        synced.
+        """
+        self.before_command()
+        try:
+            await self._parse_execute_to_buf(
+                sql,
+                sql_hash,
+                dbver,
+                use_prep_stmt,
+                args,
+                None,
+                writer,
+            )
+        finally:
+            self.after_command()
+
     async def parse_execute_notebook(
         self,
         sql,
@@ -496,6 +622,8 @@ cdef class PGProto:
         WriteBuffer bind_data,
         bint send_sync,
         bint use_prep_stmt,
+        bytes portal=b'',
+        int32_t max_rows=0,
     ):
         cdef:
             WriteBuffer packet
@@ -513,6 +641,12 @@ cdef class PGProto:
         if not parse and not execute:
             raise RuntimeError('invalid parse/execute call')
 
+        if portal and msgs_num > 1:
+            raise errors.InternalServerError(
+                'cannot execute more than one SQL query in a named portal')
+
+        self.last_row_count = 0
+
         packet = WriteBuffer.new()
 
         if use_prep_stmt:
@@ -570,15 +704,21 @@ cdef class PGProto:
                     packet.write_buffer(buf.end_message())
 
             else:
+                if portal:
+                    # A named portal lives until the end of the
+                    # transaction, close the previous one, if any.
+                    packet.write_buffer(
+                        self.make_close_portal_message(portal))
+
                 buf = WriteBuffer.new_message(b'B')
-                buf.write_bytestring(b'')  # portal name
+                buf.write_bytestring(portal)  # portal name
                 buf.write_bytestring(stmt_name)  # statement name
                 buf.write_buffer(bind_data)
                 packet.write_buffer(buf.end_message())
 
                 buf = WriteBuffer.new_message(b'E')
-                buf.write_bytestring(b'')  # portal name
-                buf.write_int32(0)  # limit: 0 - return all rows
+                buf.write_bytestring(portal)  # portal name
+                buf.write_int32(max_rows)  # limit: 0 - return all rows
                 packet.write_buffer(buf.end_message())
 
         if send_sync:
@@ -614,6 +754,8 @@ cdef class PGProto:
 
                     elif mtype == b'C' and execute:  ## result
                         # CommandComplete
+                        self.last_row_count += _parse_row_count(
+                            self.buffer.read_null_str())
                         self.buffer.discard_message()
                         if buf is not None:
                             edgecon.write(buf)
@@ -643,7 +785,10 @@ cdef class PGProto:
                     elif mtype == b's' and execute:  ## result
                         # PortalSuspended
                         self.buffer.discard_message()
-                        return
+                        if buf is not None:
+                            edgecon.write(buf)
+                            buf = None
+                        return True
 
                     elif mtype == b'2' and execute:
                         # BindComplete
@@ -676,7 +821,11 @@ cdef class PGProto:
         WriteBuffer bind_data,
         bint send_sync,
         bint use_prep_stmt,
+        bytes portal=b'',
+        int32_t max_rows=0,
     ):
+        # Returns True if the execution was suspended because *max_rows*
+        # rows were returned and *portal* can be fetched from further.
         self.before_command()
         try:
             return await self._parse_execute(
@@ -687,10 +836,171 @@ cdef class PGProto:
                 bind_data,
                 send_sync,
                 use_prep_stmt,
+                portal,
+                max_rows,
             )
         finally:
             self.after_command()
 
+    async def _explain(self, bytes sql, WriteBuffer bind_data):
+        cdef:
+            WriteBuffer packet
+            WriteBuffer buf
+
+        packet = WriteBuffer.new()
+
+        buf = WriteBuffer.new_message(b'P')
+        buf.write_bytestring(b'')  # statement name
+        buf.write_bytestring(sql)
+        buf.write_int16(0)
+        packet.write_buffer(buf.end_message())
+
+        buf = WriteBuffer.new_message(b'B')
+        buf.write_bytestring(b'')  # portal name
+        buf.write_bytestring(b'')  # statement name
+        buf.write_buffer(bind_data)
+        packet.write_buffer(buf.end_message())
+
+        buf = WriteBuffer.new_message(b'E')
+        buf.write_bytestring(b'')  # portal name
+        buf.write_int32(0)  # limit: 0 - return all rows
+        packet.write_buffer(buf.end_message())
+
+        packet.write_bytes(SYNC_MESSAGE)
+        self.write(packet)
+
+        error = None
+        plan = None
+        self.waiting_for_sync = True
+        while True:
+            if not self.buffer.take_message():
+                await self.wait_for_message()
+            mtype = self.buffer.get_message_type()
+
+            try:
+                if mtype == b'D':
+                    # DataRow
+                    plan = self._read_json_row(sql)
+
+                elif mtype == b'E':
+                    # ErrorResponse
+                    fields = self.parse_error_message()
+                    error = pgerror.BackendError(fields=fields)
+
+                elif mtype in {b'1', b'2', b'C', b'n', b'I'}:
+                    # ParseComplete
+                    # BindComplete
+                    # CommandComplete
+                    # NoData
+                    # EmptyQueryResponse
+                    self.buffer.discard_message()
+
+                elif mtype == b'Z':
+                    # ReadyForQuery
+                    self.parse_sync_message()
+                    break
+
+                else:
+                    self.fallthrough()
+
+            finally:
+                self.buffer.finish_message()
+
+        if error is not None:
+            raise error
+
+        return plan
+
+    async def explain(self, bytes sql, WriteBuffer bind_data):
+        # Returns the JSON-encoded plan of an EXPLAIN (FORMAT JSON)
+        # statement executed with the given arguments.
+        self.before_command()
+        try:
+            return await self._explain(sql, bind_data)
+        finally:
+            self.after_command()
+
+    async def _fetch_portal(
+        self,
+        bytes portal,
+        int32_t max_rows,
+        edgecon.EdgeConnection edgecon,
+        bint send_sync,
+    ):
+        cdef:
+            WriteBuffer packet
+            WriteBuffer buf
+
+        packet = WriteBuffer.new()
+
+        buf = WriteBuffer.new_message(b'E')
+        buf.write_bytestring(portal)  # portal name
+        buf.write_int32(max_rows)
+        packet.write_buffer(buf.end_message())
+
+        if send_sync:
+            packet.write_bytes(SYNC_MESSAGE)
+            self.waiting_for_sync = True
+        else:
+            packet.write_bytes(FLUSH_MESSAGE)
+        self.write(packet)
+
+        try:
+            buf = None
+            while True:
+                if not self.buffer.take_message():
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                try:
+                    if mtype == b'D':
+                        # DataRow
+                        if buf is None:
+                            buf = WriteBuffer.new()
+
+                        self.buffer.redirect_messages(buf, b'D', 0)
+                        if buf.len() >= DATA_BUFFER_SIZE:
+                            edgecon.write(buf)
+                            buf = None
+
+                    elif mtype == b'C' or mtype == b's':
+                        # CommandComplete or PortalSuspended
+                        self.buffer.discard_message()
+                        if buf is not None:
+                            edgecon.write(buf)
+                            buf = None
+                        return mtype == b's'
+
+                    elif mtype == b'E':
+                        # ErrorResponse
+                        er = self.parse_error_message()
+                        raise pgerror.BackendError(fields=er)
+
+                    else:
+                        self.fallthrough()
+
+                finally:
+                    self.buffer.finish_message()
+        finally:
+            if send_sync:
+                await self.wait_for_sync()
+
+    async def fetch_portal(
+        self,
+        bytes portal,
+        int32_t max_rows,
+        edgecon.EdgeConnection edgecon,
+        bint send_sync,
+    ):
+        # Fetch up to *max_rows* more rows from a portal suspended by
+        # parse_execute(); returns True if there are more rows to fetch.
+        self.before_command()
+        try:
+            return await self._fetch_portal(
+                portal, max_rows, edgecon, send_sync)
+        finally:
+            self.after_command()
+
     async def _simple_query(self, bytes sql, bint ignore_data):
         cdef:
             WriteBuffer packet
@@ -946,6 +1256,65 @@ cdef class PGProto:
         finally:
             self.after_command()
 
+    async def _copy_from_stdin(self, sql, bytes data):
+        cdef:
+            WriteBuffer qbuf
+            WriteBuffer buf
+
+        qbuf = WriteBuffer.new_message(b'Q')
+        qbuf.write_bytestring(sql)
+        qbuf.end_message()
+
+        self.write(qbuf)
+        self.waiting_for_sync = True
+
+        er = None
+        while True:
+            if not self.buffer.take_message():
+                await self.wait_for_message()
+            mtype = self.buffer.get_message_type()
+
+            if mtype == b'G':
+                # CopyInResponse
+                self.buffer.discard_message()
+
+                # The data is sent as is, in a single CopyData message,
+                # followed by CopyDone.
+                buf = WriteBuffer.new()
+                buf.write_byte(b'd')
+                buf.write_int32(len(data) + 4)
+                buf.write_bytes(data)
+                self.write(buf)
+
+                qbuf = WriteBuffer.new_message(b'c')
+                qbuf.end_message()
+                self.write(qbuf)
+
+            elif mtype == b'C':
+                # CommandComplete
+                self.buffer.discard_message()
+
+            elif mtype == b'E':
+                er = self.parse_error_message()
+
+            elif mtype == b'Z':
+                self.parse_sync_message()
+                break
+
+            else:
+                self.fallthrough()
+
+        if er:
+            raise pgerror.BackendError(fields=er)
+
+    async def copy_from_stdin(self, sql, bytes data):
+        """Run a COPY ... FROM STDIN statement feeding it *data*."""
+        self.before_command()
+        try:
+            await self._copy_from_stdin(sql, data)
+        finally:
+            self.after_command()
+
     async def connect(self):
         cdef:
             WriteBuffer outbuf
@@ -1046,6 +1415,7 @@ cdef class PGProto:
 
         assert self.idle
         self.idle = False
+        self.command_serial += 1
 
     cdef after_command(self):
         assert not self.idle
@@ -1099,7 +1469,14 @@ cdef class PGProto:
 
         elif mtype == b'N':
             # NoticeResponse
-            self.buffer.discard_message()
+            fields = self.parse_error_message()
+
+            if fields.get('H') == defines.EDGEDB_DDL_PROGRESS_HINT:
+                if self.edgecon_ref is not None:
+                    edgecon = self.edgecon_ref()
+                    if edgecon is not None:
+                        edgecon.on_backend_notice(fields.get('M'))
+
             return True
 
         return False
@@ -1157,6 +1534,13 @@ cdef class PGProto:
         buf.write_bytestring(stmt_name)
         return buf.end_message()
 
+    cdef make_close_portal_message(self, bytes portal_name):
+        cdef WriteBuffer buf
+        buf = WriteBuffer.new_message(b'C')
+        buf.write_byte(b'P')
+        buf.write_bytestring(portal_name)
+        return buf.end_message()
+
     cdef make_auth_password_md5_message(self, bytes salt):
         cdef WriteBuffer msg
 
@@ -1185,12 +1569,16 @@ cdef class PGProto:
         self.transport = transport
         self.connected_fut.set_result(True)
         self.connected_fut = None
+        metrics.backend_connections_current.inc()
+        metrics.backend_connections_total.inc()
 
     def connection_lost(self, exc):
         if self.connected_fut is not None and not self.connected_fut.done():
             self.connected_fut.set_exception(ConnectionAbortedError())
             return
 
+        metrics.backend_connections_current.dec()
+
         if self.msg_waiter is not None and not self.msg_waiter.done():
             self.msg_waiter.set_exception(ConnectionAbortedError())
             self.msg_waiter = None
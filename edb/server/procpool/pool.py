@@ -24,13 +24,16 @@ import base64
 import collections
 import os.path
 import pickle
+import signal
 import subprocess
 import sys
 import time
 
 from edb.common import debug
+from edb.common import sampler
 from edb.common import supervisor
 from edb.common import taskgroup
+from edb.server import metrics
 
 from . import amsg
 
@@ -73,6 +76,7 @@ class Worker:
 
     async def _spawn(self):
         self._manager._stats_spawned += 1
+        metrics.compiler_processes_spawned_total.inc()
 
         if self._proc is not None:
             self._manager._sup.create_task(self._kill_proc(self._proc))
@@ -82,6 +86,12 @@ class Worker:
         if debug.flags.server:
             env = {'EDGEDB_DEBUG_SERVER': '1', **_ENV}
 
+        # Workers spawned while the server is sampled are sampled
+        # for the rest of the duration.
+        sampler_env = sampler.get_inherited_env()
+        if sampler_env:
+            env = {**env, **sampler_env}
+
         self._proc = await asyncio.create_subprocess_exec(
             *self._command_args,
             env=env,
@@ -129,6 +139,7 @@ class Worker:
             return
         self._closed = True
         self._manager._stats_killed += 1
+        metrics.compiler_processes_killed_total.inc()
         self._manager._workers.discard(self)
         try:
             self._proc.terminate()
@@ -179,6 +190,21 @@ class Manager:
     def iter_workers(self):
         return iter(frozenset(self._workers))
 
+    def set_sampling(self, enabled):
+        """Start or stop the sampling profiler of all worker processes."""
+        self._signal_workers(signal.SIGUSR2 if enabled else signal.SIGUSR1)
+
+    def _signal_workers(self, signum):
+        for worker in (*self._workers, *self._workers_pool):
+            # Workers that are not connected yet may not have their
+            # signal handlers installed.
+            if worker._con is None or worker._con.is_closed():
+                continue
+            try:
+                worker._proc.send_signal(signum)
+            except ProcessLookupError:
+                pass
+
     def is_running(self):
         return self._running
 
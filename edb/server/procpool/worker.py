@@ -33,6 +33,7 @@ import uvloop
 from edb.common import debug
 from edb.common import devmode
 from edb.common import markup
+from edb.common import sampler
 
 from . import amsg
 
@@ -47,6 +48,9 @@ def load_class(cls_name):
 async def worker(cls, cls_args, sockname):
     loop = asyncio.get_running_loop()
     loop.add_signal_handler(signal.SIGTERM, on_terminate_worker)
+    loop.add_signal_handler(signal.SIGUSR2, sampler.start)
+    loop.add_signal_handler(signal.SIGUSR1, sampler.stop)
+    sampler.inherit()
 
     con = await amsg.worker_connect(sockname)
     try:
@@ -25,6 +25,7 @@ import logging
 
 from edb import errors
 
+from edb.common import sampler
 from edb.common import taskgroup
 
 from edb.edgeql import parser as ql_parser
@@ -33,6 +34,7 @@ from edb.server import config
 from edb.server import defines
 from edb.server import http_edgeql_port
 from edb.server import http_graphql_port
+from edb.server import metrics_port
 from edb.server import notebook_port
 from edb.server import mng_port
 from edb.server import pgcon
@@ -180,6 +182,8 @@ class Server:
             port_cls = http_edgeql_port.HttpEdgeQLPort
         elif portconf.protocol == 'notebook':
             port_cls = notebook_port.NotebookPort
+        elif portconf.protocol == 'metrics+http':
+            port_cls = metrics_port.MetricsPort
         else:
             raise errors.InvalidReferenceError(
                 f'unknown protocol {portconf.protocol!r}')
@@ -316,6 +320,19 @@ class Server:
             g.create_task(self._mgmt_port.stop())
             self._mgmt_port = None
 
+    def toggle_sampling_profiler(self):
+        """Toggle the sampling profiler of the server and its compilers."""
+        # The compilers are told the new state rather than toggled,
+        # as they may not be in the same state as the server.
+        sampler.toggle()
+        enabled = sampler.is_running()
+
+        ports = [self._mgmt_port, *self._ports,
+                 *self._sys_conf_ports.values()]
+        for port in ports:
+            if port is not None:
+                port.set_compiler_workers_sampling(enabled)
+
     async def get_auth_method(self, user, conn):
         authlist = self._sys_auth
 
@@ -131,7 +131,9 @@ class EdgeQLTestCase(BaseHttpTest, server.QueryTestCase):
                 f'{self.http_addr}/?{urllib.parse.urlencode(req_data)}')
             resp_data = json.loads(response.read())
 
-        if 'data' in resp_data:
+        # Errors that occur while the result is streamed are reported
+        # after the data that was already sent.
+        if 'error' not in resp_data:
             return resp_data['data']
 
         err = resp_data['error']
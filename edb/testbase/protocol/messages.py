@@ -118,6 +118,20 @@ class UInt32(Scalar):
         buffer.write_ui32(val)
 
 
+class Int32(Scalar):
+
+    cname = 'int32'
+
+    def validate(self, val: typing.Any) -> bool:
+        return isinstance(val, int) and (-2 ** 31 <= val <= 2 ** 31 - 1)
+
+    def parse(self, buffer: binwrapper.BinWrapper) -> any:
+        return buffer.read_i32()
+
+    def dump(self, val: int, buffer: binwrapper.BinWrapper) -> None:
+        buffer.write_i32(val)
+
+
 class Bytes(Scalar):
 
     cname = 'bytes'
@@ -541,6 +555,13 @@ class CommandComplete(ServerMessage):
     status = String('Command status.')
 
 
+class PortalSuspended(ServerMessage):
+
+    mtype = MessageType('s')
+    message_length = MessageLength
+    headers = Headers
+
+
 class Cardinality(enum.Enum):
     NO_RESULT = 0x6e
     ONE = 0x6f
@@ -763,6 +784,14 @@ class Execute(ClientMessage):
     arguments = Bytes('Encoded argument data.')
 
 
+class Fetch(ClientMessage):
+
+    mtype = MessageType('F')
+    message_length = MessageLength
+    headers = Headers
+    max_rows = Int32('Maximum number of rows to fetch, must be positive.')
+
+
 class Restore(ClientMessage):
 
     mtype = MessageType('<')
@@ -0,0 +1,370 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import *
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import click
+import immutables
+
+from edb import _edgeql_rust
+from edb import graphql
+from edb.edgeql import parser as qlparser
+from edb.schema import ddl as s_ddl
+from edb.schema import reflection as s_refl
+from edb.schema import schema as s_schema
+from edb.server import compiler as edbcompiler
+from edb.testbase import lang as tb_lang
+from edb.tools.edb import edbcommands
+
+from . import reflection
+from . import schemas
+
+
+BENCH_MODULE = 'bench'
+
+BENCHMARKS = ('compile', 'delta', 'introspect', 'graphql')
+
+
+def load_schema(sdl: str) -> s_schema.Schema:
+    std_schema = tb_lang._load_std_schema()
+    target = qlparser.parse_sdl(f'module {BENCH_MODULE} {{ {sdl} }}')
+    return s_ddl.apply_sdl(
+        [(BENCH_MODULE, target.declarations[0].declarations)],
+        target_schema=std_schema,
+        current_schema=std_schema,
+    )
+
+
+def _timeit(func: Callable[[], Any], repeat: int) -> Tuple[Any, List[float]]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started_at)
+    return result, timings
+
+
+def bench_compile(
+    schema: s_schema.Schema,
+    queries: List[str],
+    repeat: int,
+) -> List[float]:
+    """Time Compiler.compile_eql_tokens() on every one of *queries*."""
+
+    compiler = tb_lang.new_compiler()
+    dbver = b'bench'
+    # The compiler would otherwise introspect the schema from
+    # the database the first time it sees this dbver.
+    compiler._cached_db = compiler._wrap_schema(
+        dbver, schema, immutables.Map())
+
+    modaliases = immutables.Map({None: BENCH_MODULE})
+    tokens = [_edgeql_rust.tokenize(q) for q in queries]
+
+    async def _compile_all():
+        for query_tokens in tokens:
+            await compiler.compile_eql_tokens(
+                dbver,
+                query_tokens,
+                modaliases,
+                None,
+                edbcompiler.IoFormat.BINARY,
+                False,
+                0,
+                edbcompiler.CompileStatementMode.SINGLE,
+                edbcompiler.Capability.ALL,
+            )
+
+    loop = asyncio.new_event_loop()
+    try:
+        _, timings = _timeit(
+            lambda: loop.run_until_complete(_compile_all()), repeat)
+    finally:
+        loop.close()
+
+    return timings
+
+
+def bench_delta(
+    old_schema: s_schema.Schema,
+    new_schema: s_schema.Schema,
+    repeat: int,
+) -> List[float]:
+    """Time s_ddl.delta_schemas() between two schemas."""
+
+    diff, timings = _timeit(
+        lambda: s_ddl.delta_schemas(old_schema, new_schema),
+        repeat,
+    )
+
+    ncommands = len(list(diff.get_subcommands()))
+    click.echo(f'Top-level delta commands: {ncommands}')
+    return timings
+
+
+def bench_introspect(
+    schema: s_schema.Schema,
+    repeat: int,
+) -> List[float]:
+    """Time s_refl.parse_into() on the introspection data of a schema."""
+
+    std_schema = tb_lang._load_std_schema()
+    _, layout = tb_lang._load_reflection_schema()
+    data = reflection.encode_schema(
+        schema, base_schema=std_schema, schema_class_layout=layout)
+    click.echo(f'Introspected objects: {len(data)}')
+
+    _, timings = _timeit(
+        lambda: s_refl.parse_into(
+            schema=std_schema,
+            data=data,
+            schema_class_layout=layout,
+        ),
+        repeat,
+    )
+    return timings
+
+
+def bench_graphql(
+    schema: s_schema.Schema,
+    queries: List[str],
+    repeat: int,
+) -> List[float]:
+    """Time the translation of *queries* from GraphQL into EdgeQL."""
+
+    gqlcore = graphql.GQLCoreSchema(schema)
+    # Build the GraphQL types outside of the timed runs.
+    gqlcore.graphql_schema
+
+    def _translate_all():
+        for query in queries:
+            graphql.translate_ast(
+                gqlcore,
+                graphql.parse_text(query),
+                substitutions=None,
+            )
+
+    _, timings = _timeit(_translate_all, repeat)
+    return timings
+
+
+def _summarize(timings: List[float]) -> Dict[str, Any]:
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'runs': timings,
+    }
+
+
+def _compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """Print the change of medians and return the regressed benchmarks."""
+
+    regressed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            click.echo(f'{name}: not in the baseline')
+            continue
+
+        change = result['median'] / base['median'] - 1
+        line = (
+            f'{name}: median {result["median"]:.3f}s, '
+            f'baseline {base["median"]:.3f}s ({change:+.1%})'
+        )
+        if change > threshold:
+            regressed.append(name)
+            click.secho(line, fg='red')
+        else:
+            click.echo(line)
+
+    return regressed
+
+
+def _mismatched_params(
+    params: Dict[str, Any],
+    baseline_params: Dict[str, Any],
+) -> List[str]:
+    """Return the parameters that differ from those of the baseline.
+
+    The number of timed runs does not affect the medians and is not
+    compared.
+    """
+    return [
+        f'--{name} {value} (baseline {baseline_params.get(name)})'
+        for name, value in params.items()
+        if name != 'repeat' and baseline_params.get(name) != value
+    ]
+
+
+@edbcommands.command()
+@click.option('-b', '--benchmark', 'benchmarks', multiple=True,
+              type=click.Choice(BENCHMARKS),
+              help='benchmark to run, can be specified multiple times '
+                   '(all benchmarks are run by default)')
+@click.option('--types', type=int, default=500, show_default=True,
+              help='number of object types in the synthetic schema')
+@click.option('--properties', type=int, default=10, show_default=True,
+              help='number of properties of every object type')
+@click.option('--depth', type=int, default=5, show_default=True,
+              help='length of the inheritance chains of abstract types')
+@click.option('--computables', type=int, default=3, show_default=True,
+              help='number of computable properties of every object type')
+@click.option('--aliases', type=int, default=50, show_default=True,
+              help='number of aliases in the synthetic schema')
+@click.option('--queries', type=int, default=20, show_default=True,
+              help='number of queries of every kind to compile')
+@click.option('--renamed', type=float, default=0.1, show_default=True,
+              help='fraction of types and properties to rename')
+@click.option('--altered', type=float, default=0.05, show_default=True,
+              help='fraction of properties to alter')
+@click.option('-n', '--repeat', type=int, default=3, show_default=True,
+              help='number of timed runs')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False),
+              help='write the results as JSON into this file')
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False),
+              help='compare the results with a file written by --json')
+@click.option('--threshold', type=float, default=0.1, show_default=True,
+              help='relative increase of a median over the baseline '
+                   'reported as a regression')
+def bench(*, benchmarks, types, properties, depth, computables, aliases,
+          queries, renamed, altered, repeat, json_path, baseline,
+          threshold):
+    """Benchmark the compiler on a large synthetic schema.
+
+    Times the compilation of EdgeQL queries, schema diffing, parsing
+    of the schema introspection data and GraphQL translation.  Exits
+    with a non-zero status if --baseline is given and any benchmark
+    is slower than in the baseline by more than --threshold.
+    """
+    if repeat < 1:
+        click.secho(
+            'Error: --repeat must be a positive non-zero number.', fg='red')
+        sys.exit(1)
+
+    if types < 1:
+        click.secho(
+            'Error: --types must be a positive non-zero number.', fg='red')
+        sys.exit(1)
+
+    if depth < 1:
+        click.secho(
+            'Error: --depth must be a positive non-zero number.', fg='red')
+        sys.exit(1)
+
+    if not benchmarks:
+        benchmarks = BENCHMARKS
+
+    params = dict(
+        types=types, properties=properties, depth=depth,
+        computables=computables, aliases=aliases,
+    )
+
+    click.echo('Building synthetic schemas...')
+    schema = load_schema(schemas.make_schema_sdl(**params))
+
+    nobjects = len(list(
+        schema.get_objects(included_modules=[BENCH_MODULE])))
+    click.echo(f'Schema objects in {BENCH_MODULE!r}: {nobjects}')
+
+    results = {}
+    for name in BENCHMARKS:
+        if name not in benchmarks:
+            continue
+
+        click.echo(f'Running {name}...')
+
+        if name == 'compile':
+            timings = bench_compile(
+                schema,
+                schemas.make_queries(**params, count=queries),
+                repeat,
+            )
+        elif name == 'delta':
+            new_schema = load_schema(schemas.make_schema_sdl(
+                **params, renamed=renamed, altered=altered))
+            timings = bench_delta(schema, new_schema, repeat)
+        elif name == 'introspect':
+            timings = bench_introspect(schema, repeat)
+        elif name == 'graphql':
+            timings = bench_graphql(
+                schema,
+                schemas.make_graphql_queries(
+                    module=BENCH_MODULE, types=types,
+                    properties=properties, count=queries),
+                repeat,
+            )
+        else:
+            raise AssertionError(f'unexpected benchmark {name!r}')
+
+        results[name] = _summarize(timings)
+        click.echo(
+            f'{name}: min {min(timings):.3f}s, '
+            f'median {statistics.median(timings):.3f}s '
+            f'over {repeat} run(s)'
+        )
+
+    run_params = {
+        **params,
+        'queries': queries,
+        'renamed': renamed,
+        'altered': altered,
+        'repeat': repeat,
+    }
+
+    if json_path:
+        with open(json_path, 'wt') as f:
+            json.dump(
+                {
+                    'params': run_params,
+                    'results': results,
+                },
+                f,
+                indent=2,
+            )
+
+    if baseline:
+        with open(baseline, 'rt') as f:
+            base = json.load(f)
+
+        mismatched = _mismatched_params(run_params, base.get('params', {}))
+        if mismatched:
+            click.secho(
+                f'Error: the baseline was run with different parameters: '
+                f'{", ".join(mismatched)}; the results are not comparable.',
+                fg='red')
+            sys.exit(1)
+
+        regressed = _compare(results, base['results'], threshold)
+        if regressed:
+            click.secho(
+                f'Regressed over the baseline: {", ".join(regressed)}',
+                fg='red')
+            sys.exit(1)
@@ -0,0 +1,161 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Encoding of schemas in the format of the introspection query.
+
+The server loads the schema of a database by running the introspection
+query and parsing its results with s_refl.parse_into().  To benchmark
+the parsing without a database, the introspection results are
+reproduced from the schema objects and the reflection class layout.
+"""
+
+
+from __future__ import annotations
+from typing import *
+
+import json
+
+from edb.schema import expr as s_expr
+from edb.schema import objects as s_obj
+from edb.schema import schema as s_schema
+from edb.schema.reflection import structure as sr_struct
+
+
+def encode_schema(
+    schema: s_schema.Schema,
+    *,
+    base_schema: s_schema.Schema,
+    schema_class_layout: Dict[Type[s_obj.Object], sr_struct.SchemaTypeLayout],
+) -> List[str]:
+    """Return JSON-encoded objects of *schema* missing in *base_schema*."""
+
+    objects = schema.get_objects(extra_filters=[
+        lambda _, obj: (
+            type(obj) in schema_class_layout
+            and base_schema.get_by_id(obj.id, None) is None
+        ),
+    ])
+
+    return [
+        json.dumps(
+            _encode_object(schema, obj, schema_class_layout[type(obj)]),
+            default=_encode_value,
+        )
+        for obj in objects
+    ]
+
+
+def _encode_object(
+    schema: s_schema.Schema,
+    obj: s_obj.Object,
+    layout: sr_struct.SchemaTypeLayout,
+) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        '_tname': sr_struct.get_schema_name_for_pycls(type(obj)),
+        'id': str(obj.id),
+    }
+
+    for key, desc in layout.items():
+        if key == 'id':
+            continue
+
+        if desc.is_refdict:
+            if f'{key}__internal' in layout:
+                # Refdicts reflected as links are only read through
+                # the shadow link.
+                continue
+            refs = obj.get_field_value(schema, desc.fieldname)
+            if refs is None:
+                entry[key] = []
+                continue
+            entry[key] = [
+                {
+                    'id': str(ref.id),
+                    **{
+                        f'@{prop}': ref.get_field_value(schema, prop)
+                        for prop in desc.properties
+                    },
+                }
+                for ref in refs.objects(schema)
+            ]
+            continue
+
+        storage = desc.storage
+        if storage is None:
+            continue
+
+        value = obj.get_field_value(schema, desc.fieldname)
+        if value is None:
+            entry[key] = None
+            if storage.shadow_ptrkind is not None:
+                entry[f'{key}__internal'] = None
+
+        elif storage.ptrkind == 'link':
+            entry[key] = {'id': str(value.id)}
+
+        elif storage.ptrkind == 'multi link':
+            if isinstance(value, s_obj.ObjectDict):
+                entry[key] = [
+                    {'name': name, 'value': str(ref.id)}
+                    for name, ref in value.items(schema)
+                ]
+            else:
+                entry[key] = [
+                    {'id': str(refid)} for refid in value.ids(schema)
+                ]
+
+        elif storage.fieldtype is sr_struct.FieldType.EXPR:
+            entry[key] = value.text
+            entry[f'{key}__internal'] = _encode_expr(schema, value)
+
+        elif storage.fieldtype is sr_struct.FieldType.EXPR_LIST:
+            entry[key] = [expr.text for expr in value]
+            entry[f'{key}__internal'] = [
+                _encode_expr(schema, expr) for expr in value
+            ]
+
+        else:
+            entry[key] = value
+            if storage.shadow_ptrkind is not None:
+                entry[f'{key}__internal'] = str(value)
+
+    return entry
+
+
+def _encode_expr(
+    schema: s_schema.Schema,
+    expr: s_expr.Expression,
+) -> Dict[str, Any]:
+    return {
+        'text': expr.text,
+        'origtext': expr.origtext,
+        'refs': (
+            [str(refid) for refid in expr.refs.ids(schema)]
+            if expr.refs is not None else []
+        ),
+    }
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    elif isinstance(value, (set, frozenset, tuple, list)):
+        return list(value)
+    else:
+        return str(value)
@@ -0,0 +1,226 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import *
+
+import random
+
+
+SCALARS = ('str', 'int64', 'float64', 'bool', 'datetime')
+
+
+def make_schema_sdl(
+    *,
+    types: int,
+    properties: int,
+    depth: int = 1,
+    computables: int = 0,
+    aliases: int = 0,
+    renamed: float = 0.0,
+    altered: float = 0.0,
+    seed: int = 0,
+) -> str:
+    """Generate the SDL of a synthetic schema.
+
+    The schema consists of *types* object types, each with *properties*
+    properties of assorted scalar types, a link to the previous type,
+    an exclusive constraint and an annotation.  The types extend one of
+    a handful of abstract bases, each of which is at the end of an
+    inheritance chain *depth* types long.
+
+    Every type also gets *computables* computable properties and, if
+    there are any, a computable backlink to the next type.  The schema
+    additionally has *aliases* aliases of the types that add
+    a computable to the aliased type shape.
+
+    A *renamed* fraction of types and properties gets renamed and an
+    *altered* fraction of properties gets a different target compared
+    to the schema generated with the same *seed* and no mutations.
+    """
+    _check_params(types=types, depth=depth)
+    computables = _num_computables(properties, computables)
+    aliases = _num_aliases(types, aliases)
+    rng = random.Random(seed)
+
+    def _renamed(name: str) -> str:
+        if rng.random() < renamed:
+            return f'{name}_renamed'
+        else:
+            return name
+
+    type_names = [_renamed(f'Type{i}') for i in range(types)]
+    nbases = min(types, 10)
+
+    decls = []
+    for i in range(nbases):
+        decls.append(f'''
+            abstract type Base{i} {{
+                property base_name -> str {{
+                    annotation title := 'Base {i}';
+                }};
+            }};
+        ''')
+        for level in range(1, depth):
+            decls.append(f'''
+                abstract type {base_name(i, level)}
+                        extending {base_name(i, level - 1)} {{
+                    property level{level} -> int64;
+                }};
+            ''')
+
+    for i, type_name in enumerate(type_names):
+        ptrs = []
+        prop_names = []
+        for j in range(properties):
+            prop_name = _renamed(f'prop{j}')
+            prop_names.append(prop_name)
+            target = SCALARS[(i + j) % len(SCALARS)]
+            if rng.random() < altered:
+                target = SCALARS[(i + j + 1) % len(SCALARS)]
+
+            if j == 0:
+                ptrs.append(f'''
+                    required property {prop_name} -> {target} {{
+                        constraint exclusive;
+                    }};
+                ''')
+            else:
+                ptrs.append(f'property {prop_name} -> {target};')
+
+        if i > 0:
+            ptrs.append(f'link prev -> {type_names[i - 1]};')
+
+        for k in range(computables):
+            prop_name = prop_names[k % len(prop_names)]
+            ptrs.append(
+                f"property comp{k} := <str>.{prop_name} ++ '/{k}';")
+
+        if computables and i + 1 < types:
+            ptrs.append(
+                f'multi link next := .<prev[IS {type_names[i + 1]}];')
+
+        decls.append(f'''
+            type {type_name} extending {base_name(i % nbases, depth - 1)} {{
+                annotation title := 'Type {i}';
+                {" ".join(ptrs)}
+            }};
+        ''')
+
+    for k in range(aliases):
+        decls.append(f'''
+            alias Alias{k} := {type_names[k]} {{
+                alias_name := .base_name ++ '/alias',
+            }};
+        ''')
+
+    return ''.join(decls)
+
+
+def base_name(base: int, level: int) -> str:
+    """Return the name of an abstract base type of a synthetic schema."""
+    if level == 0:
+        return f'Base{base}'
+    else:
+        return f'Base{base}Level{level}'
+
+
+def _check_params(*, types: int, depth: int) -> None:
+    if types < 1:
+        raise ValueError('a synthetic schema must have at least one type')
+    if depth < 1:
+        raise ValueError('the inheritance depth must be at least 1')
+
+
+def _num_computables(properties: int, computables: int) -> int:
+    # Computables are defined over the regular properties.
+    return computables if properties > 0 else 0
+
+
+def _num_aliases(types: int, aliases: int) -> int:
+    # Every alias aliases a distinct type.
+    return min(aliases, types)
+
+
+def make_queries(
+    *,
+    types: int,
+    properties: int,
+    depth: int = 1,
+    computables: int = 0,
+    aliases: int = 0,
+    count: int = 10,
+) -> List[str]:
+    """Generate EdgeQL queries over a schema from make_schema_sdl().
+
+    The queries select shapes of the object types that include
+    computables and nested links, polymorphic shapes of the abstract
+    bases and shapes of the aliases.
+    """
+    _check_params(types=types, depth=depth)
+    computables = _num_computables(properties, computables)
+    aliases = _num_aliases(types, aliases)
+
+    queries = []
+    props = [f'prop{j}' for j in range(min(properties, 3))]
+    props.extend(f'comp{k}' for k in range(min(computables, 3)))
+
+    for n in range(count):
+        i = (n * 7919) % types
+        shape = ', '.join(props)
+        if i > 0:
+            nested = 'prev: { id, prev: { id } }'
+            shape = f'{shape}, {nested}' if shape else nested
+        if computables and i + 1 < types:
+            shape = f'{shape}, next: {{ id }}' if shape else 'next: { id }'
+        order = ' ORDER BY .prop0' if properties else ''
+        queries.append(
+            f'SELECT Type{i} {{ {shape or "id"} }}{order} LIMIT 10;')
+
+        base = n % min(types, 10)
+        poly = f', [IS Type{base}].prop0' if properties else ''
+        queries.append(
+            f'SELECT {base_name(base, depth - 1)} {{ base_name{poly} }} '
+            f"FILTER .base_name LIKE 'x%';")
+
+        if n < aliases:
+            queries.append(f'SELECT Alias{n} {{ id, alias_name }};')
+
+    return queries
+
+
+def make_graphql_queries(
+    *,
+    module: str,
+    types: int,
+    properties: int,
+    count: int = 10,
+) -> List[str]:
+    """Generate GraphQL queries over a schema from make_schema_sdl()."""
+    queries = []
+    props = ' '.join(f'prop{j}' for j in range(min(properties, 3)))
+
+    for n in range(count):
+        i = (n * 7919) % types
+        nested = ' prev { id }' if i > 0 else ''
+        queries.append(
+            f'query {{ {module}__Type{i}(first: 10) '
+            f'{{ id {props}{nested} }} }}')
+
+    return queries
@@ -0,0 +1,140 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os
+import pathlib
+import pstats
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+from edb.common import sampler
+
+
+def outer():
+    pass
+
+
+def inner():
+    pass
+
+
+def busy(duration):
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        pass
+
+
+def func_id(func):
+    code = func.__code__
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+class TestSampler(unittest.TestCase):
+
+    def test_sampler_stacks_to_stats_01(self):
+        a, b, c = outer.__code__, inner.__code__, busy.__code__
+        stats = sampler.stacks_to_stats({(c, b, a): 2, (b, a): 1}, 0.5)
+
+        self.assertEqual(stats[func_id(outer)], (3, 3, 0.0, 1.5, {}))
+        self.assertEqual(
+            stats[func_id(inner)],
+            (3, 3, 0.5, 1.5, {func_id(outer): (3, 3, 0.5, 1.5)}))
+        self.assertEqual(
+            stats[func_id(busy)],
+            (2, 2, 1.0, 1.0, {func_id(inner): (2, 2, 1.0, 1.0)}))
+
+    def test_sampler_stacks_to_stats_02(self):
+        # Recursive calls are counted once per sample.
+        a = outer.__code__
+        stats = sampler.stacks_to_stats({(a, a, a): 4}, 0.5)
+
+        self.assertEqual(
+            stats,
+            {func_id(outer): (4, 4, 2.0, 2.0, {func_id(outer): (4, 4, 2, 2)})})
+
+    def test_sampler_dump(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            s = sampler.Sampler(interval=0.001, dir=tmpdir)
+            s.start()
+            self.assertTrue(s.is_running())
+            busy(0.2)
+            s.stop()
+            self.assertFalse(s.is_running())
+
+            files = list(pathlib.Path(tmpdir).glob(
+                f'{sampler.PREFIX}*{sampler.SUFFIX}'))
+            self.assertEqual(len(files), 1)
+
+            stats = pstats.Stats(str(files[0])).stats
+            self.assertIn(func_id(busy), stats)
+            self.assertGreater(stats[func_id(busy)][3], 0)
+
+    def test_sampler_duration(self):
+        s = sampler.Sampler(interval=0.001)
+        s.start(duration=0.05)
+        busy(0.2)
+        self.assertFalse(s.is_running())
+        self.assertIn(func_id(busy), s.get_stats())
+
+    def test_sampler_start_stop(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with unittest.mock.patch.dict(
+                    os.environ, {'EDGEDB_SAMPLING_PROFILER_DIR': tmpdir}):
+                sampler.start(duration=10)
+                try:
+                    self.assertTrue(sampler.is_running())
+                    remaining = sampler.get_remaining()
+                    self.assertGreater(remaining, 0)
+                    self.assertLessEqual(remaining, 10)
+
+                    # Starting a running sampler does not restart it.
+                    sampler.start(duration=100)
+                    self.assertLessEqual(sampler.get_remaining(), 10)
+
+                    self.assertEqual(
+                        sampler.get_inherited_env().keys(),
+                        {sampler.START_ENV})
+                finally:
+                    sampler.stop()
+
+                self.assertFalse(sampler.is_running())
+                self.assertIsNone(sampler.get_remaining())
+                self.assertEqual(sampler.get_inherited_env(), {})
+
+                # Stopping a stopped sampler is a no-op.
+                sampler.stop()
+                self.assertFalse(sampler.is_running())
+
+    def test_sampler_inherit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with unittest.mock.patch.dict(
+                    os.environ, {'EDGEDB_SAMPLING_PROFILER_DIR': tmpdir}):
+                os.environ.pop(sampler.START_ENV, None)
+                sampler.inherit()
+                self.assertFalse(sampler.is_running())
+
+                os.environ[sampler.START_ENV] = '5'
+                sampler.inherit()
+                try:
+                    self.assertTrue(sampler.is_running())
+                    self.assertLessEqual(sampler.get_remaining(), 5)
+                finally:
+                    sampler.stop()
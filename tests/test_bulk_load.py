@@ -0,0 +1,126 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os
+import tempfile
+import uuid
+
+import edgedb
+
+from edb.testbase import server as tb
+
+
+class TestBulkLoad(tb.DatabaseTestCase, tb.OldCLITestCaseMixin):
+
+    ISOLATED_METHODS = False
+    SERIALIZED = True
+
+    SETUP = '''
+        CREATE TYPE default::Tag {
+            CREATE REQUIRED PROPERTY name -> std::str;
+        };
+        CREATE TYPE default::Item {
+            CREATE REQUIRED PROPERTY idx -> std::int64;
+            CREATE PROPERTY note -> std::str;
+            CREATE MULTI LINK tags -> default::Tag {
+                CREATE PROPERTY weight -> std::int64;
+            };
+        };
+    '''
+
+    TEARDOWN = '''
+        DROP TYPE default::Item;
+        DROP TYPE default::Tag;
+    '''
+
+    def write_csv(self, tmpdir, name, data):
+        fn = os.path.join(tmpdir, name)
+        with open(fn, 'w') as f:
+            f.write(data)
+        return fn
+
+    async def test_bulk_load_01(self):
+        tags = [str(uuid.uuid4()) for _ in range(2)]
+        items = [str(uuid.uuid4()) for _ in range(3)]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tags_fn = self.write_csv(tmpdir, 'tags.csv', ''.join(
+                ['id,name\n'] +
+                [f'{t},tag{i}\n' for i, t in enumerate(tags)]))
+
+            items_fn = self.write_csv(tmpdir, 'items.csv', ''.join(
+                ['id,idx,note\n'] +
+                [f'{it},{i},"note ""{i}""\nline 2"\n'
+                 for i, it in enumerate(items)]))
+
+            links_fn = self.write_csv(tmpdir, 'links.csv', ''.join(
+                ['source,target,@weight\n'] +
+                [f'{it},{t},{i}\n'
+                 for i, it in enumerate(items) for t in tags]))
+
+            self.run_cli('-d', self.get_database_name(),
+                         'load', 'Tag', tags_fn)
+            self.run_cli('-d', self.get_database_name(),
+                         'load', 'Item', items_fn,
+                         '--link', f'tags={links_fn}')
+
+        await self.assert_query_result(
+            r'''
+                SELECT Item {
+                    idx,
+                    note,
+                    tags: {name, @weight} ORDER BY .name,
+                }
+                ORDER BY .idx;
+            ''',
+            [
+                {
+                    'idx': i,
+                    'note': f'note "{i}"\nline 2',
+                    'tags': [
+                        {'name': 'tag0', '@weight': i},
+                        {'name': 'tag1', '@weight': i},
+                    ],
+                }
+                for i in range(3)
+            ]
+        )
+
+        await self.con.execute('DELETE Item; DELETE Tag;')
+
+    async def test_bulk_load_02(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            items_fn = self.write_csv(
+                tmpdir, 'items.csv', 'idx\n1\n2\n')
+            links_fn = self.write_csv(
+                tmpdir, 'links.csv', 'source,target\n'
+                f'{uuid.uuid4()},{uuid.uuid4()}\n')
+
+            with self.assertRaisesRegex(
+                    edgedb.ConstraintViolationError,
+                    "invalid source of 'default::Item.tags'"):
+                self.run_cli('-d', self.get_database_name(),
+                             'load', 'Item', items_fn,
+                             '--link', f'tags={links_fn}')
+
+        # The load is atomic.
+        await self.assert_query_result(
+            r'''SELECT count(Item);''',
+            [0],
+        )
@@ -1892,6 +1892,125 @@ class TestEdgeQLDDL(tb.DDLTestCase):
             ],
         )
 
+    async def test_edgeql_ddl_function_27(self):
+        await self.con.execute(r"""
+            CREATE FUNCTION test::edgeql_func27(a: std::int64) -> std::int64 {
+                USING EdgeQL $$
+                    SELECT a * 10 + count({a, a + 1})
+                $$;
+                # Volatile functions are never inlined.
+                SET volatility := 'IMMUTABLE';
+            };
+
+            CREATE TYPE test::Func27 {
+                CREATE PROPERTY n -> std::int64;
+            };
+
+            INSERT test::Func27 { n := 1 };
+            INSERT test::Func27 { n := 2 };
+            INSERT test::Func27;
+        """)
+
+        # Calls are inlined, but must still be element-wise
+        # over their arguments.
+        await self.assert_query_result(
+            r'''
+                SELECT test::edgeql_func27({1, 2, 3});
+            ''',
+            {12, 22, 32},
+        )
+
+        await self.assert_query_result(
+            r'''
+                SELECT test::edgeql_func27(<int64>{});
+            ''',
+            [],
+        )
+
+        await self.assert_query_result(
+            r'''
+                WITH x := {1, 2}
+                SELECT (x, test::edgeql_func27(x)) ORDER BY x;
+            ''',
+            [[1, 12], [2, 22]],
+        )
+
+        # One call per object, and none for an empty argument.
+        await self.assert_query_result(
+            r'''
+                SELECT test::Func27 {
+                    n,
+                    y := test::edgeql_func27(.n),
+                }
+                ORDER BY .n EMPTY FIRST;
+            ''',
+            [
+                {'n': None, 'y': None},
+                {'n': 1, 'y': 12},
+                {'n': 2, 'y': 22},
+            ],
+        )
+
+        await self.assert_query_result(
+            r'''
+                SELECT test::edgeql_func27(test::Func27.n);
+            ''',
+            {12, 22},
+        )
+
+        await self.assert_query_result(
+            r'''
+                WITH MODULE schema
+                SELECT Function { inlinable }
+                FILTER .name = 'test::edgeql_func27';
+            ''',
+            [{'inlinable': True}],
+        )
+
+    async def test_edgeql_ddl_function_28(self):
+        await self.con.execute(r"""
+            CREATE FUNCTION test::edgeql_func28(a: std::str) -> std::str {
+                USING EdgeQL $$
+                    SELECT a ++ '!'
+                $$;
+                SET volatility := 'IMMUTABLE';
+                SET inlinable := false;
+            };
+        """)
+
+        await self.assert_query_result(
+            r'''
+                SELECT test::edgeql_func28({'a', 'b'});
+            ''',
+            {'a!', 'b!'},
+        )
+
+        await self.con.execute(r"""
+            ALTER FUNCTION test::edgeql_func28(a: std::str) {
+                SET inlinable := true;
+                USING (
+                    SELECT a ++ '?'
+                );
+            };
+        """)
+
+        # A changed body is picked up by the inlined calls.
+        await self.assert_query_result(
+            r'''
+                SELECT test::edgeql_func28({'a', 'b'});
+            ''',
+            {'a?', 'b?'},
+        )
+
+        await self.assert_query_result(
+            r'''
+                WITH MODULE schema
+                SELECT Function { inlinable }
+                FILTER .name = 'test::edgeql_func28';
+            ''',
+            [{'inlinable': True}],
+        )
+
     async def test_edgeql_ddl_module_01(self):
         with self.assertRaisesRegex(
                 edgedb.SchemaError,
@@ -5537,3 +5656,102 @@ class TestEdgeQLDDL(tb.DDLTestCase):
                     WITH MODULE test
                     DROP FUNCTION foo___1(a: int64);
                 ''')
+
+    async def test_edgeql_ddl_script_groups_01(self):
+        # Consecutive DDL statements are executed as one unit, so
+        # a failing statement rolls back the ones before it.
+        await self.con.execute('''
+            CREATE TYPE test::Group01;
+            INSERT test::Group01;
+        ''')
+
+        with self.assertRaisesRegex(
+                edgedb.MissingRequiredError,
+                'missing value for required property'):
+            await self.con.execute('''
+                CREATE TYPE test::Group01Other;
+                ALTER TYPE test::Group01 {
+                    CREATE PROPERTY bar -> str;
+                };
+                ALTER TYPE test::Group01 {
+                    CREATE REQUIRED PROPERTY foo -> str;
+                };
+            ''')
+
+        await self.assert_query_result(
+            r'''
+                SELECT schema::ObjectType {
+                    properties: {
+                        name
+                    } FILTER .name IN {'foo', 'bar'}
+                }
+                FILTER .name LIKE 'test::Group01%';
+            ''',
+            [{'properties': []}],
+        )
+
+    async def test_edgeql_ddl_online_01(self):
+        await self.con.execute('''
+            CREATE TYPE test::Online01;
+            FOR x IN {1, 2, 3} UNION (INSERT test::Online01);
+            CONFIGURE SESSION SET online_ddl := true;
+        ''')
+
+        try:
+            # Prepared and executed with Parse/Execute.
+            await self.con.fetchall('''
+                ALTER TYPE test::Online01 {
+                    CREATE REQUIRED PROPERTY foo -> str {
+                        SET default := 'foo';
+                    };
+                };
+            ''')
+
+            # Executed as a script.
+            await self.con.execute('''
+                ALTER TYPE test::Online01 {
+                    CREATE INDEX ON (.foo);
+                };
+            ''')
+        finally:
+            await self.con.execute('''
+                CONFIGURE SESSION RESET online_ddl;
+            ''')
+
+        await self.assert_query_result(
+            r'''
+                SELECT test::Online01.foo;
+            ''',
+            ['foo', 'foo', 'foo'],
+        )
+
+    async def test_edgeql_ddl_online_02(self):
+        await self.con.execute('''
+            CREATE TYPE test::Online02;
+            FOR x IN {1, 2, 3} UNION (INSERT test::Online02);
+            CONFIGURE SESSION SET online_ddl := true;
+            CONFIGURE SESSION SET online_ddl_batch_size := 1;
+        ''')
+
+        try:
+            # The default is empty, so the backfilled rows stay NULL,
+            # which must not make the backfill revisit them forever.
+            await self.con.execute('''
+                ALTER TYPE test::Online02 {
+                    CREATE PROPERTY foo -> str {
+                        SET default := (SELECT <str>{});
+                    };
+                };
+            ''')
+        finally:
+            await self.con.execute('''
+                CONFIGURE SESSION RESET online_ddl;
+                CONFIGURE SESSION RESET online_ddl_batch_size;
+            ''')
+
+        await self.assert_query_result(
+            r'''
+                SELECT count(test::Online02 FILTER NOT EXISTS .foo);
+            ''',
+            [3],
+        )
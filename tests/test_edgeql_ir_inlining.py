@@ -0,0 +1,79 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from edb.common import ast
+from edb.testbase import lang as tb
+
+from edb.edgeql import compiler
+from edb.edgeql import parser as qlparser
+from edb.ir import ast as irast
+
+
+class TestEdgeQLIRInlining(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for the inlining of function calls."""
+
+    SCHEMA = r'''
+        type Named {
+            property name -> str;
+        };
+
+        function inlined(a: str) -> str {
+            using (SELECT str_lower(a));
+            volatility := 'IMMUTABLE';
+        };
+
+        function not_inlinable(a: str) -> str {
+            using (SELECT str_lower(a));
+            volatility := 'IMMUTABLE';
+            inlinable := false;
+        };
+
+        function volatile(a: str) -> str {
+            using (SELECT str_lower(a));
+        };
+    '''
+
+    def _get_calls(self, source):
+        ir = compiler.compile_ast_to_ir(qlparser.parse(source), self.schema)
+        return {
+            str(call.func_shortname)
+            for call in ast.find_children(
+                ir, lambda n: isinstance(n, irast.FunctionCall))
+        }
+
+    def test_edgeql_ir_inlining_01(self):
+        calls = self._get_calls(r'''
+            SELECT test::Named { y := test::inlined(.name) }
+        ''')
+        self.assertNotIn('test::inlined', calls)
+        self.assertIn('std::str_lower', calls)
+
+    def test_edgeql_ir_inlining_02(self):
+        calls = self._get_calls(r'''
+            SELECT test::Named
+            FILTER .name = test::not_inlinable('foo')
+        ''')
+        self.assertIn('test::not_inlinable', calls)
+
+    def test_edgeql_ir_inlining_03(self):
+        # Volatile functions, the default, are never inlined.
+        calls = self._get_calls(r'''
+            SELECT test::volatile(<str>{})
+        ''')
+        self.assertIn('test::volatile', calls)
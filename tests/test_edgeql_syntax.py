@@ -3861,3 +3861,34 @@ aa';
         """
         DESCRIBE TYPE foo::Bar AS DDL VERBOSE;
         """
+
+    def test_edgeql_syntax_explain_01(self):
+        """
+        EXPLAIN SELECT User { name } FILTER .name = 'Alice';
+        """
+
+    def test_edgeql_syntax_explain_02(self):
+        """
+        EXPLAIN ANALYZE WITH MODULE test SELECT User ORDER BY .name;
+        """
+
+    def test_edgeql_syntax_explain_03(self):
+        """
+        EXPLAIN ANALYZE INSERT User { name := 'Alice' };
+        """
+
+    @tb.must_fail(errors.EdgeQLSyntaxError,
+                  r"Unexpected 'EXPLAIN'",
+                  line=2, col=17)
+    def test_edgeql_syntax_explain_04(self):
+        """
+        EXPLAIN EXPLAIN SELECT User;
+        """
+
+    @tb.must_fail(errors.EdgeQLSyntaxError,
+                  r"Unexpected 'DESCRIBE'",
+                  line=2, col=17)
+    def test_edgeql_syntax_explain_05(self):
+        """
+        EXPLAIN DESCRIBE TYPE User;
+        """
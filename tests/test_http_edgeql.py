@@ -17,7 +17,9 @@
 #
 
 
+import json
 import os
+import urllib.parse
 
 import edgedb
 
@@ -74,6 +76,117 @@ class TestHttpEdgeQL(tb.EdgeQLTestCase):
             with self.assertRaises(OSError):
                 self.http_con_request(con, {}, path='non-existant')
 
+    def send_pipelined(self, con, queries):
+        # Send all requests at once without waiting for responses,
+        # the server is expected to reply to them in order.
+        reqs = []
+        for query, variables in queries:
+            qs = urllib.parse.urlencode({
+                'query': query,
+                'variables': json.dumps(variables),
+            })
+            reqs.append(
+                f'GET /?{qs} HTTP/1.1\r\n'
+                f'Host: {self.http_host}\r\n\r\n'.encode())
+        con.send(b''.join(reqs))
+
+        buf = b''
+
+        def read_until(sep):
+            nonlocal buf
+            while sep not in buf:
+                buf += con.sock.recv(65536)
+            data, _, buf = buf.partition(sep)
+            return data
+
+        results = []
+        for _ in queries:
+            head = read_until(b'\r\n\r\n')
+            status_line, *header_lines = head.split(b'\r\n')
+            headers = dict(
+                line.lower().split(b': ', 1) for line in header_lines)
+
+            self.assertIn(b' 200 ', status_line)
+            self.assertNotIn(b'connection', headers)
+            self.assertEqual(headers[b'transfer-encoding'], b'chunked')
+
+            # Results are streamed in chunks.
+            body = b''
+            while True:
+                length = int(read_until(b'\r\n'), 16)
+                while len(buf) < length + 2:
+                    buf += con.sock.recv(65536)
+                body += buf[:length]
+                buf = buf[length + 2:]
+                if not length:
+                    break
+
+            results.append(json.loads(body))
+
+        return results
+
+    def test_http_edgeql_proto_pipelining_01(self):
+        queries = [
+            (f'SELECT {i} + <int64>$x', {'x': i * 100})
+            for i in range(20)
+        ]
+
+        with self.http_con() as con:
+            results = self.send_pipelined(con, queries)
+
+        self.assertEqual(
+            results, [{'data': [i + i * 100]} for i in range(20)])
+
+    def test_http_edgeql_proto_pipelining_02(self):
+        # The results of the pipelined queries are larger than
+        # the amount that is buffered before they are sent.
+        query = r'''
+            WITH items := enumerate(array_unpack(
+                str_split(str_repeat('x,', <int64>$n - 1) ++ 'x', ',')))
+            SELECT str_repeat('x', 100) ++ <str>(1 / (<int64>$n - items.0))
+        '''
+        queries = [
+            (query, {'n': 30000}),
+            (query, {'n': 30000}),
+            ('SELECT 1 / 0', {}),
+            (query, {'n': 10}),
+        ]
+
+        with self.http_con() as con:
+            results = self.send_pipelined(con, queries)
+
+        self.assertEqual(len(results[0]['data']), 30000)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(
+            results[2]['error']['type'], 'DivisionByZeroError')
+        self.assertEqual(len(results[3]['data']), 10)
+
+    def test_http_edgeql_proto_streaming_01(self):
+        # The result is large enough to be sent in multiple chunks.
+        result = self.edgeql_query(r'''
+            WITH items := enumerate(
+                array_unpack(str_split(str_repeat('x,', 9999) ++ 'x', ',')))
+            SELECT str_repeat('x', 100) ++ <str>items.0
+        ''')
+
+        self.assertEqual(len(result), 10000)
+        self.assertEqual(
+            set(result), {'x' * 100 + str(i) for i in range(10000)})
+
+        self.assertEqual(
+            self.edgeql_query('SELECT <int64>{}'), [])
+
+    def test_http_edgeql_proto_streaming_02(self):
+        # An error after some of the rows are sent is reported
+        # after the data.
+        with self.assertRaisesRegex(
+                edgedb.DivisionByZeroError, 'division by zero'):
+            self.edgeql_query(r'''
+                WITH items := enumerate(array_unpack(
+                    str_split(str_repeat('x,', 9999) ++ 'x', ',')))
+                SELECT str_repeat('x', 100) ++ <str>(1 / (9999 - items.0))
+            ''')
+
     def test_http_edgeql_query_01(self):
         for _ in range(10):  # repeat to test prepared pgcon statements
             for use_http_post in [True, False]:
@@ -254,6 +367,25 @@ class TestHttpEdgeQL(tb.EdgeQLTestCase):
                 variables={'x': None},
             )
 
+    def test_http_edgeql_query_13(self):
+        with self.assertRaisesRegex(
+                edgedb.QueryError,
+                r'EXPLAIN is not supported over HTTP'):
+            self.edgeql_query(r"EXPLAIN SELECT Setting")
+
+        # EXPLAIN ANALYZE would execute the query.
+        with self.assertRaisesRegex(
+                edgedb.QueryError,
+                r'EXPLAIN is not supported over HTTP'):
+            self.edgeql_query(
+                r"EXPLAIN ANALYZE INSERT Setting {"
+                r" name := 'explain', value := 'explain' }")
+
+        self.assert_edgeql_query_result(
+            r"SELECT count(Setting FILTER .name = 'explain')",
+            [0],
+        )
+
     def test_http_edgeql_session_func_01(self):
         with self.assertRaisesRegex(edgedb.QueryError,
                                     r'sys::advisory_lock\(\) cannot be '
@@ -17,6 +17,7 @@
 #
 
 
+import hashlib
 import json
 import os
 import uuid
@@ -129,6 +130,57 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
             with self.assertRaises(OSError):
                 self.http_con_request(con, {}, path='non-existant')
 
+    def test_graphql_http_persisted_query_01(self):
+        query = '''
+            {
+                Setting(order: {value: {dir: ASC}}) {
+                    value
+                }
+            }
+        '''
+        query_hash = hashlib.sha256(query.encode()).hexdigest()
+        extensions = json.dumps({
+            'persistedQuery': {'version': 1, 'sha256Hash': query_hash},
+        })
+
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(
+                con, {'extensions': extensions})
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                json.loads(data)['errors'][0]['extensions'],
+                {'code': 'PERSISTED_QUERY_NOT_FOUND'})
+
+            # Register the query...
+            data, headers, status = self.http_con_request(
+                con, {'query': query, 'extensions': extensions})
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                json.loads(data)['data'],
+                {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+
+            # ...and now use just its hash.
+            for _ in range(3):
+                data, headers, status = self.http_con_request(
+                    con, {'extensions': extensions})
+                self.assertEqual(status, 200)
+                self.assertEqual(
+                    json.loads(data)['data'],
+                    {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+
+    def test_graphql_http_persisted_query_02(self):
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(con, {
+                'query': '{ Setting { value } }',
+                'extensions': json.dumps({
+                    'persistedQuery': {'version': 1, 'sha256Hash': '0' * 64},
+                }),
+            })
+            self.assertEqual(status, 200)
+            self.assertIn(
+                'provided sha does not match query',
+                json.loads(data)['errors'][0]['message'])
+
     def test_graphql_functional_query_01(self):
         for _ in range(10):  # repeat to test prepared pgcon statements
             self.assert_graphql_query_result(r"""
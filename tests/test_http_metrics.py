@@ -0,0 +1,128 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+import urllib.error
+import urllib.request
+
+from edb.server import metrics
+from edb.testbase import http as tb
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_metrics_counter_01(self):
+        registry = metrics.Registry(prefix='test_')
+        counter = registry.new_counter('calls_total', 'Number of calls.')
+        counter.inc()
+        counter.inc(2)
+
+        self.assertEqual(counter.get(), 3)
+        self.assertEqual(
+            registry.generate(),
+            '# HELP test_calls_total Number of calls.\n'
+            '# TYPE test_calls_total counter\n'
+            'test_calls_total 3\n'
+        )
+
+        with self.assertRaisesRegex(ValueError, 'cannot decrease'):
+            counter.inc(-1)
+
+    def test_metrics_gauge_01(self):
+        registry = metrics.Registry()
+        gauge = registry.new_gauge(
+            'conns', 'Connections.', labels=('proto',))
+        gauge.inc(1, 'http')
+        gauge.inc(1, 'http')
+        gauge.dec(1, 'http')
+        gauge.set(5, 'bin"ary')
+
+        self.assertEqual(
+            registry.generate().splitlines()[2:],
+            [
+                'conns{proto="http"} 1',
+                'conns{proto="bin\\"ary"} 5',
+            ]
+        )
+
+        with self.assertRaisesRegex(ValueError, 'expected 1 label'):
+            gauge.inc(1)
+
+    def test_metrics_histogram_01(self):
+        registry = metrics.Registry()
+        hist = registry.new_histogram(
+            'duration_seconds', 'Duration.', buckets=(0.1, 1))
+        hist.observe(0.05)
+        hist.observe(0.1)
+        hist.observe(0.5)
+        hist.observe(2)
+
+        self.assertEqual(hist.get_count(), 4)
+        self.assertEqual(
+            registry.generate().splitlines()[2:],
+            [
+                'duration_seconds_bucket{le="0.1"} 2',
+                'duration_seconds_bucket{le="1"} 3',
+                'duration_seconds_bucket{le="+Inf"} 4',
+                'duration_seconds_sum 2.65',
+                'duration_seconds_count 4',
+            ]
+        )
+
+    def test_metrics_registry_01(self):
+        registry = metrics.Registry()
+        registry.new_counter('calls_total', 'Number of calls.')
+        with self.assertRaisesRegex(ValueError, 'duplicate metric'):
+            registry.new_gauge('calls_total', 'Number of calls.')
+
+
+class TestHttpMetrics(tb.BaseHttpTest, tb.server.QueryTestCase):
+
+    ISOLATED_METHODS = False
+
+    @classmethod
+    def get_port_proto(cls):
+        return 'metrics+http'
+
+    def test_http_metrics_01(self):
+        self.loop.run_until_complete(self.con.fetchall('SELECT 1'))
+
+        with urllib.request.urlopen(f'{self.http_addr}/metrics') as resp:
+            self.assertEqual(resp.status, 200)
+            self.assertTrue(
+                resp.headers['Content-Type'].startswith('text/plain'))
+            data = resp.read().decode()
+
+        self.assertIn(
+            '# TYPE edgedb_server_query_compilation_duration_seconds '
+            'histogram', data)
+        self.assertIn('edgedb_server_client_connections_current ', data)
+
+        lines = data.splitlines()
+        for line in lines:
+            if line.startswith('edgedb_server_backend_connections_total '):
+                self.assertGreater(float(line.split()[1]), 0)
+                break
+        else:
+            self.fail('backend_connections_total is not exported')
+
+    def test_http_metrics_02(self):
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(f'{self.http_addr}/foo')
+        self.assertEqual(cm.exception.code, 404)
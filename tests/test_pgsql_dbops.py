@@ -0,0 +1,295 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import re
+import unittest
+
+from edb.pgsql import dbops
+from edb.pgsql import metaschema
+
+
+class TestCoalesceAlterTables(unittest.TestCase):
+
+    def _alter_table(self, name, *ops, **kwargs):
+        at = dbops.AlterTable(name, **kwargs)
+        for op in ops:
+            at.add_operation(op)
+        return at
+
+    def _add_column(self, name, default=None):
+        return dbops.AlterTableAddColumn(
+            dbops.Column(name=name, type='text', default=default))
+
+    def _to_sql(self, ops):
+        block = dbops.PLTopBlock()
+        for op in ops:
+            op.generate(block)
+        return block.to_string()
+
+    def test_pgsql_dbops_coalesce_01(self):
+        tab = ('edgedb', 'foo')
+        ops = [
+            self._alter_table(tab, self._add_column('a')),
+            self._alter_table(tab, self._add_column('b')),
+            self._alter_table(
+                tab,
+                dbops.AlterTableAlterColumnType('c', 'bigint'),
+            ),
+        ]
+
+        result = dbops.coalesce_alter_tables(ops)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0].commands), 3)
+        # The original commands are left untouched.
+        self.assertEqual(len(ops[0].commands), 1)
+        self.assertEqual(
+            self._to_sql(result).count('ALTER TABLE'), 1)
+
+    def test_pgsql_dbops_coalesce_02(self):
+        foo = ('edgedb', 'foo')
+        bar = ('edgedb', 'bar')
+
+        ops = [
+            self._alter_table(foo, self._add_column('a')),
+            self._alter_table(bar, self._add_column('a')),
+            self._alter_table(foo, self._add_column('b')),
+            # Same column, cannot be in the same statement.
+            self._alter_table(
+                foo,
+                dbops.AlterTableAlterColumnNull('b', null=False),
+            ),
+            # Different priority.
+            self._alter_table(
+                foo, self._add_column('c'), priority=1),
+        ]
+
+        result = dbops.coalesce_alter_tables(ops)
+        self.assertEqual(result, ops)
+
+    def test_pgsql_dbops_table_effects_01(self):
+        tab = ('edgedb', 'foo')
+        ops = [
+            self._alter_table(
+                tab,
+                self._add_column('a'),
+                dbops.AlterTableAlterColumnNull('b', null=False),
+            ),
+            self._alter_table(
+                tab,
+                self._add_column('c', default="'x'"),
+            ),
+        ]
+
+        self.assertEqual(ops[0].get_table_effect(), dbops.TableEffect.SCAN)
+        self.assertEqual(
+            ops[1].get_table_effect(), dbops.TableEffect.REWRITE)
+
+        lines = dbops.explain_table_effects(
+            dbops.coalesce_alter_tables(ops))
+
+        self.assertEqual(
+            lines[0], '-- ALTER TABLE edgedb.foo: rewrite')
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[2].endswith('NOT NULL: scan'))
+
+
+class TestOnlineDDL(unittest.TestCase):
+
+    def test_pgsql_dbops_online_backfill_01(self):
+        block = dbops.SQLBlock()
+        dbops.BackfillColumn(
+            ('edgedb', 'foo'), 'bar', batch_size=100).generate(block)
+
+        self.assertFalse(block.is_transactional())
+        stmts = [s for s in block.get_statements() if s]
+        self.assertEqual(len(stmts), 1)
+        self.assertIn('LIMIT 100', stmts[0])
+        self.assertIn('COMMIT;', stmts[0])
+        # The rows are walked by id, so NULL defaults do not make
+        # the same rows match again.
+        self.assertIn('id > lower_id', stmts[0])
+        self.assertNotIn('EXIT WHEN batch', stmts[0])
+
+    def test_pgsql_dbops_online_not_null_01(self):
+        block = dbops.SQLBlock()
+        dbops.AlterTableSetColumnNotNullOnline(
+            ('edgedb', 'foo'), 'bar').generate(block)
+
+        self.assertFalse(block.is_transactional())
+        stmts = block.get_statements()
+        self.assertEqual(len(stmts), 5)
+        self.assertIn('DROP CONSTRAINT IF EXISTS', stmts[0])
+        self.assertTrue(stmts[1].endswith('NOT VALID'))
+        self.assertIn('VALIDATE CONSTRAINT', stmts[2])
+        self.assertIn('SET NOT NULL', stmts[3])
+        self.assertIn('DROP CONSTRAINT', stmts[4])
+
+    def test_pgsql_dbops_online_index_01(self):
+        index = dbops.Index(
+            name='foo_idx', table_name=('edgedb', 'foo'), columns=['bar'])
+        block = dbops.SQLBlock()
+        dbops.CreateIndexConcurrently(index).generate(block)
+
+        self.assertFalse(block.is_transactional())
+        stmts = [s for s in block.get_statements() if s]
+        self.assertEqual(len(stmts), 2)
+        self.assertIn('NOT i.indisvalid', stmts[0])
+        self.assertIn('INDEX CONCURRENTLY IF NOT EXISTS', stmts[1])
+
+
+class TestParallelSafety(unittest.TestCase):
+
+    def test_pgsql_dbops_parallel_safety_01(self):
+        classify = dbops.classify_parallel_safety
+
+        self.assertEqual(
+            classify('immutable', 'SELECT $1 + 1'), dbops.PARALLEL_SAFE)
+        self.assertEqual(
+            classify('volatile', 'SELECT $1 + 1'), dbops.PARALLEL_UNSAFE)
+        self.assertEqual(
+            classify('stable', 'INSERT INTO foo VALUES (1)'),
+            dbops.PARALLEL_UNSAFE)
+        self.assertEqual(
+            classify('stable', "SELECT set_config('TimeZone', 'UTC', true)"),
+            dbops.PARALLEL_UNSAFE)
+        self.assertEqual(
+            classify('stable', 'SELECT value FROM _edgecon_state'),
+            dbops.PARALLEL_RESTRICTED)
+        self.assertEqual(
+            classify('stable', 'SELECT edgedb._sys_version()',
+                     restricted_refs={'edgedb._sys_version'}),
+            dbops.PARALLEL_RESTRICTED)
+
+    def test_pgsql_dbops_parallel_safety_02(self):
+        classify = dbops.classify_parallel_safety
+
+        # Keywords in string literals and comments are ignored.
+        self.assertEqual(
+            classify('stable', '''
+                -- Do not update this.
+                SELECT 'insert', 'it''s delete'
+            '''),
+            dbops.PARALLEL_SAFE)
+
+        # PL/pgSQL exception blocks start a subtransaction.
+        self.assertEqual(
+            classify('stable', '''
+                BEGIN
+                    RETURN 1;
+                EXCEPTION
+                    WHEN others THEN RETURN 0;
+                END;
+            '''),
+            dbops.PARALLEL_UNSAFE)
+
+        self.assertEqual(
+            classify('immutable', '''
+                BEGIN
+                    RAISE EXCEPTION 'oops';
+                END;
+            '''),
+            dbops.PARALLEL_SAFE)
+
+    def test_pgsql_dbops_parallel_safety_03(self):
+        self.assertEqual(
+            dbops.least_parallel_safe(
+                dbops.PARALLEL_SAFE, dbops.PARALLEL_RESTRICTED),
+            dbops.PARALLEL_RESTRICTED)
+        self.assertEqual(
+            dbops.least_parallel_safe(
+                dbops.PARALLEL_UNSAFE, dbops.PARALLEL_RESTRICTED),
+            dbops.PARALLEL_UNSAFE)
+        self.assertEqual(dbops.least_parallel_safe(), dbops.PARALLEL_SAFE)
+
+    def test_pgsql_dbops_parallel_safety_04(self):
+        func = dbops.Function(
+            name=('edgedb', 'foo'),
+            args=[('a', 'int8')],
+            returns='int8',
+            volatility='immutable',
+            text='SELECT a + 1',
+        )
+        self.assertEqual(func.parallel_safety, dbops.PARALLEL_SAFE)
+
+        block = dbops.PLTopBlock()
+        dbops.CreateFunction(func).generate(block)
+        self.assertIn('IMMUTABLE', block.to_string())
+        self.assertIn('PARALLEL SAFE', block.to_string())
+
+        func = dbops.Function(
+            name=('edgedb', 'foo'),
+            returns='int8',
+            volatility='stable',
+            text='SELECT 1',
+            parallel_safety=dbops.PARALLEL_RESTRICTED,
+        )
+        block = dbops.PLTopBlock()
+        dbops.CreateOrReplaceFunction(func).generate(block)
+        self.assertIn('PARALLEL RESTRICTED', block.to_string())
+
+    def _make_function(self, name, text, volatility='immutable'):
+        return dbops.Function(
+            name=('edgedb', name),
+            returns='int8',
+            volatility=volatility,
+            text=text,
+        )
+
+    def test_pgsql_dbops_parallel_safety_05(self):
+        unsafe = self._make_function('unsafe', 'SELECT 1', 'volatile')
+        indirect = self._make_function('indirect', 'SELECT edgedb.unsafe()')
+        caller = self._make_function('caller', 'SELECT edgedb.indirect()')
+        other = self._make_function(
+            'other', "SELECT 'edgedb.unsafe()', edgedb.unsafe_not()")
+
+        dbops.propagate_parallel_safety([caller, indirect, unsafe, other])
+
+        self.assertEqual(indirect.parallel_safety, dbops.PARALLEL_UNSAFE)
+        self.assertEqual(caller.parallel_safety, dbops.PARALLEL_UNSAFE)
+        # Names in literals and longer names are not calls.
+        self.assertEqual(other.parallel_safety, dbops.PARALLEL_SAFE)
+
+    def test_pgsql_dbops_parallel_safety_06(self):
+        functions = {
+            cmd.function.name[1]: cmd.function
+            for cmd in metaschema.get_bootstrap_commands().commands
+            if isinstance(cmd, dbops.CreateFunction)
+        }
+
+        self.assertEqual(
+            functions['_sys_version'].parallel_safety,
+            dbops.PARALLEL_RESTRICTED)
+        self.assertEqual(
+            functions['_to_timestamptz_check'].parallel_safety,
+            dbops.PARALLEL_UNSAFE)
+
+        # Every support function is at most as parallel safe as
+        # the support functions it calls.
+        for func in functions.values():
+            for callee in functions.values():
+                if callee is func or not re.search(
+                        rf'\bedgedb\.{re.escape(callee.name[1])}\s*\(',
+                        func.text or ''):
+                    continue
+                self.assertEqual(
+                    dbops.least_parallel_safe(
+                        func.parallel_safety, callee.parallel_safety),
+                    func.parallel_safety,
+                    f'{func.name[1]} calls {callee.name[1]}')
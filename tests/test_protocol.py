@@ -171,3 +171,100 @@ class TestProtocol(protocol.ProtocolTestCase):
             protocol.ReadyForCommand,
             transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
         )
+
+    async def test_proto_cursor_01(self):
+        await self.con.connect()
+
+        await self.con.send(
+            protocol.ExecuteScript(
+                headers=[],
+                script='START TRANSACTION'
+            )
+        )
+        await self.con.recv_match(protocol.CommandComplete)
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.IN_TRANSACTION,
+        )
+
+        await self.con.send(
+            protocol.Prepare(
+                headers=[],
+                io_format=protocol.IOFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.MANY,
+                statement_name=b'',
+                command='SELECT {1, 2, 3, 4, 5}',
+            ),
+            protocol.Execute(
+                headers=[protocol.Header(code=0xFF02, value=b'2')],
+                statement_name=b'',
+                arguments=b'\x00\x00\x00\x00',
+            ),
+            protocol.Sync(),
+        )
+        await self.con.recv_match(protocol.PrepareComplete)
+        await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(protocol.PortalSuspended)
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.IN_TRANSACTION,
+        )
+
+        await self.con.send(
+            protocol.Fetch(headers=[], max_rows=2),
+            protocol.Sync(),
+        )
+        await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(protocol.PortalSuspended)
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.IN_TRANSACTION,
+        )
+
+        await self.con.send(
+            protocol.Fetch(headers=[], max_rows=10),
+            protocol.Sync(),
+        )
+        await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(protocol.CommandComplete, status='SELECT')
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.IN_TRANSACTION,
+        )
+
+        # The cursor is exhausted.
+        await self.con.send(
+            protocol.Fetch(headers=[], max_rows=10),
+            protocol.Sync(),
+        )
+        await self.con.recv_match(
+            protocol.ErrorResponse,
+            message='there is no open cursor'
+        )
+
+    async def test_proto_cursor_02(self):
+        # Cursors cannot be opened outside of a transaction.
+        await self.con.connect()
+
+        await self.con.send(
+            protocol.Prepare(
+                headers=[],
+                io_format=protocol.IOFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.MANY,
+                statement_name=b'',
+                command='SELECT {1, 2, 3}',
+            ),
+            protocol.Execute(
+                headers=[protocol.Header(code=0xFF02, value=b'2')],
+                statement_name=b'',
+                arguments=b'\x00\x00\x00\x00',
+            ),
+            protocol.Sync(),
+        )
+        await self.con.recv_match(protocol.PrepareComplete)
+        await self.con.recv_match(
+            protocol.ErrorResponse,
+            message='cursors can only be used inside a transaction'
+        )
@@ -26,6 +26,7 @@ from edb.testbase import lang as tb
 
 from edb import edgeql
 from edb.edgeql import compiler as qlcompiler
+from edb.edgeql import declarative as s_decl
 from edb.edgeql import parser as qlparser
 from edb.edgeql import qltypes
 
@@ -33,6 +34,7 @@ from edb.schema import delta as s_delta
 from edb.schema import ddl as s_ddl
 from edb.schema import links as s_links
 from edb.schema import objtypes as s_objtypes
+from edb.schema import snapshot as s_snapshot
 
 from edb.tools import test
 
@@ -528,6 +530,89 @@ _123456789_123456789_123456789 -> str
         no_anno = annos.get(schema, 'default::noinh_anno', default=None)
         self.assertIsNone(no_anno)
 
+    def test_schema_snapshot_01(self):
+        schema = tb._load_std_schema()
+
+        schema = self.run_ddl(schema, '''
+            CREATE MODULE default;
+            CREATE ABSTRACT TYPE default::Named {
+                CREATE REQUIRED SINGLE PROPERTY name -> std::str;
+            };
+            CREATE TYPE default::User EXTENDING default::Named {
+                CREATE MULTI LINK friends -> default::User;
+            };
+        ''')
+
+        loaded = s_snapshot.load_schema(s_snapshot.dump_schema(schema))
+
+        self.assertEqual(
+            set(loaded._id_to_data.keys()), set(schema._id_to_data.keys()))
+        for obj_id, data in schema._id_to_data.items():
+            self.assertEqual(loaded._id_to_data[obj_id], data)
+        self.assertEqual(loaded._name_to_id, schema._name_to_id)
+        self.assertEqual(loaded._shortname_to_id, schema._shortname_to_id)
+        self.assertEqual(loaded._globalname_to_id, schema._globalname_to_id)
+        self.assertEqual(loaded._refs_to, schema._refs_to)
+
+        user = loaded.get('default::User')
+        bases = user.get_bases(loaded).objects(loaded)
+        self.assertEqual(
+            [b.get_name(loaded) for b in bases], ['default::Named'])
+        self.assertIs(user, loaded.get_by_id(user.id))
+
+    def test_schema_snapshot_02(self):
+        with self.assertRaisesRegex(s_snapshot.SnapshotError,
+                                    'not a schema snapshot'):
+            s_snapshot.load_schema(b'\x80\x04garbage')
+
+    def test_schema_sdl_trace_cache_01(self):
+        schema = tb._load_std_schema()
+
+        def to_ddl(sdl):
+            documents = [
+                (decl.name.name, decl.declarations)
+                for decl in qlparser.parse_sdl(sdl).declarations
+            ]
+            return [
+                edgeql.generate_source(stmt)
+                for stmt in s_decl.sdl_to_ddl(schema, documents)
+            ]
+
+        def sdl(user_props):
+            return f'''
+                module a {{
+                    abstract type Named {{
+                        property name -> str;
+                    }}
+                }}
+                module b {{
+                    type User extending a::Named {{
+                        {user_props}
+                        property title := .name ++ '!';
+                    }}
+                }}
+                module c {{
+                    type Post {{
+                        link author -> b::User;
+                    }}
+                }}
+            '''
+
+        s_decl._dep_cache.clear()
+        cold = to_ddl(sdl(''))
+        self.assertEqual(len(s_decl._dep_cache), 3)
+        # Warm run, every module is cached.
+        self.assertEqual(to_ddl(sdl('')), cold)
+        self.assertEqual(len(s_decl._dep_cache), 3)
+
+        # Changing module b invalidates b and c, which refers to it,
+        # but not a.
+        changed = to_ddl(sdl('property age -> int64;'))
+        self.assertEqual(len(s_decl._dep_cache), 5)
+
+        s_decl._dep_cache.clear()
+        self.assertEqual(to_ddl(sdl('property age -> int64;')), changed)
+
     def test_schema_constraint_inheritance_01(self):
         schema = tb._load_std_schema()
 
@@ -3839,6 +3924,62 @@ class TestGetMigration(tb.BaseSchemaLoadTest):
             alias CollAlias := (a := Base.name, b := Base.foo);
         """])
 
+    def test_migrations_equivalence_many_similar_types_01(self):
+        # Structurally identical types are all rename candidates
+        # for one another when the schemas are diffed.
+        def _types(renamed):
+            return '\n'.join(
+                f"""
+                    type {renamed.get(i, f'Foo{i}')} {{
+                        property bar -> str;
+                        property baz -> int64;
+                    }};
+                """
+                for i in range(40)
+            )
+
+        self._assert_migration_equivalence([
+            _types({}),
+            _types({7: 'Renamed7', 21: 'Renamed21'}),
+        ])
+
+    def test_migrations_equivalence_many_similar_types_02(self):
+        # A renamed and altered type is detected as a rename even
+        # when there are too many created and dropped types to
+        # rank all of them against each other.
+        def _types(prefix):
+            return '\n'.join(
+                f"""
+                    type {prefix}{i} {{
+                        property {prefix.lower()}{i} -> str;
+                    }};
+                """
+                for i in range(600)
+            )
+
+        old_schema = self.load_schema(_types('Old') + """
+            type Foo {
+                property bar -> str;
+                property baz -> int64;
+            };
+        """)
+        new_schema = self.load_schema(_types('New') + """
+            type Renamed {
+                property bar -> str;
+                property baz -> int64;
+                property qux -> str;
+            };
+        """)
+
+        def _renames(cmd):
+            for subcmd in cmd.get_subcommands():
+                if isinstance(subcmd, s_delta.RenameObject):
+                    yield str(subcmd.classname), str(subcmd.new_name)
+                yield from _renames(subcmd)
+
+        diff = s_ddl.delta_schemas(old_schema, new_schema)
+        self.assertIn(('test::Foo', 'test::Renamed'), set(_renames(diff)))
+
 
 class TestDescribe(tb.BaseSchemaLoadTest):
     """Test the DESCRIBE command."""
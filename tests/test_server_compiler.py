@@ -17,8 +17,19 @@
 #
 
 
+import json
+import uuid
+
+from edb import edgeql
+from edb import errors
+from edb import _edgeql_rust
+
+from edb.schema import ddl as s_ddl
 from edb.testbase import lang as tb
 from edb.server import compiler as edbcompiler
+from edb.server.compiler import bulkload
+from edb.server.compiler import compiler as edbcompiler_impl
+from edb.server.compiler import explain
 
 
 class TestServerCompiler(tb.BaseSchemaLoadTest):
@@ -27,6 +38,13 @@ class TestServerCompiler(tb.BaseSchemaLoadTest):
         type Foo {
             property bar -> str;
         }
+
+        type Defaults {
+            property bar -> str;
+            property baz -> int64 {
+                default := 42;
+            }
+        }
     '''
 
     @classmethod
@@ -50,3 +68,179 @@ class TestServerCompiler(tb.BaseSchemaLoadTest):
                 }
             ''',
         )
+
+    def test_server_compiler_bulk_load_01(self):
+        block_id = uuid.uuid4()
+        load = bulkload.describe_bulk_load(
+            self.schema, 'test::Foo',
+            [(block_id.bytes, json.dumps({'columns': ['bar']}).encode())],
+        )
+
+        self.assertEqual(len(load.blocks), 1)
+        self.assertEqual(load.blocks[0].block_id, block_id)
+        self.assertTrue(
+            load.blocks[0].sql_copy_stmt.startswith(b'COPY "_edgedb_load_0"'))
+        self.assertIn(b'CREATE TEMPORARY TABLE', load.setup_sql)
+        self.assertIn(b'INSERT INTO', load.finalize_sql)
+
+    def test_server_compiler_bulk_load_02(self):
+        def describe(type_name, *descriptions):
+            return bulkload.describe_bulk_load(
+                self.schema, type_name,
+                [(uuid.uuid4().bytes, json.dumps(d).encode())
+                 for d in descriptions],
+            )
+
+        with self.assertRaisesRegex(errors.InvalidReferenceError,
+                                    "has no link or property 'baz'"):
+            describe('test::Foo', {'columns': ['baz']})
+
+        with self.assertRaisesRegex(errors.QueryError,
+                                    'at most one object block'):
+            describe('test::Foo', {'columns': ['bar']}, {'columns': []})
+
+        with self.assertRaisesRegex(errors.QueryError,
+                                    'cannot load objects'):
+            describe('std::Object', {'columns': []})
+
+        with self.assertRaisesRegex(errors.ProtocolError,
+                                    'invalid bulk load block'):
+            describe('test::Foo', ['bar'])
+
+        with self.assertRaisesRegex(
+                errors.QueryError,
+                r"bulk load does not apply defaults.*'test::Defaults.baz'"):
+            describe('test::Defaults', {'columns': ['bar']})
+
+        describe('test::Defaults', {'columns': ['bar', 'baz']})
+
+    def test_server_compiler_explain_01(self):
+        compiler = tb.new_compiler()
+        context = edbcompiler.new_compiler_context(
+            modaliases={None: 'test'},
+            schema=self.schema,
+        )
+
+        with self.assertRaisesRegex(errors.QueryError,
+                                    'EXPLAIN cannot be used in scripts'):
+            edbcompiler.compile_edgeql_script(
+                compiler=compiler,
+                ctx=context,
+                eql='EXPLAIN SELECT Foo',
+            )
+
+    def test_server_compiler_explain_02(self):
+        source = {'path': '(test::Foo)', 'line': 1, 'column': 16,
+                  'text': 'Foo'}
+        plan = [{
+            'Plan': {
+                'Node Type': 'Subquery Scan',
+                'Alias': 'q~1',
+                'Plans': [
+                    {'Node Type': 'Seq Scan', 'Alias': 'Foo~2'},
+                    {'Node Type': 'CTE Scan', 'CTE Name': 'Foo~2'},
+                ],
+            },
+        }]
+
+        result = json.loads(explain.annotate_plan(
+            json.dumps(plan).encode(),
+            json.dumps({'Foo~2': source}).encode(),
+        ))
+
+        top = result[0]['Plan']
+        self.assertNotIn(explain.SOURCE_KEY, top)
+        self.assertEqual(top['Plans'][0][explain.SOURCE_KEY], source)
+        self.assertEqual(top['Plans'][1][explain.SOURCE_KEY], source)
+
+    def test_server_compiler_compile_profile(self):
+        compiler = tb.new_compiler()
+        context = edbcompiler.new_compiler_context(
+            modaliases={None: 'test'},
+            schema=self.schema,
+            single_statement=True,
+        )
+
+        units = compiler._compile(
+            ctx=context,
+            tokens=_edgeql_rust.tokenize('SELECT Foo { bar }'),
+        )
+
+        profile = units[0].compile_profile
+        self.assertIsNotNone(profile)
+        for phase in ('parse', 'ql_to_ir', 'ir_to_pgast', 'sql_codegen',
+                      'type_desc'):
+            self.assertIn(phase, profile.phases)
+        self.assertGreater(profile.ast_nodes, 0)
+        self.assertGreater(profile.ir_nodes, 0)
+        self.assertGreater(profile.total, 0)
+
+    def test_server_compiler_ddl_groups_01(self):
+        statements = edgeql.parse_block('''
+            CREATE TYPE test::A;
+            CREATE TYPE test::B;
+            SELECT 1;
+            CREATE TYPE test::C;
+            START TRANSACTION;
+            CREATE TYPE test::D;
+            CREATE TYPE test::E;
+            CREATE MIGRATION m TO { module test { type X; } };
+            CREATE TYPE test::F;
+            CONFIGURE SESSION SET __internal_no_const_folding := true;
+            CREATE TYPE test::G;
+            COMMIT;
+        ''')
+
+        groups = edbcompiler_impl._group_ddl_statements(statements)
+        self.assertEqual(
+            [len(group) for group in groups],
+            [2, 1, 1, 1, 2, 1, 1, 1, 1, 1])
+
+    def test_server_compiler_ddl_groups_02(self):
+        # Compiling a run of DDL statements as one unit results in
+        # the same schema as compiling them one by one.
+        statements = [
+            '''
+                CREATE TYPE test::A;
+            ''',
+            '''
+                CREATE TYPE test::B {
+                    CREATE LINK a -> test::A;
+                    CREATE PROPERTY name -> str;
+                };
+            ''',
+            '''
+                ALTER TYPE test::A {
+                    CREATE PROPERTY x -> str;
+                };
+            ''',
+            '''
+                ALTER TYPE test::B {
+                    DROP PROPERTY name;
+                };
+            ''',
+            '''
+                CREATE TYPE test::C EXTENDING test::B;
+            ''',
+        ]
+
+        compiler = tb.new_compiler()
+
+        def compile(scripts):
+            context = edbcompiler.new_compiler_context(
+                modaliases={None: 'test'},
+                schema=self.schema,
+            )
+            for script in scripts:
+                schema, _ = edbcompiler.compile_edgeql_script(
+                    compiler=compiler,
+                    ctx=context,
+                    eql=script,
+                )
+            return schema
+
+        grouped = compile([''.join(statements)])
+        separate = compile(statements)
+
+        diff = s_ddl.delta_schemas(separate, grouped)
+        self.assertEqual(list(diff.get_subcommands()), [])
@@ -17,6 +17,7 @@
 #
 
 
+import asyncio
 import dataclasses
 import json
 import typing
@@ -740,6 +741,47 @@ class TestServerConfig(tb.QueryTestCase, tb.OldCLITestCaseMixin):
                 CONFIGURE SYSTEM RESET multiprop;
             ''')
 
+    async def test_server_proto_configure_07(self):
+        con = await self.connect()
+        try:
+            await con.execute('''
+                CONFIGURE SESSION SET query_execution_timeout := 100;
+            ''')
+
+            with self.assertRaisesRegex(
+                    edgedb.QueryTimeoutError,
+                    'query_execution_timeout'):
+                await con.fetchall('SELECT sys::sleep(10.0)')
+
+            # The connection is still usable after the timeout.
+            self.assertEqual(await con.fetchone('SELECT 1'), 1)
+
+            await con.execute('''
+                CONFIGURE SESSION RESET query_execution_timeout;
+            ''')
+            self.assertTrue(await con.fetchone('SELECT sys::sleep(0.2)'))
+        finally:
+            await con.aclose()
+
+    async def test_server_proto_configure_08(self):
+        con = await self.connect()
+        try:
+            await con.execute('''
+                CONFIGURE SESSION SET idle_transaction_timeout := 100;
+            ''')
+
+            # Being idle outside of a transaction is fine.
+            await asyncio.sleep(0.3)
+            self.assertEqual(await con.fetchone('SELECT 1'), 1)
+
+            with self.assertRaises(edgedb.EdgeDBError):
+                async with con.transaction():
+                    await con.fetchone('SELECT 1')
+                    await asyncio.sleep(0.5)
+                    await con.fetchone('SELECT 1')
+        finally:
+            con.terminate()
+
     async def test_server_version(self):
         srv_ver = await self.con.fetchone(r"""
             SELECT sys::get_version()
@@ -1920,6 +1920,161 @@ class TestServerProto(tb.QueryTestCase):
             self.assertEqual(
                 result, "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
 
+    async def test_server_proto_query_stats_01(self):
+        await self.con.fetchone('SELECT sys::reset_query_stats()')
+
+        for _ in range(3):
+            await self.con.fetchall('''
+                WITH query_stats_marker := {1, 2, 3}
+                SELECT query_stats_marker;
+            ''')
+
+        stats = await self.con.fetchall('''
+            SELECT sys::QueryStats {
+                database,
+                calls,
+                cache_hits,
+                rows,
+                compile_time,
+            }
+            FILTER .query LIKE '%query_stats_marker%'
+        ''')
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(
+            stats[0].database,
+            await self.con.fetchone('SELECT sys::get_current_database()'))
+        self.assertEqual(stats[0].calls, 3)
+        self.assertEqual(stats[0].cache_hits, 2)
+        self.assertEqual(stats[0].rows, 9)
+        self.assertGreater(stats[0].compile_time.total_seconds(), 0)
+
+        await self.con.fetchone('SELECT sys::reset_query_stats()')
+
+        self.assertEqual(
+            await self.con.fetchone('''
+                SELECT count(
+                    sys::QueryStats
+                    FILTER .query LIKE '%query_stats_marker%'
+                )
+            '''),
+            0)
+
+    def _find_plan_sources(self, node):
+        sources = []
+        if 'EdgeQL Source' in node:
+            sources.append(node['EdgeQL Source'])
+        for child in node.get('Plans', ()):
+            sources.extend(self._find_plan_sources(child))
+        return sources
+
+    async def test_server_proto_explain_01(self):
+        plan = json.loads(await self.con.fetchone('''
+            EXPLAIN SELECT test::Tmp { tmp } FILTER .tmp = <str>$0;
+        ''', 'foo'))
+
+        self.assertEqual(len(plan), 1)
+        self.assertIn('Total Cost', plan[0]['Plan'])
+        self.assertNotIn('Execution Time', plan[0])
+
+        sources = self._find_plan_sources(plan[0]['Plan'])
+        self.assertIn(
+            ('test::Tmp', 2),
+            [(src.get('text'), src.get('line')) for src in sources])
+
+    async def test_server_proto_explain_02(self):
+        async with self._run_and_rollback():
+            plan = json.loads(await self.con.fetchone('''
+                EXPLAIN ANALYZE INSERT test::Tmp { tmp := 'explain' };
+            '''))
+
+            self.assertIn('Execution Time', plan[0])
+            self.assertIn('Actual Rows', plan[0]['Plan'])
+
+            # EXPLAIN ANALYZE executes the query.
+            self.assertEqual(
+                await self.con.fetchone('''
+                    SELECT count(test::Tmp FILTER .tmp = 'explain')
+                '''),
+                1)
+
+        with self.assertRaisesRegex(edgedb.QueryError,
+                                    'EXPLAIN cannot be used in scripts'):
+            await self.con.execute('EXPLAIN SELECT test::Tmp')
+
+    def _find_plan_node_types(self, node):
+        types = [node['Node Type']]
+        for child in node.get('Plans', ()):
+            types.extend(self._find_plan_node_types(child))
+        return types
+
+    async def test_server_proto_explain_03(self):
+        async with self._run_and_rollback():
+            await self.con.execute('''
+                CREATE FUNCTION test::explain_key(a: str) -> str {
+                    USING EdgeQL $$
+                        SELECT str_lower(a)
+                    $$;
+                    SET volatility := 'IMMUTABLE';
+                };
+
+                ALTER TYPE test::Tmp CREATE INDEX ON (.tmp);
+            ''')
+
+            await self.con.fetchall('''
+                FOR x IN {array_unpack(<array<str>>$0)}
+                UNION (INSERT test::Tmp { tmp := x });
+            ''', [f'key{i}' for i in range(5000)])
+
+            # The inlined call leaves a plain comparison with an
+            # expression of the parameter, which the index can serve.
+            plan = json.loads(await self.con.fetchone('''
+                EXPLAIN SELECT test::Tmp
+                FILTER .tmp = test::explain_key(<str>$0);
+            ''', 'KEY42'))
+
+            node_types = self._find_plan_node_types(plan[0]['Plan'])
+            self.assertTrue(
+                any('Index' in node_type for node_type in node_types),
+                node_types)
+            self.assertNotIn('Seq Scan', node_types)
+
+    async def test_server_proto_explain_04(self):
+        async with self._run_and_rollback():
+            await self.con.execute('''
+                CREATE FUNCTION test::explain_set_config(
+                    name: str, value: str
+                ) -> str
+                    USING SQL $$
+                        SELECT set_config("name", "value", true)
+                    $$;
+            ''')
+
+            await self.con.fetchall('''
+                FOR x IN {array_unpack(<array<str>>$0)}
+                UNION (INSERT test::Tmp { tmp := x });
+            ''', [f'row{i}' for i in range(10000)])
+
+            # Make parallel plans cheap enough to be picked for
+            # a small table, for the rest of the transaction.
+            for name, value in [('parallel_setup_cost', '0'),
+                                ('parallel_tuple_cost', '0'),
+                                ('min_parallel_table_scan_size', '0'),
+                                ('max_parallel_workers_per_gather', '2')]:
+                await self.con.fetchone('''
+                    SELECT test::explain_set_config(<str>$0, <str>$1);
+                ''', name, value)
+
+            for query in ['SELECT count(test::Tmp)',
+                          'SELECT sum(len(test::Tmp.tmp))']:
+                plan = json.loads(
+                    await self.con.fetchone(f'EXPLAIN {query}'))
+
+                node_types = self._find_plan_node_types(plan[0]['Plan'])
+                self.assertTrue(
+                    {'Gather', 'Gather Merge'} & set(node_types),
+                    f'{query}: {node_types}')
+
 
 class TestServerProtoMigration(tb.QueryTestCase):
 
@@ -2514,6 +2669,57 @@ class TestServerProtoDDL(tb.NonIsolatedDDLTestCase):
         finally:
             await self.con.execute('ROLLBACK')
 
+    async def test_server_proto_query_cache_invalidate_10(self):
+        typename = 'CacheInv_10'
+
+        query = '''
+            WITH cache_inv_10_marker := schema::ObjectType
+            SELECT count(
+                cache_inv_10_marker FILTER .name = <str>$name
+            )
+        '''
+
+        async def result_cache_hits():
+            return await self.con.fetchone('''
+                SELECT sum((
+                    SELECT sys::QueryStats
+                    FILTER .query LIKE '%cache_inv_10_marker%'
+                ).result_cache_hits)
+            ''')
+
+        hits = await result_cache_hits()
+
+        for _ in range(5):
+            self.assertEqual(
+                await self.con.fetchone(query, name=f'test::{typename}'),
+                0)
+
+        # The first query populates the result cache, the rest are
+        # served from it.
+        self.assertEqual(await result_cache_hits(), hits + 4)
+
+        await self.con.execute(f'''
+            CREATE TYPE test::{typename};
+        ''')
+
+        try:
+            # Cached introspection results must be invalidated by DDL.
+            for _ in range(5):
+                self.assertEqual(
+                    await self.con.fetchone(
+                        query, name=f'test::{typename}'),
+                    1)
+
+            self.assertEqual(await result_cache_hits(), hits + 8)
+        finally:
+            await self.con.execute(f'''
+                DROP TYPE test::{typename};
+            ''')
+
+        self.assertEqual(
+            await self.con.fetchone(query, name=f'test::{typename}'),
+            0)
+
     async def test_server_proto_backend_tid_propagation_01(self):
         async with self._run_and_rollback():
             await self.con.execute('''